@@ -1,3 +1,8 @@
+// Imported HMAC keys, reused across requests for the isolate's lifetime.
+// Keyed by kid and secret so a changed secret is imported afresh.
+const keyCache = new Map();
+let keyRing = { source: null, keys: new Map() };
+
 export default {
   async fetch(request, env) {
     if (request.method === "OPTIONS") {
@@ -5,8 +10,8 @@ export default {
     }
 
     const cookieName = env.STREAM_COOKIE_NAME || "stream_auth";
-    const secret = env.STREAM_COOKIE_SECRET;
-    if (!secret) {
+    const keys = getVerificationKeys(env);
+    if (keys.size === 0) {
       return new Response("Missing stream cookie secret", { status: 500 });
     }
 
@@ -21,11 +26,6 @@ export default {
       return new Response("Unauthorized", { status: 403 });
     }
 
-    const isValid = await verifySignature(payloadB64, signatureB64, secret);
-    if (!isValid) {
-      return new Response("Unauthorized", { status: 403 });
-    }
-
     let payload;
     try {
       payload = JSON.parse(new TextDecoder().decode(base64urlToBytes(payloadB64)));
@@ -34,20 +34,57 @@ export default {
     }
 
     const now = Math.floor(Date.now() / 1000);
+    const key = keys.get(payload.kid || "");
+    if (!key || (key.notAfter && key.notAfter <= now)) {
+      return new Response("Unauthorized", { status: 403 });
+    }
+
+    const isValid = await verifySignature(payloadB64, signatureB64, key);
+    if (!isValid) {
+      return new Response("Unauthorized", { status: 403 });
+    }
+
     if (!payload.exp || payload.exp < now) {
       return new Response("Unauthorized", { status: 403 });
     }
 
+    const audience = payload.aud || "films";
+    if (!getAudiences(env).includes(audience)) {
+      return new Response("Unauthorized", { status: 403 });
+    }
+
     const url = new URL(request.url);
     const allowedPath = payload.path || "/";
     if (!url.pathname.startsWith(allowedPath)) {
       return new Response("Unauthorized", { status: 403 });
     }
 
+    // Batch shorts cookies are scoped to the directory their shorts share,
+    // which can hold other titles; only the listed short paths are allowed.
+    if (payload.paths !== undefined && !matchesAnyPath(url.pathname, payload.paths)) {
+      return new Response("Unauthorized", { status: 403 });
+    }
+
     return fetch(request);
   },
 };
 
+// STREAM_COOKIE_AUDIENCES mirrors STREAM_GATEWAY_AUDIENCES: a comma
+// separated list of the cookie audiences this edge serves.
+function getAudiences(env) {
+  return (env.STREAM_COOKIE_AUDIENCES || "films,shorts")
+    .split(",")
+    .map((audience) => audience.trim())
+    .filter(Boolean);
+}
+
+function matchesAnyPath(pathname, paths) {
+  return (
+    Array.isArray(paths) &&
+    paths.some((path) => typeof path === "string" && path && pathname.startsWith(path))
+  );
+}
+
 function getCookieValue(cookieHeader, name) {
   const parts = cookieHeader.split(";");
   for (const part of parts) {
@@ -59,18 +96,68 @@ function getCookieValue(cookieHeader, name) {
   return "";
 }
 
-async function verifySignature(payloadB64, signatureB64, secret) {
-  const key = await crypto.subtle.importKey(
-    "raw",
-    new TextEncoder().encode(secret),
-    { name: "HMAC", hash: "SHA-256" },
-    false,
-    ["verify"]
-  );
+// STREAM_COOKIE_KEYS mirrors the Django setting: a JSON list of
+// {kid, secret, not_before, not_after}. Cookies without a kid are checked
+// against the legacy STREAM_COOKIE_SECRET.
+function getVerificationKeys(env) {
+  const source = `${env.STREAM_COOKIE_KEYS || ""}|${env.STREAM_COOKIE_SECRET || ""}`;
+  if (keyRing.source === source) {
+    return keyRing.keys;
+  }
+
+  const keys = new Map();
+  let configured = [];
+  try {
+    configured = JSON.parse(env.STREAM_COOKIE_KEYS || "[]");
+  } catch (error) {
+    configured = [];
+  }
+  for (const key of configured) {
+    if (key.kid && key.secret) {
+      keys.set(String(key.kid), {
+        kid: String(key.kid),
+        secret: key.secret,
+        notAfter: toEpochSeconds(key.not_after),
+      });
+    }
+  }
+  if (env.STREAM_COOKIE_SECRET) {
+    keys.set("", { kid: "", secret: env.STREAM_COOKIE_SECRET, notAfter: null });
+  }
+  keyRing = { source, keys };
+  return keys;
+}
+
+function toEpochSeconds(value) {
+  if (value === undefined || value === null || value === "") {
+    return null;
+  }
+  if (typeof value === "number") {
+    return value;
+  }
+  return Math.floor(Date.parse(value) / 1000);
+}
+
+async function getCryptoKey(key) {
+  const cacheKey = `${key.kid}:${key.secret}`;
+  let cryptoKey = keyCache.get(cacheKey);
+  if (!cryptoKey) {
+    cryptoKey = crypto.subtle.importKey(
+      "raw",
+      new TextEncoder().encode(key.secret),
+      { name: "HMAC", hash: "SHA-256" },
+      false,
+      ["verify"]
+    );
+    keyCache.set(cacheKey, cryptoKey);
+  }
+  return cryptoKey;
+}
 
+async function verifySignature(payloadB64, signatureB64, key) {
   return crypto.subtle.verify(
     "HMAC",
-    key,
+    await getCryptoKey(key),
     base64urlToBytes(signatureB64),
     new TextEncoder().encode(payloadB64)
   );
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # third party apps
     "drf_spectacular",
     "rest_framework",
@@ -177,7 +178,7 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
-    "DEFAULT_THROTTLE_CLASSES": ["rest_framework.throttling.AnonRateThrottle"],
+    "DEFAULT_THROTTLE_CLASSES": ["core.utils.throttles.AnonTokenBucketThrottle"],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/minute",
         "playback_retrieve": env.str("PLAYBACK_RETRIEVE_THROTTLE_RATE", "30/minute"),
@@ -188,6 +189,11 @@ REST_FRAMEWORK = {
         "short_playback_refresh": env.str(
             "SHORT_PLAYBACK_REFRESH_THROTTLE_RATE", "60/minute"
         ),
+        "short_playback_batch": env.str(
+            "SHORT_PLAYBACK_BATCH_THROTTLE_RATE", "30/minute"
+        ),
+        "record_views": env.str("RECORD_VIEWS_THROTTLE_RATE", "30/minute"),
+        "playback_qoe": env.str("PLAYBACK_QOE_THROTTLE_RATE", "30/minute"),
     },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "core.utils.exceptions.exceptions.custom_exception_handler",
@@ -361,14 +367,69 @@ SIMPLE_JWT = {
 JWT_SECRET = env.str("JWT_SECRET")
 WEBHOOK_ENC_KEY = env.str("WEBHOOK_ENC_KEY", default="")
 FLW_WEBHOOK_SECRET = env.str("FLW_WEBHOOK_SECRET", default="")
+STORAGE_EVENT_WEBHOOK_SECRET = env.str("STORAGE_EVENT_WEBHOOK_SECRET", default="")
 
 STREAM_BASE_URL = env.str("STREAM_BASE_URL", default="")
 STREAM_COOKIE_SECRET = env.str("STREAM_COOKIE_SECRET", default="")
+# Versioned signing keys: [{"kid", "secret", "not_before", "not_after"}, ...]
+STREAM_COOKIE_KEYS = env.json("STREAM_COOKIE_KEYS", default=[])
 STREAM_COOKIE_NAME = env.str("STREAM_COOKIE_NAME", default="stream_auth")
 STREAM_COOKIE_DOMAIN = env.str("STREAM_COOKIE_DOMAIN", default="stream.indis.live")
 STREAM_COOKIE_TTL_SECONDS = env.int("STREAM_COOKIE_TTL_SECONDS", default=900)
 STREAM_COOKIE_SECURE = env.bool("STREAM_COOKIE_SECURE", default=not DEBUG)
 STREAM_COOKIE_SAMESITE = env.str("STREAM_COOKIE_SAMESITE", default="None")
+# Most shorts authorised by one batch playback request
+SHORT_PLAYBACK_BATCH_MAX = env.int("SHORT_PLAYBACK_BATCH_MAX", default=10)
+# Player view beacons: events per request and how long per-day counters live
+VIEW_BEACON_MAX_EVENTS = env.int("VIEW_BEACON_MAX_EVENTS", default=50)
+VIEW_COUNTER_RETENTION_SECONDS = env.int(
+    "VIEW_COUNTER_RETENTION_SECONDS", default=2 * 24 * 60 * 60
+)
+# A viewer's repeat plays of one title within this window count once
+VIEW_DEDUPE_SECONDS = env.int("VIEW_DEDUPE_SECONDS", default=30 * 60)
+# Per-user short like sets in redis, and ids per "which did I like" lookup
+LIKE_MEMBERSHIP_TTL = env.int("LIKE_MEMBERSHIP_TTL", default=7 * 24 * 60 * 60)
+LIKED_SHORTS_MAX_IDS = env.int("LIKED_SHORTS_MAX_IDS", default=100)
+# Rendered public catalog pages live in redis this long, unless a film or short
+# change bumps the catalog version first
+CATALOG_CACHE_TTL = env.int("CATALOG_CACHE_TTL", default=5 * 60)
+# Ranked shorts feed: engagement weights, how fast scores decay with age in
+# hours, and how long a ranking generation stays readable for open cursors
+SHORT_RANKING_WEIGHTS = env.json(
+    "SHORT_RANKING_WEIGHTS", default={"views": 1.0, "likes": 3.0, "sales": 5.0}
+)
+SHORT_RANKING_GRAVITY = env.float("SHORT_RANKING_GRAVITY", default=1.5)
+SHORT_RANKING_RETENTION_SECONDS = env.int(
+    "SHORT_RANKING_RETENTION_SECONDS", default=60 * 60
+)
+# Suggestions returned per short tag autocomplete lookup
+SHORT_TAG_AUTOCOMPLETE_LIMIT = env.int("SHORT_TAG_AUTOCOMPLETE_LIMIT", default=10)
+# Cached (user, film) playback entitlements; dropped early when a purchase changes
+PLAYBACK_ENTITLEMENT_CACHE_TTL = env.int(
+    "PLAYBACK_ENTITLEMENT_CACHE_TTL", default=60 * 60
+)
+# Player QoE beacons: events per batch, largest body after decompression, the
+# country header set by the edge, rollup window and raw beacon retention
+QOE_BEACON_MAX_EVENTS = env.int("QOE_BEACON_MAX_EVENTS", default=100)
+QOE_BEACON_MAX_BYTES = env.int("QOE_BEACON_MAX_BYTES", default=256 * 1024)
+QOE_REGION_HEADER = env.str("QOE_REGION_HEADER", default="HTTP_CF_IPCOUNTRY")
+QOE_ROLLUP_LOOKBACK_HOURS = env.int("QOE_ROLLUP_LOOKBACK_HOURS", default=2)
+QOE_RAW_RETENTION_DAYS = env.int("QOE_RAW_RETENTION_DAYS", default=7)
+# Self-hosted stream gateway (config.stream_asgi). Segments are read from
+# STREAM_GATEWAY_LOCAL_ROOT, or from the bucket with managed storage; with an
+# accel prefix nginx sends the file itself after the gateway authorises it
+STREAM_GATEWAY_LOCAL_ROOT = env.str("STREAM_GATEWAY_LOCAL_ROOT", default="")
+STREAM_GATEWAY_ACCEL_PREFIX = env.str("STREAM_GATEWAY_ACCEL_PREFIX", default="")
+STREAM_GATEWAY_AUDIENCES = env.list(
+    "STREAM_GATEWAY_AUDIENCES", default=["films", "shorts"]
+)
+STREAM_GATEWAY_VERIFY_CACHE_SIZE = env.int(
+    "STREAM_GATEWAY_VERIFY_CACHE_SIZE", default=10_000
+)
+STREAM_GATEWAY_CHUNK_SIZE = env.int("STREAM_GATEWAY_CHUNK_SIZE", default=256 * 1024)
+STREAM_GATEWAY_S3_MAX_CONNECTIONS = env.int(
+    "STREAM_GATEWAY_S3_MAX_CONNECTIONS", default=50
+)
 
 # Chatting & Caches
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
@@ -395,6 +456,55 @@ CACHES = {
 }
 
 PRESIGNED_UPLOAD_TTL = 60 * 60
+UPLOAD_BATCH_MAX_FILES = env.int("UPLOAD_BATCH_MAX_FILES", default=10)
+
+# Uploads not registered by a storage event or client callback are swept
+# once older than the grace period
+STORAGE_INGEST_GRACE_SECONDS = env.int("STORAGE_INGEST_GRACE_SECONDS", default=15 * 60)
+STORAGE_INGEST_MAX_AGE = env.int("STORAGE_INGEST_MAX_AGE", default=7 * 24 * 60 * 60)
+
+# Multipart uploads
+MULTIPART_UPLOAD_TTL = env.int("MULTIPART_UPLOAD_TTL", default=24 * 60 * 60)
+MULTIPART_UPLOAD_PART_SIZE = env.int(
+    "MULTIPART_UPLOAD_PART_SIZE", default=64 * 1024 * 1024
+)
+MULTIPART_MAX_PARTS_PER_REQUEST = env.int(
+    "MULTIPART_MAX_PARTS_PER_REQUEST", default=100
+)
+
+# Upload admission control
+UPLOAD_MAX_PENDING_JOBS_PER_ACCOUNT = env.int(
+    "UPLOAD_MAX_PENDING_JOBS_PER_ACCOUNT", default=5
+)
+UPLOAD_MAX_BYTES_IN_FLIGHT_PER_ACCOUNT = env.int(
+    "UPLOAD_MAX_BYTES_IN_FLIGHT_PER_ACCOUNT", default=20 * 1024**3
+)
+PIPELINE_WORKER_CONCURRENCY = env.int("PIPELINE_WORKER_CONCURRENCY", default=4)
+PIPELINE_MAX_ACTIVE_JOBS = env.int("PIPELINE_MAX_ACTIVE_JOBS", default=8)
+PIPELINE_MAX_BACKLOG_SECONDS = env.int(
+    "PIPELINE_MAX_BACKLOG_SECONDS", default=6 * 60 * 60
+)
+PIPELINE_DEFAULT_JOB_SECONDS = env.int("PIPELINE_DEFAULT_JOB_SECONDS", default=15 * 60)
+PIPELINE_ESTIMATOR_SAMPLE_SIZE = env.int("PIPELINE_ESTIMATOR_SAMPLE_SIZE", default=500)
+PIPELINE_ESTIMATOR_MIN_SAMPLES = env.int("PIPELINE_ESTIMATOR_MIN_SAMPLES", default=5)
+# the HLS master lists first the richest variant whose average bandwidth fits
+# here, which players use as their starting rendition
+HLS_START_BANDWIDTH = env.int("HLS_START_BANDWIDTH", default=1_600_000)
+# "segmented" writes a file per segment, "byte_range" one file per rendition
+PACKAGING_DEFAULT_MODE = env.str("PACKAGING_DEFAULT_MODE", default="segmented")
+
+# what happens to each artifact type once a title is playable and the grace
+# period has passed: keep, archive (move to STORAGE_ARCHIVE_BUCKET) or delete
+STORAGE_LIFECYCLE_POLICY = env.json(
+    "STORAGE_LIFECYCLE_POLICY", default={"source": "archive", "mp4": "delete"}
+)
+STORAGE_LIFECYCLE_GRACE_HOURS = env.int("STORAGE_LIFECYCLE_GRACE_HOURS", default=72)
+STORAGE_LIFECYCLE_BATCH_SIZE = env.int("STORAGE_LIFECYCLE_BATCH_SIZE", default=50)
+STORAGE_ARCHIVE_BUCKET = env.str("STORAGE_ARCHIVE_BUCKET", default="")
+STORAGE_GB_MONTH_COST = env.float("STORAGE_GB_MONTH_COST", default=0.02)
+STORAGE_ARCHIVE_GB_MONTH_COST = env.float(
+    "STORAGE_ARCHIVE_GB_MONTH_COST", default=0.007
+)
 
 CELERY_BROKER = env.str("CELERY_BROKER")
 CELERY_BROKER_URL = CELERY_BROKER
@@ -420,9 +530,15 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour="0,12", minute=0),
         "options": {"queue": "beats"},
     },
+    "dispatch-due-releases": {
+        "task": "core.feed.tasks.dispatch_due_releases",
+        "schedule": crontab(minute="*"),
+        "options": {"queue": "beats"},
+    },
+    # safety net for rows dispatch never scheduled; dispatch covers the rest
     "reconcile-due-releases": {
         "task": "core.feed.tasks.reconcile_due_releases",
-        "schedule": crontab(minute="*"),
+        "schedule": crontab(minute=30),
         "options": {"queue": "beats"},
     },
     "delete_expired_idempotency_keys": {
@@ -430,11 +546,56 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(minute="*"),
         "options": {"queue": "beats"},
     },
+    "flush-view-counts": {
+        "task": "core.feed.tasks.flush_view_counts",
+        "schedule": crontab(minute="*"),
+        "options": {"queue": "beats"},
+    },
+    "flush-engagement-counts": {
+        "task": "core.feed.tasks.flush_engagement_counts",
+        "schedule": crontab(minute="*"),
+        "options": {"queue": "beats"},
+    },
+    "rank-shorts": {
+        "task": "core.feed.tasks.rank_shorts",
+        "schedule": crontab(minute="*/10"),
+        "options": {"queue": "beats"},
+    },
+    "refresh-short-tags": {
+        "task": "core.feed.tasks.refresh_short_tags",
+        "schedule": crontab(minute="*/10"),
+        "options": {"queue": "beats"},
+    },
+    "rollup-playback-qoe": {
+        "task": "core.playback.tasks.rollup_playback_qoe",
+        "schedule": crontab(minute=5),
+        "options": {"queue": "beats"},
+    },
     "expire-due-rentals": {
         "task": "core.feed.tasks.expire_due_rentals",
         "schedule": crontab(minute="*/5"),
         "options": {"queue": "beats"},
     },
+    "admit-deferred-processing-jobs": {
+        "task": "file_pipeline.admit_deferred",
+        "schedule": crontab(minute="*"),
+        "options": {"queue": "beats"},
+    },
+    "sweep-stranded-uploads": {
+        "task": "file_pipeline.sweep_stranded_uploads",
+        "schedule": crontab(minute="*/15"),
+        "options": {"queue": "beats"},
+    },
+    "apply-storage-lifecycle": {
+        "task": "file_pipeline.apply_storage_lifecycle",
+        "schedule": crontab(minute=30),
+        "options": {"queue": "beats"},
+    },
+    "refresh-pipeline-estimator": {
+        "task": "file_pipeline.refresh_estimator",
+        "schedule": crontab(minute="*/15"),
+        "options": {"queue": "beats"},
+    },
     "reconcile-flutterwave-finalization-failures": {
         "task": "core.payment.tasks.reconcile_flutterwave_finalization_failures",
         "schedule": crontab(minute="*/5"),
@@ -0,0 +1,20 @@
+"""ASGI config for the Indie-Distro stream gateway."""
+
+import os
+
+import django
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    os.getenv("DJANGO_SETTINGS_MODULE", "config.settings.prod"),
+)
+
+django.setup()
+
+from core.playback.gateway import StreamGateway
+
+application = StreamGateway()
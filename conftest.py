@@ -1,5 +1,7 @@
 from decimal import Decimal
 
+from django.core.cache import cache
+
 import pytest
 from rest_framework.test import APIClient
 
@@ -11,6 +13,13 @@ from core.utils import enums
 from core.wallet.tests.factories.wallet_factories import WalletFactory
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # throttles, reservations and cached entitlements live in redis and would
+    # otherwise leak between tests (and test runs) that reuse the same ids
+    cache.clear()
+
+
 @pytest.fixture
 def anonymous_client():
     return APIClient()
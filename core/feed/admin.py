@@ -3,7 +3,16 @@ from django.utils.translation import gettext_lazy as _
 
 from unfold.admin import ModelAdmin
 
-from .models import Feed, Purchase, Short
+from .models import (
+    DailyViewCount,
+    Feed,
+    FilmFacetCount,
+    Purchase,
+    Short,
+    ShortComment,
+    ShortLike,
+    ShortTag,
+)
 
 
 @admin.register(Feed)
@@ -40,6 +49,13 @@ class FeedAdmin(ModelAdmin):
                 ),
             },
         ),
+        (
+            _("Analytics Info"),
+            {
+                "classes": ["tab"],
+                "fields": ("views_count",),
+            },
+        ),
         (
             _("Important dates"),
             {
@@ -158,3 +174,45 @@ class ShortAdmin(ModelAdmin):
     search_fields = ["slug", "owner__email", "film__title"]
     readonly_fields = ["date_added", "date_last_modified"]
     ordering = ["-date_added"]
+
+
+@admin.register(FilmFacetCount)
+class FilmFacetCountAdmin(ModelAdmin):
+    list_display = ["facet", "value", "films_count", "date_last_modified"]
+    list_filter = ["facet"]
+    search_fields = ["value"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["facet", "-films_count"]
+
+
+@admin.register(ShortTag)
+class ShortTagAdmin(ModelAdmin):
+    list_display = ["name", "shorts_count", "date_last_modified"]
+    search_fields = ["name"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["-shorts_count"]
+
+
+@admin.register(DailyViewCount)
+class DailyViewCountAdmin(ModelAdmin):
+    list_display = ["target_type", "target_id", "date", "views", "unique_views"]
+    list_filter = ["target_type", "date"]
+    search_fields = ["target_id"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["-date"]
+
+
+@admin.register(ShortLike)
+class ShortLikeAdmin(ModelAdmin):
+    list_display = ["user__email", "short__id", "date_added"]
+    search_fields = ["user__email"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["-date_added"]
+
+
+@admin.register(ShortComment)
+class ShortCommentAdmin(ModelAdmin):
+    list_display = ["owner__email", "short__id", "date_added"]
+    search_fields = ["owner__email", "body"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["-date_added"]
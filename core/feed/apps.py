@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class FeedConfig(AppConfig):
@@ -6,5 +7,12 @@ class FeedConfig(AppConfig):
     name = "core.feed"
 
     def ready(self):
-        # noqa: F401
-        pass
+        from core.utils.helpers.catalog_cache import CatalogCache
+        from core.utils.helpers.feed.schedulers import catalog_released
+
+        # any film or short write makes cached catalog pages unreachable
+        for model_name in ("Feed", "Short"):
+            model = self.get_model(model_name)
+            post_save.connect(CatalogCache.invalidate, sender=model)
+            post_delete.connect(CatalogCache.invalidate, sender=model)
+        catalog_released.connect(CatalogCache.invalidate)
@@ -64,12 +64,48 @@ class ShortFilter(FilterSet):
         label="Filter by short type(Teaser, Snippet e.t.c)",
         choices=enums.ShortType.choices(),
     )
+    tag = filters.CharFilter(
+        method="filter_tag",
+        label="Filter by tag list (comma-separated, exact tags)",
+    )
+    tag_mode = filters.ChoiceFilter(
+        method="filter_tag_mode",
+        label="Tag filter mode: any|all",
+        choices=[("any", "any"), ("all", "all")],
+    )
     search = filters.CharFilter(
         method="filter_search", label="Search in caption and tags"
     )
 
+    def filter_tag(self, queryset, name, value):
+        from core.utils.helpers.feed import ShortTagUtils
+
+        tags = ShortTagUtils.parse(value)
+        if not tags:
+            return queryset
+
+        mode = (self.data.get("tag_mode") or "any").lower()
+        if mode == "all":
+            return queryset.filter(tags__contains=tags)
+        return queryset.filter(tags__overlap=tags)
+
+    def filter_tag_mode(self, queryset, name, value):
+        # applied by filter_tag
+        return queryset
+
     def filter_search(self, queryset, name, value):
-        return queryset.filter(Q(caption__icontains=value) | Q(tags__icontains=value))
+        """
+        Caption substring or exact tag; the caption side is served by the
+        trigram index where pg_trgm is installed, the tag side by the GIN
+        index on tags.
+        """
+        from core.utils.helpers.feed import ShortTagUtils
+
+        condition = Q(caption__icontains=value)
+        tags = ShortTagUtils.normalize([value])
+        if tags:
+            condition |= Q(tags__contains=tags)
+        return queryset.filter(condition)
 
     class Meta:
         model = Short
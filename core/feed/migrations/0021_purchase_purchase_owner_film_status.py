@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0020_release_schedule_fields"),
+        ("payment", "0017_transaction_type_backfill"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchase",
+            index=models.Index(
+                fields=["owner", "film", "status"], name="purchase_owner_film_status"
+            ),
+        ),
+    ]
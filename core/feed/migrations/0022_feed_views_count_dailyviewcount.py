@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0021_purchase_purchase_owner_film_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="views_count",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="DailyViewCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("film", "FILM"), ("short", "SHORT")],
+                        help_text="Whether the views are of a film or a short",
+                        max_length=10,
+                        verbose_name="Target Type",
+                    ),
+                ),
+                ("target_id", models.BigIntegerField(verbose_name="Target Id")),
+                ("date", models.DateField(verbose_name="Date")),
+                ("views", models.BigIntegerField(default=0, verbose_name="Views")),
+                (
+                    "unique_views",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Approximate number of distinct viewers on the day",
+                        verbose_name="Unique Views",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily View Count",
+                "verbose_name_plural": "Daily View Counts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("target_type", "target_id", "date"),
+                        name="unique_daily_view_count",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0022_feed_views_count_dailyviewcount"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShortComment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                ("body", models.TextField(max_length=1000, verbose_name="Comment")),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="short_comments",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Owned By",
+                    ),
+                ),
+                (
+                    "short",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comments",
+                        to="feed.short",
+                        verbose_name="Short",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Short Comment",
+                "verbose_name_plural": "Short Comments",
+                "indexes": [
+                    models.Index(
+                        fields=["short", "-date_added"], name="shortcomment_short_added"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ShortLike",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "short",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="likes",
+                        to="feed.short",
+                        verbose_name="Short",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="short_likes",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Short Like",
+                "verbose_name_plural": "Short Likes",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "short"), name="unique_short_like"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0023_shortcomment_shortlike"),
+        ("file_storage", "0012_fileprocessingjob_storage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["is_released", "-release_date", "-id"],
+                name="feed_released_date",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["is_released", "-date_added", "-id"], name="feed_released_added"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["is_released", "-price", "-id"], name="feed_released_price"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                fields=["is_released", "-release_date", "-id"],
+                name="short_released_date",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                fields=["is_released", "-date_added", "-id"],
+                name="short_released_added",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                fields=["is_released", "-views_count", "-id"],
+                name="short_released_views",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                fields=["is_released", "-likes_count", "-id"],
+                name="short_released_likes",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                fields=["is_released", "-comments_count", "-id"],
+                name="short_released_comments",
+            ),
+        ),
+    ]
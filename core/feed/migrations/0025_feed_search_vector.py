@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:16
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE FUNCTION feed_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+        || setweight(
+            to_tsvector('english', coalesce(array_to_string(NEW."cast", ' '), '')),
+            'B'
+        )
+        || setweight(
+            to_tsvector('english', coalesce(array_to_string(NEW.genre, ' '), '')),
+            'B'
+        )
+        || setweight(to_tsvector('english', coalesce(NEW.plot, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER feed_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, plot, "cast", genre ON feed_feed
+    FOR EACH ROW EXECUTE FUNCTION feed_search_vector_update();
+
+UPDATE feed_feed SET title = title;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS feed_search_vector_update ON feed_feed;
+DROP FUNCTION IF EXISTS feed_search_vector_update();
+"""
+
+
+def create_title_trigram_index(apps, schema_editor):
+    # pg_trgm ships with contrib; servers without it skip the typo-tolerant
+    # fallback instead of failing the migration
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS feed_title_trgm "
+            "ON feed_feed USING gin (title gin_trgm_ops)"
+        )
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS feed_title_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0024_feed_feed_released_date_feed_feed_released_added_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Weighted title, cast, genre and plot lexemes for search",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="feed_search_vector"
+            ),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+    ]
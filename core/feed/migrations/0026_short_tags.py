@@ -0,0 +1,96 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:24
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+# lowercase, collapse whitespace and drop empty or repeated tags, keeping order
+NORMALIZE_TAGS = """
+UPDATE feed_short SET tags = ARRAY(
+    SELECT tag FROM (
+        SELECT lower(regexp_replace(btrim(raw), '\\s+', ' ', 'g')) AS tag,
+               min(position) AS position
+        FROM unnest(feed_short.tags) WITH ORDINALITY AS t(raw, position)
+        WHERE btrim(raw) <> ''
+        GROUP BY 1
+    ) normalized
+    ORDER BY position
+)::varchar(50)[];
+"""
+
+
+def create_caption_trigram_index(apps, schema_editor):
+    # pg_trgm ships with contrib; without it caption search stays a scan
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS short_caption_trgm "
+            "ON feed_short USING gin (caption gin_trgm_ops)"
+        )
+
+
+def drop_caption_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS short_caption_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0025_feed_search_vector"),
+        ("file_storage", "0012_fileprocessingjob_storage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShortTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "name",
+                    models.CharField(max_length=50, unique=True, verbose_name="Name"),
+                ),
+                (
+                    "shorts_count",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Number of released shorts carrying the tag",
+                        verbose_name="Shorts Count",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Short Tag",
+                "verbose_name_plural": "Short Tags",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"], name="short_tags"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shorttag",
+            index=models.Index(
+                fields=["name"],
+                name="short_tag_name_prefix",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.RunSQL(NORMALIZE_TAGS, migrations.RunSQL.noop),
+        migrations.RunPython(create_caption_trigram_index, drop_caption_trigram_index),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:28
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+FACET_COUNT_TRIGGER = """
+CREATE FUNCTION feed_facet_counts_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_released IS TRUE THEN
+        UPDATE feed_filmfacetcount AS counts
+        SET films_count = counts.films_count - 1, date_last_modified = now()
+        FROM (
+            SELECT DISTINCT 'genre' AS facet, unnest(OLD.genre)::varchar AS value
+            UNION ALL SELECT 'language', OLD.language
+            UNION ALL SELECT 'type', OLD.type
+            UNION ALL SELECT 'sale_type', OLD.sale_type
+        ) AS old_values
+        WHERE counts.facet = old_values.facet AND counts.value = old_values.value;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_released IS TRUE THEN
+        INSERT INTO feed_filmfacetcount
+            (facet, value, films_count, date_added, date_last_modified)
+        SELECT facet, value, 1, now(), now() FROM (
+            SELECT DISTINCT 'genre' AS facet, unnest(NEW.genre)::varchar AS value
+            UNION ALL SELECT 'language', NEW.language
+            UNION ALL SELECT 'type', NEW.type
+            UNION ALL SELECT 'sale_type', NEW.sale_type
+        ) AS new_values
+        WHERE value IS NOT NULL
+        ON CONFLICT (facet, value) DO UPDATE
+        SET films_count = feed_filmfacetcount.films_count + 1,
+            date_last_modified = now();
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER feed_facet_counts_insert_delete
+    AFTER INSERT OR DELETE ON feed_feed
+    FOR EACH ROW EXECUTE FUNCTION feed_facet_counts_update();
+
+CREATE TRIGGER feed_facet_counts_update
+    AFTER UPDATE OF is_released, genre, language, type, sale_type ON feed_feed
+    FOR EACH ROW
+    WHEN (
+        (OLD.is_released, OLD.genre, OLD.language, OLD.type, OLD.sale_type)
+        IS DISTINCT FROM
+        (NEW.is_released, NEW.genre, NEW.language, NEW.type, NEW.sale_type)
+    )
+    EXECUTE FUNCTION feed_facet_counts_update();
+
+INSERT INTO feed_filmfacetcount
+    (facet, value, films_count, date_added, date_last_modified)
+SELECT facet, value, count(*), now(), now() FROM (
+    SELECT DISTINCT id, 'genre' AS facet, unnest(genre)::varchar AS value
+        FROM feed_feed WHERE is_released
+    UNION ALL SELECT id, 'language', language FROM feed_feed WHERE is_released
+    UNION ALL SELECT id, 'type', type FROM feed_feed WHERE is_released
+    UNION ALL SELECT id, 'sale_type', sale_type FROM feed_feed WHERE is_released
+) AS released_values
+WHERE value IS NOT NULL
+GROUP BY facet, value;
+"""
+
+DROP_FACET_COUNT_TRIGGER = """
+DROP TRIGGER IF EXISTS feed_facet_counts_update ON feed_feed;
+DROP TRIGGER IF EXISTS feed_facet_counts_insert_delete ON feed_feed;
+DROP FUNCTION IF EXISTS feed_facet_counts_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0026_short_tags"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FilmFacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "facet",
+                    models.CharField(
+                        choices=[
+                            ("genre", "GENRE"),
+                            ("language", "LANGUAGE"),
+                            ("type", "TYPE"),
+                            ("sale_type", "SALE_TYPE"),
+                        ],
+                        max_length=20,
+                        verbose_name="Facet",
+                    ),
+                ),
+                ("value", models.CharField(max_length=100, verbose_name="Value")),
+                (
+                    "films_count",
+                    models.BigIntegerField(default=0, verbose_name="Films Count"),
+                ),
+            ],
+            options={
+                "verbose_name": "Film Facet Count",
+                "verbose_name_plural": "Film Facet Counts",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["genre"], name="feed_genre"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["cast"], name="feed_cast"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="filmfacetcount",
+            constraint=models.UniqueConstraint(
+                fields=("facet", "value"), name="unique_film_facet_value"
+            ),
+        ),
+        migrations.RunSQL(FACET_COUNT_TRIGGER, DROP_FACET_COUNT_TRIGGER),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:47
+
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def schedule_pending_releases(apps, schema_editor):
+    """
+    Give unreleased rows with a release date their due time; release tasks
+    are no longer queued per object.
+    """
+    tz = timezone.get_current_timezone()
+    for model_name in ("Feed", "Short"):
+        model = apps.get_model("feed", model_name)
+        pending = model.objects.filter(is_released=False, release_date__isnull=False)
+        for release_date in pending.values_list("release_date", flat=True).distinct():
+            pending.filter(release_date=release_date).update(
+                scheduled_release_at=timezone.make_aware(
+                    datetime.combine(release_date, time.min), tz
+                )
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0027_film_facet_counts"),
+        ("file_storage", "0012_fileprocessingjob_storage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_released", False), ("scheduled_release_at__isnull", False)
+                ),
+                fields=["scheduled_release_at"],
+                name="feed_release_due",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="short",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_released", False), ("scheduled_release_at__isnull", False)
+                ),
+                fields=["scheduled_release_at"],
+                name="short_release_due",
+            ),
+        ),
+        migrations.RunPython(schedule_pending_releases, migrations.RunPython.noop),
+    ]
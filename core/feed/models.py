@@ -1,6 +1,8 @@
 import uuid
 
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import JSONField
 from django.utils.text import slugify
@@ -10,10 +12,10 @@ from core.file_storage.models import FileModel
 from core.payment.models import Transaction
 from core.users.models import User
 from core.utils import enums
-from core.utils.mixins import BaseModelMixin
+from core.utils.mixins import BaseModelMixin, ScheduledReleaseMixin
 
 
-class Feed(BaseModelMixin):
+class Feed(ScheduledReleaseMixin, BaseModelMixin):
     owner = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -119,6 +121,12 @@ class Feed(BaseModelMixin):
         related_name="bookmarked_films",
         blank=True,
     )
+    views_count = models.BigIntegerField(default=0)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text=_("Weighted title, cast, genre and plot lexemes for search"),
+    )
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -128,11 +136,62 @@ class Feed(BaseModelMixin):
     class Meta:
         verbose_name = _("Film")
         verbose_name_plural = _("Films")
+        # one per public list ordering, for keyset pagination
+        indexes = [
+            models.Index(
+                fields=["is_released", "-release_date", "-id"],
+                name="feed_released_date",
+            ),
+            models.Index(
+                fields=["is_released", "-date_added", "-id"],
+                name="feed_released_added",
+            ),
+            models.Index(
+                fields=["is_released", "-price", "-id"], name="feed_released_price"
+            ),
+            GinIndex(fields=["search_vector"], name="feed_search_vector"),
+            GinIndex(fields=["genre"], name="feed_genre"),
+            GinIndex(fields=["cast"], name="feed_cast"),
+            # pending releases by due time, for the release dispatcher
+            models.Index(
+                fields=["scheduled_release_at"],
+                name="feed_release_due",
+                condition=models.Q(
+                    is_released=False, scheduled_release_at__isnull=False
+                ),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.slug}"
 
 
+class FilmFacetCount(BaseModelMixin):
+    """
+    Released films per facet value, kept current by a trigger on feed_feed
+    that adjusts the affected rows whenever a film is released, edited or
+    removed.
+    """
+
+    facet = models.CharField(
+        _("Facet"), max_length=20, choices=enums.FilmFacet.choices()
+    )
+    value = models.CharField(_("Value"), max_length=100)
+    films_count = models.BigIntegerField(_("Films Count"), default=0)
+
+    class Meta:
+        verbose_name = _("Film Facet Count")
+        verbose_name_plural = _("Film Facet Counts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["facet", "value"], name="unique_film_facet_value"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value} ({self.films_count})"
+
+
 class Purchase(BaseModelMixin):
     id = models.CharField(
         primary_key=True, blank=True, null=False, unique=True, max_length=100
@@ -187,6 +246,11 @@ class Purchase(BaseModelMixin):
     class Meta:
         verbose_name = _("Film Purchase")
         verbose_name_plural = _("Film Purchases")
+        indexes = [
+            models.Index(
+                fields=["owner", "film", "status"], name="purchase_owner_film_status"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.id:
@@ -197,7 +261,7 @@ class Purchase(BaseModelMixin):
         return f"film({self.film.id})-{self.owner.first_name}-purchase({self.id})"
 
 
-class Short(BaseModelMixin):
+class Short(ScheduledReleaseMixin, BaseModelMixin):
     owner = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -292,6 +356,37 @@ class Short(BaseModelMixin):
     class Meta:
         verbose_name = _("Short")
         verbose_name_plural = _("Shorts")
+        # one per public list ordering, for keyset pagination
+        indexes = [
+            models.Index(
+                fields=["is_released", "-release_date", "-id"],
+                name="short_released_date",
+            ),
+            models.Index(
+                fields=["is_released", "-date_added", "-id"],
+                name="short_released_added",
+            ),
+            models.Index(
+                fields=["is_released", "-views_count", "-id"],
+                name="short_released_views",
+            ),
+            models.Index(
+                fields=["is_released", "-likes_count", "-id"],
+                name="short_released_likes",
+            ),
+            models.Index(
+                fields=["is_released", "-comments_count", "-id"],
+                name="short_released_comments",
+            ),
+            GinIndex(fields=["tags"], name="short_tags"),
+            models.Index(
+                fields=["scheduled_release_at"],
+                name="short_release_due",
+                condition=models.Q(
+                    is_released=False, scheduled_release_at__isnull=False
+                ),
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -303,3 +398,101 @@ class Short(BaseModelMixin):
     def __str__(self):
         base = self.slug or self.title or str(self.pk)
         return f"{base} (short)"
+
+
+class ShortTag(BaseModelMixin):
+    name = models.CharField(_("Name"), max_length=50, unique=True)
+    shorts_count = models.BigIntegerField(
+        _("Shorts Count"),
+        default=0,
+        help_text=_("Number of released shorts carrying the tag"),
+    )
+
+    class Meta:
+        verbose_name = _("Short Tag")
+        verbose_name_plural = _("Short Tags")
+        # prefix LIKE lookups for autocomplete
+        indexes = [
+            models.Index(
+                fields=["name"],
+                name="short_tag_name_prefix",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class DailyViewCount(BaseModelMixin):
+    target_type = models.CharField(
+        _("Target Type"),
+        max_length=10,
+        choices=enums.ViewTargetType.choices(),
+        help_text=_("Whether the views are of a film or a short"),
+    )
+    target_id = models.BigIntegerField(_("Target Id"))
+    date = models.DateField(_("Date"))
+    views = models.BigIntegerField(_("Views"), default=0)
+    unique_views = models.BigIntegerField(
+        _("Unique Views"),
+        default=0,
+        help_text=_("Approximate number of distinct viewers on the day"),
+    )
+
+    class Meta:
+        verbose_name = _("Daily View Count")
+        verbose_name_plural = _("Daily View Counts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target_type", "target_id", "date"],
+                name="unique_daily_view_count",
+            ),
+        ]
+
+
+class ShortLike(BaseModelMixin):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="short_likes",
+        verbose_name=_("User"),
+    )
+    short = models.ForeignKey(
+        Short,
+        on_delete=models.CASCADE,
+        related_name="likes",
+        verbose_name=_("Short"),
+    )
+
+    class Meta:
+        verbose_name = _("Short Like")
+        verbose_name_plural = _("Short Likes")
+        constraints = [
+            models.UniqueConstraint(fields=["user", "short"], name="unique_short_like"),
+        ]
+
+
+class ShortComment(BaseModelMixin):
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="short_comments",
+        verbose_name=_("Owned By"),
+    )
+    short = models.ForeignKey(
+        Short,
+        on_delete=models.CASCADE,
+        related_name="comments",
+        verbose_name=_("Short"),
+    )
+    body = models.TextField(_("Comment"), max_length=1000)
+
+    class Meta:
+        verbose_name = _("Short Comment")
+        verbose_name_plural = _("Short Comments")
+        indexes = [
+            models.Index(
+                fields=["short", "-date_added"], name="shortcomment_short_added"
+            ),
+        ]
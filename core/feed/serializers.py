@@ -1,5 +1,6 @@
 import datetime
 
+from django.conf import settings
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
@@ -9,8 +10,9 @@ from core.file_storage.models import FileModel
 from core.users.serializers import BaseUserSerializer
 from core.utils import enums
 from core.utils.exceptions import exceptions
+from core.utils.helpers.analytics import ShortRankingUtils
 
-from .models import Feed, Purchase, Short
+from .models import Feed, Purchase, Short, ShortComment, ShortTag
 
 
 class BaseFilmSerializer(serializers.ModelSerializer):
@@ -28,9 +30,11 @@ class FeedSerializer:
                 "duration",
                 "slug",
                 "saved",
+                "views_count",
                 "is_released",
                 "date_added",
                 "date_last_modified",
+                "search_vector",
             ]
 
         def validate_cast(self, value):
@@ -59,14 +63,21 @@ class FeedSerializer:
 
         class Meta:
             model = Feed
-            exclude = ["saved", "date_last_modified"]
+            exclude = ["saved", "date_last_modified", "search_vector"]
 
     class FeedRetrieve(serializers.ModelSerializer):
         owner = BaseUserSerializer()
 
         class Meta:
             model = Feed
-            exclude = ["bought", "saved", "date_last_modified"]
+            exclude = ["bought", "saved", "date_last_modified", "search_vector"]
+
+    class FilmSearchQuerySerializer(serializers.Serializer):
+        q = serializers.CharField(
+            max_length=200,
+            trim_whitespace=True,
+            help_text=_("Words to match in title, cast, genre and plot"),
+        )
 
 
 class ShortSerializer:
@@ -111,6 +122,49 @@ class ShortSerializer:
                 raise serializers.ValidationError("You do not own the provided film.")
             return value
 
+        def validate_tags(self, value):
+            from core.utils.helpers.feed import ShortTagUtils
+
+            return ShortTagUtils.normalize(value)
+
+    class RankedShortsQuerySerializer(serializers.Serializer):
+        tag = serializers.CharField(
+            max_length=50, required=False, help_text=_("Rank within one tag")
+        )
+        language = serializers.CharField(
+            max_length=2, required=False, help_text=_("Rank within one language")
+        )
+        cursor = serializers.CharField(
+            required=False, help_text=_("The pagination cursor value.")
+        )
+        page_size = serializers.IntegerField(
+            min_value=1,
+            max_value=50,
+            required=False,
+            help_text=_("Number of results to return per page."),
+        )
+
+        def validate_tag(self, value):
+            from core.utils.helpers.feed import ShortTagUtils
+
+            tags = ShortTagUtils.normalize([value])
+            if not tags:
+                raise serializers.ValidationError("tag cannot be blank")
+            return tags[0]
+
+        def validate_cursor(self, value):
+            cursor = ShortRankingUtils.decode_cursor(value)
+            if cursor is None:
+                raise serializers.ValidationError("Invalid cursor")
+            return cursor
+
+        def validate(self, attrs):
+            if attrs.get("tag") and attrs.get("language"):
+                raise serializers.ValidationError(
+                    "Rank by either tag or language, not both."
+                )
+            return attrs
+
     class ShortRetrieve(serializers.ModelSerializer):
         owner = BaseUserSerializer()
         film = BaseFilmSerializer()
@@ -120,6 +174,86 @@ class ShortSerializer:
             exclude = ["saved", "date_last_modified"]
 
 
+class ShortTagSerializer:
+    class AutocompleteQuerySerializer(serializers.Serializer):
+        q = serializers.CharField(
+            max_length=50, help_text=_("Start of the tag, e.g. what has been typed")
+        )
+
+    class TagRetrieve(serializers.ModelSerializer):
+        class Meta:
+            model = ShortTag
+            fields = ["name", "shorts_count"]
+
+
+class ShortEngagementSerializer:
+    class CommentCreate(serializers.ModelSerializer):
+        class Meta:
+            model = ShortComment
+            fields = ["body"]
+
+    class CommentRetrieve(serializers.ModelSerializer):
+        owner = BaseUserSerializer()
+
+        class Meta:
+            model = ShortComment
+            fields = ["id", "owner", "short", "body", "date_added"]
+
+    class LikeStateSerializer(serializers.Serializer):
+        short_id = serializers.IntegerField(read_only=True)
+        liked = serializers.BooleanField(read_only=True)
+
+    class LikedShortsQuerySerializer(serializers.Serializer):
+        ids = serializers.CharField(
+            help_text=_("Comma separated short ids, e.g. from one feed page")
+        )
+
+        def validate_ids(self, value):
+            try:
+                ids = [int(i) for i in value.split(",") if i.strip()]
+            except ValueError:
+                raise serializers.ValidationError("ids must be integers")
+            if not ids or len(ids) > settings.LIKED_SHORTS_MAX_IDS:
+                raise serializers.ValidationError(
+                    f"Provide between 1 and {settings.LIKED_SHORTS_MAX_IDS} ids."
+                )
+            return ids
+
+    class LikedShortsSerializer(serializers.Serializer):
+        liked = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+
+class FilmFacetCountSerializer(serializers.Serializer):
+    value = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
+class FilmFacetsSerializer(serializers.Serializer):
+    genre = FilmFacetCountSerializer(many=True, read_only=True)
+    language = FilmFacetCountSerializer(many=True, read_only=True)
+    type = FilmFacetCountSerializer(many=True, read_only=True)
+    sale_type = FilmFacetCountSerializer(many=True, read_only=True)
+
+
+class ViewEventSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=enums.ViewTargetType.choices())
+    id = serializers.IntegerField(min_value=1)
+
+
+class ViewBeaconSerializer(serializers.Serializer):
+    events = ViewEventSerializer(
+        many=True, allow_empty=False, max_length=settings.VIEW_BEACON_MAX_EVENTS
+    )
+    viewer_id = serializers.CharField(
+        required=False,
+        max_length=128,
+        help_text=_(
+            "Anonymous player id issued by this endpoint, used for unique counts "
+            "when signed out"
+        ),
+    )
+
+
 class FilmPurchaseSerializer:
     class CreatePurchase(serializers.ModelSerializer):
         method = serializers.ChoiceField(
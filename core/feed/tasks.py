@@ -4,15 +4,16 @@ from celery import shared_task
 from loguru import logger
 
 from core.utils.enums import PurchaseStatusType
+from core.utils.helpers.playback import AccessUtils
 
-from .models import Feed, Short
 from .views import _get_model_by_name
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue="beats")
 def release_object(self, object_id: int, object_model_name: str = None):
     """
-    Releases an object (Feed or Short) at due time.
+    Releases an object (Feed or Short) at due time. Releases are dispatched
+    by dispatch_due_releases now; this still serves ETA tasks queued before.
     """
     try:
         model = _get_model_by_name(object_model_name)
@@ -49,39 +50,65 @@ def release_object(self, object_id: int, object_model_name: str = None):
         raise
 
 
+@shared_task
+def dispatch_due_releases():
+    """
+    Release every film and short whose scheduled release time has passed.
+    """
+    from core.utils.helpers.feed import ReleaseSchedulerUtils
+
+    return ReleaseSchedulerUtils.release_due()
+
+
 @shared_task
 def reconcile_due_releases():
     """
     Safety net: run periodically to release any objects due in the past
     that may have been missed (e.g., worker down).
     """
-    now = timezone.now()
+    from core.utils.helpers.feed import ReleaseSchedulerUtils
 
-    # For Feed
-    due_feeds = Feed.objects.filter(
-        is_released=False,
-        release_date__isnull=False,
-        release_date__lte=now.date(),
-    )
-    released_count = 0
-    for f in due_feeds:
-        f.is_released = True
-        f.save(update_fields=["is_released", "date_last_modified"])
-        released_count += 1
-
-    # For Short
-    due_shorts = Short.objects.filter(
-        is_released=False,
-        release_date__isnull=False,
-        release_date__lte=now.date(),
-    )
-    for s in due_shorts:
-        s.is_released = True
-        s.save(update_fields=["is_released", "date_last_modified"])
-        released_count += 1
+    return ReleaseSchedulerUtils.release_overdue()
+
+
+@shared_task
+def flush_view_counts():
+    """
+    Write views buffered in redis to views_count and the daily rollups.
+    """
+    from core.utils.helpers.analytics import ViewCounterUtils
+
+    return ViewCounterUtils.flush()
+
+
+@shared_task
+def flush_engagement_counts():
+    """
+    Write buffered likes and like/comment counter increments for shorts.
+    """
+    from core.utils.helpers.analytics import EngagementUtils
+
+    return EngagementUtils.flush()
+
+
+@shared_task
+def rank_shorts():
+    """
+    Rescore released shorts into a new generation of ranked feeds.
+    """
+    from core.utils.helpers.analytics import ShortRankingUtils
 
-    logger.info(f"reconcile_due_releases: released={released_count}")
-    return released_count
+    return ShortRankingUtils.rebuild()
+
+
+@shared_task
+def refresh_short_tags():
+    """
+    Recount released shorts per tag for tag autocomplete.
+    """
+    from core.utils.helpers.feed import ShortTagUtils
+
+    return ShortTagUtils.refresh()
 
 
 @shared_task
@@ -97,7 +124,14 @@ def expire_due_rentals():
         expiry_time__isnull=False,
         expiry_time__lte=now,
     )
-    updated = qs.update(status=PurchaseStatusType.EXPIRED.value)
+    due = list(qs.values_list("id", "owner_id", "film_id"))
+    updated = Purchase.objects.filter(
+        id__in=[purchase_id for purchase_id, _, _ in due],
+        status=PurchaseStatusType.ACTIVE.value,
+    ).update(status=PurchaseStatusType.EXPIRED.value)
+    AccessUtils.invalidate_entitlements(
+        (owner_id, film_id) for _, owner_id, film_id in due
+    )
     if updated:
         logger.info(f"expire_due_rentals: expired={updated}")
     return updated
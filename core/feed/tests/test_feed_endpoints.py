@@ -1,3 +1,7 @@
+import base64
+import gzip
+import json
+from datetime import timedelta
 from decimal import Decimal
 
 from django.urls import reverse
@@ -8,11 +12,30 @@ from rest_framework import status
 from rest_framework.permissions import IsAdminUser
 from rest_framework.test import APIClient
 
+from core.feed import throttles as feed_throttles
 from core.feed import views as feed_views
-from core.feed.models import Feed, Short
+from core.feed.models import (
+    DailyViewCount,
+    Feed,
+    Short,
+    ShortComment,
+    ShortLike,
+    ShortTag,
+)
+from core.feed.tasks import (
+    dispatch_due_releases,
+    flush_engagement_counts,
+    flush_view_counts,
+    rank_shorts,
+    reconcile_due_releases,
+    refresh_short_tags,
+)
 from core.feed.tests.factories.feed_factories import FeedFactory, ShortFactory
 from core.file_storage.tests.factories.file_storage_factories import FileModelFactory
 from core.utils import enums
+from core.utils.helpers.analytics import ViewCounterUtils
+from core.utils.helpers.feed import FilmSearchUtils, catalog_released
+from core.utils.helpers.redis import RedisTools
 from core.utils.services.flutterwave import FlutterwaveService
 from core.wallet.tests.factories.wallet_factories import WalletFactory
 
@@ -20,10 +43,16 @@ pytestmark = pytest.mark.django_db
 
 LIST_CREATE_FILM_URL = reverse("list-create-film")
 PUBLIC_FILM_LIST_URL = reverse("public-film-list")
+SEARCH_FILMS_URL = reverse("search-films")
+FILM_FACETS_URL = reverse("film-facets")
 BOOKMARK_URL = reverse("bookmark-film")
 REMOVE_BOOKMARK_URL = reverse("unbookmark-film")
 LIST_CREATE_SHORT_URL = reverse("list-create-short")
 PUBLIC_SHORT_LIST_URL = reverse("public-short-list")
+SHORT_TAG_AUTOCOMPLETE_URL = reverse("short-tag-autocomplete")
+RANKED_SHORT_LIST_URL = reverse("ranked-short-list")
+RECORD_VIEWS_URL = reverse("record-views")
+LIKED_SHORTS_URL = reverse("liked-shorts")
 
 
 def user_films_url(user_id):
@@ -46,6 +75,14 @@ def short_detail_url(short_id):
     return reverse("rud-short", args=[short_id])
 
 
+def like_short_url(short_id):
+    return reverse("like-short", args=[short_id])
+
+
+def short_comments_url(short_id):
+    return reverse("list-create-short-comment", args=[short_id])
+
+
 def build_film_payload(**overrides):
     payload = {
         "title": "Test Film",
@@ -279,18 +316,20 @@ def test_public_film_list_success(anonymous_client):
     response = anonymous_client.get(PUBLIC_FILM_LIST_URL)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 1
     assert response.data["results"][0]["id"] == released.id
+    assert response.data["next"] is None
 
 
 def test_public_film_list_pagination(anonymous_client):
     FeedFactory.create_batch(12, is_released=True)
 
-    response = anonymous_client.get(f"{PUBLIC_FILM_LIST_URL}?limit=5&offset=0")
+    response = anonymous_client.get(f"{PUBLIC_FILM_LIST_URL}?page_size=5")
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 12
+    assert "count" not in response.data
     assert len(response.data["results"]) == 5
+    assert response.data["next"]
 
 
 def test_public_film_list_filtering(anonymous_client):
@@ -302,7 +341,88 @@ def test_public_film_list_filtering(anonymous_client):
     )
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 1
+
+
+def test_public_film_list_cursor_walks_ties_and_nulls(anonymous_client):
+    today = timezone.now().date()
+    films = FeedFactory.create_batch(4, is_released=True, release_date=today)
+    films += FeedFactory.create_batch(
+        3, is_released=True, release_date=today - timedelta(days=1)
+    )
+    films += FeedFactory.create_batch(2, is_released=True, release_date=None)
+
+    seen, url = [], f"{PUBLIC_FILM_LIST_URL}?page_size=2"
+    while url:
+        response = anonymous_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen += [film["id"] for film in response.data["results"]]
+        url = response.data["next"]
+
+    undated = sorted((f.id for f in films if f.release_date is None), reverse=True)
+    by_day = sorted(
+        (f for f in films if f.release_date),
+        key=lambda f: (f.release_date, f.id),
+        reverse=True,
+    )
+    assert seen == undated + [f.id for f in by_day]
+
+
+def test_public_film_list_cursor_ascending_ends_with_nulls(anonymous_client):
+    today = timezone.now().date()
+    films = FeedFactory.create_batch(3, is_released=True, release_date=today)
+    films += FeedFactory.create_batch(2, is_released=True, release_date=None)
+
+    seen, url = [], f"{PUBLIC_FILM_LIST_URL}?ordering=release_date&page_size=2"
+    while url:
+        response = anonymous_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen += [film["id"] for film in response.data["results"]]
+        url = response.data["next"]
+
+    dated = sorted(f.id for f in films if f.release_date)
+    undated = sorted(f.id for f in films if f.release_date is None)
+    assert seen == dated + undated
+
+
+def test_public_film_list_constant_queries(anonymous_client, django_assert_num_queries):
+    FeedFactory.create_batch(6, is_released=True)
+    first = anonymous_client.get(f"{PUBLIC_FILM_LIST_URL}?page_size=3")
+
+    with django_assert_num_queries(1):
+        response = anonymous_client.get(first.data["next"])
+
+    assert len(response.data["results"]) == 3
+
+
+def test_public_film_list_invalid_cursor(anonymous_client):
+    response = anonymous_client.get(f"{PUBLIC_FILM_LIST_URL}?cursor=not-a-cursor")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "url, ordering, value",
+    [
+        (PUBLIC_FILM_LIST_URL, "-release_date", {"a": 1}),
+        (PUBLIC_FILM_LIST_URL, "-release_date", [1, 2]),
+        (PUBLIC_FILM_LIST_URL, "-release_date", "not-a-date"),
+        (PUBLIC_SHORT_LIST_URL, "-release_date", {"a": 1}),
+        (PUBLIC_SHORT_LIST_URL, "-views_count", "many"),
+    ],
+)
+def test_public_list_rejects_forged_cursor_values(
+    anonymous_client, url, ordering, value
+):
+    FeedFactory(is_released=True)
+    ShortFactory(is_released=True)
+    cursor = base64.urlsafe_b64encode(
+        json.dumps({"o": ordering, "id": 1, "v": value}).encode()
+    ).decode()
+
+    response = anonymous_client.get(url, {"ordering": ordering, "cursor": cursor})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 def test_public_film_list_empty(anonymous_client):
@@ -311,7 +431,6 @@ def test_public_film_list_empty(anonymous_client):
     response = anonymous_client.get(PUBLIC_FILM_LIST_URL)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 0
     assert response.data["results"] == []
 
 
@@ -338,6 +457,264 @@ def test_public_film_list_not_found(anonymous_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+# Catalog response cache
+
+
+def test_public_film_list_served_from_cache(
+    anonymous_client, django_assert_num_queries
+):
+    FeedFactory.create_batch(3, is_released=True)
+    first = anonymous_client.get(f"{PUBLIC_FILM_LIST_URL}?page_size=2&ordering=-price")
+
+    with django_assert_num_queries(0):
+        second = anonymous_client.get(
+            f"{PUBLIC_FILM_LIST_URL}?ordering=-price&page_size=2&type="
+        )
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second["ETag"] == first["ETag"]
+    assert json.loads(second.content) == json.loads(first.content)
+
+
+def test_public_film_list_conditional_and_gzip(anonymous_client):
+    FeedFactory(is_released=True)
+    first = anonymous_client.get(PUBLIC_FILM_LIST_URL)
+
+    not_modified = anonymous_client.get(
+        PUBLIC_FILM_LIST_URL, HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+    zipped = anonymous_client.get(PUBLIC_FILM_LIST_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified["ETag"] == first["ETag"]
+    assert zipped["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(zipped.content)) == first.json()
+
+
+def test_public_film_list_cache_follows_saves(anonymous_client):
+    film = FeedFactory(is_released=True, title="Before")
+    first = anonymous_client.get(PUBLIC_FILM_LIST_URL)
+
+    film.title = "After"
+    film.save()
+    second = anonymous_client.get(PUBLIC_FILM_LIST_URL)
+
+    assert second["ETag"] != first["ETag"]
+    assert second.json()["results"][0]["title"] == "After"
+
+
+def test_film_detail_cache_skipped_for_owner(
+    authenticated_client, creator_client, film, django_assert_num_queries
+):
+    authenticated_client.get(film_detail_url(film.id))
+
+    # only the JWT user lookup
+    with django_assert_num_queries(1):
+        cached = authenticated_client.get(film_detail_url(film.id))
+    owner_response = creator_client.get(film_detail_url(film.id))
+
+    assert "bought" not in cached.json()
+    assert "bought" in owner_response.data
+
+
+# Film search
+
+
+def test_search_films_ranks_title_above_plot(anonymous_client):
+    in_plot = FeedFactory(
+        is_released=True, title="Quiet Harbour", plot="A lighthouse keeper waits"
+    )
+    in_title = FeedFactory(is_released=True, title="The Lighthouse", plot="Storms")
+    FeedFactory(is_released=False, title="Lighthouse Draft")
+    FeedFactory(is_released=True, title="Unrelated")
+
+    response = anonymous_client.get(f"{SEARCH_FILMS_URL}?q=lighthouses")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [f["id"] for f in response.data["results"]] == [in_title.id, in_plot.id]
+
+
+def test_search_films_matches_cast_with_facets(anonymous_client):
+    drama = FeedFactory(
+        is_released=True,
+        cast=["Ada Obi"],
+        genre=[enums.FilmGenreType.DRAMA.value],
+        price=Decimal("5.00"),
+    )
+    FeedFactory(is_released=True, cast=["Ada Obi"], price=Decimal("5.00"))
+    FeedFactory(
+        is_released=True,
+        cast=["Ada Obi"],
+        genre=[enums.FilmGenreType.DRAMA.value],
+        price=Decimal("50.00"),
+    )
+
+    response = anonymous_client.get(
+        f"{SEARCH_FILMS_URL}?q=obi&genre={enums.FilmGenreType.DRAMA.value}"
+        "&price__lte=10"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [f["id"] for f in response.data["results"]] == [drama.id]
+
+
+def test_search_films_vector_follows_updates(anonymous_client):
+    film = FeedFactory(is_released=True, title="Before")
+    film.title = "After the Flood"
+    film.save(update_fields=["title"])
+
+    response = anonymous_client.get(f"{SEARCH_FILMS_URL}?q=flood")
+
+    assert [f["id"] for f in response.data["results"]] == [film.id]
+    assert anonymous_client.get(f"{SEARCH_FILMS_URL}?q=before").data["results"] == []
+
+
+def test_search_films_tolerates_typos(anonymous_client):
+    if not FilmSearchUtils.has_trigram():
+        pytest.skip("pg_trgm is not available")
+    film = FeedFactory(is_released=True, title="Lighthouse")
+
+    response = anonymous_client.get(f"{SEARCH_FILMS_URL}?q=lighthuose")
+
+    assert [f["id"] for f in response.data["results"]] == [film.id]
+
+
+def test_search_films_requires_query(anonymous_client):
+    response = anonymous_client.get(SEARCH_FILMS_URL)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Film facets
+
+
+def test_film_facets_catalog_follows_release_update_and_delete(anonymous_client):
+    drama = enums.FilmGenreType.DRAMA.value
+    action = enums.FilmGenreType.ACTION.value
+    film = FeedFactory(genre=[drama, action], language="yo")
+    FeedFactory(is_released=True, genre=[action], language="en")
+
+    film.is_released = True
+    film.save()
+    response = anonymous_client.get(FILM_FACETS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["genre"] == [
+        {"value": action, "count": 2},
+        {"value": drama, "count": 1},
+    ]
+    assert response.data["language"] == [
+        {"value": "en", "count": 1},
+        {"value": "yo", "count": 1},
+    ]
+
+    Feed.objects.filter(id=film.id).update(genre=[drama])
+    assert anonymous_client.get(FILM_FACETS_URL).data["genre"] == [
+        {"value": action, "count": 1},
+        {"value": drama, "count": 1},
+    ]
+
+    film.delete()
+    facets = anonymous_client.get(FILM_FACETS_URL).data
+    assert facets["genre"] == [{"value": action, "count": 1}]
+    assert facets["type"] == [
+        {"value": enums.FilmCategoryType.STANDALONE.value, "count": 1}
+    ]
+
+
+def test_film_facets_for_current_filter(anonymous_client):
+    drama = enums.FilmGenreType.DRAMA.value
+    FeedFactory(is_released=True, genre=[drama], language="yo", price=Decimal("5"))
+    FeedFactory(is_released=True, genre=[drama], language="en", price=Decimal("50"))
+    FeedFactory(is_released=True, language="yo", price=Decimal("5"))
+    FeedFactory(genre=[drama], language="yo", price=Decimal("5"))
+
+    response = anonymous_client.get(f"{FILM_FACETS_URL}?genre={drama}&price__lte=10")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["genre"] == [{"value": drama, "count": 1}]
+    assert response.data["language"] == [{"value": "yo", "count": 1}]
+    assert response.data["sale_type"] == [
+        {"value": enums.FilmSaleType.ONE_TIME_SALE.value, "count": 1}
+    ]
+
+
+def test_film_facets_invalid_filter(anonymous_client):
+    response = anonymous_client.get(f"{FILM_FACETS_URL}?type=invalid")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Release scheduling
+
+
+def test_release_date_sets_scheduled_release_at(creator_client):
+    release_date = timezone.now().date() + timedelta(days=3)
+    response = creator_client.post(
+        LIST_CREATE_FILM_URL,
+        build_film_payload(release_date=release_date.isoformat()),
+        format="json",
+    )
+    film = Feed.objects.get(id=response.data["id"])
+
+    assert film.scheduled_release_at.date() == release_date
+    assert film.release_task_id is None
+
+    film.release_date = None
+    film.save(update_fields=["release_date"])
+    film.refresh_from_db()
+    assert film.scheduled_release_at is None
+
+
+def test_dispatch_due_releases_releases_in_bulk(
+    anonymous_client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    today = timezone.now().date()
+    due_films = FeedFactory.create_batch(3, release_date=today)
+    due_short = ShortFactory(release_date=today - timedelta(days=1))
+    future = FeedFactory(release_date=today + timedelta(days=1))
+    anonymous_client.get(PUBLIC_FILM_LIST_URL)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_num_queries(2):
+            released = dispatch_due_releases()
+
+    assert released == 4
+    assert Feed.objects.filter(is_released=True).count() == 3
+    assert Short.objects.get(id=due_short.id).scheduled_release_at is None
+    assert Feed.objects.get(id=future.id).scheduled_release_at is not None
+    listed = anonymous_client.get(PUBLIC_FILM_LIST_URL).json()["results"]
+    assert {f["id"] for f in listed} == {f.id for f in due_films}
+    assert dispatch_due_releases() == 0
+
+
+def test_reconcile_due_releases_sends_one_catalog_event(
+    django_capture_on_commit_callbacks,
+):
+    today = timezone.now().date()
+    film = FeedFactory(release_date=today)
+    short = ShortFactory(release_date=today)
+    # due by release date even though it was never scheduled
+    Short.objects.filter(id=short.id).update(scheduled_release_at=None)
+    FeedFactory(release_date=today + timedelta(days=1))
+    events = []
+
+    def receiver(sender, released, **kwargs):
+        events.append(released)
+
+    catalog_released.connect(receiver)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            assert reconcile_due_releases() == 2
+    finally:
+        catalog_released.disconnect(receiver)
+
+    assert events == [{"Feed": [film.id], "Short": [short.id]}]
+    film.refresh_from_db()
+    assert film.is_released is True
+    assert film.scheduled_release_at is None
+
+
 # User film list
 
 
@@ -887,18 +1264,20 @@ def test_public_short_list_success(anonymous_client):
     response = anonymous_client.get(PUBLIC_SHORT_LIST_URL)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 1
     assert response.data["results"][0]["id"] == released.id
+    assert response.data["next"] is None
 
 
 def test_public_short_list_pagination(anonymous_client):
     ShortFactory.create_batch(12, is_released=True)
 
-    response = anonymous_client.get(f"{PUBLIC_SHORT_LIST_URL}?limit=5&offset=0")
+    response = anonymous_client.get(f"{PUBLIC_SHORT_LIST_URL}?page_size=5")
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 12
+    assert "count" not in response.data
     assert len(response.data["results"]) == 5
+    assert response.data["next"]
 
 
 def test_public_short_list_filtering(anonymous_client):
@@ -910,7 +1289,24 @@ def test_public_short_list_filtering(anonymous_client):
     )
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 1
+
+
+def test_public_short_list_cursor_by_views(anonymous_client, django_assert_num_queries):
+    shorts = [ShortFactory(is_released=True, views_count=n % 3) for n in range(7)]
+    first = anonymous_client.get(
+        f"{PUBLIC_SHORT_LIST_URL}?ordering=-views_count&page_size=4"
+    )
+
+    with django_assert_num_queries(1) as captured:
+        second = anonymous_client.get(first.data["next"])
+
+    # the tie-break OR is bounded so the index scan starts at the cursor
+    assert '"feed_short"."views_count" <= ' in captured.captured_queries[0]["sql"]
+    seen = [s["id"] for s in first.data["results"] + second.data["results"]]
+    expected = sorted(shorts, key=lambda s: (s.views_count, s.id), reverse=True)
+    assert seen == [s.id for s in expected]
+    assert second.data["next"] is None
 
 
 def test_public_short_list_empty(anonymous_client):
@@ -919,7 +1315,6 @@ def test_public_short_list_empty(anonymous_client):
     response = anonymous_client.get(PUBLIC_SHORT_LIST_URL)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 0
     assert response.data["results"] == []
 
 
@@ -948,6 +1343,145 @@ def test_public_short_list_not_found(anonymous_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+# Short tags
+
+
+def test_public_short_list_tag_modes(anonymous_client):
+    both = ShortFactory(is_released=True, tags=["comedy", "lagos"])
+    comedy = ShortFactory(is_released=True, tags=["comedy"])
+    ShortFactory(is_released=True, tags=["comedy-drama"])
+
+    any_response = anonymous_client.get(f"{PUBLIC_SHORT_LIST_URL}?tag=Comedy,lagos")
+    all_response = anonymous_client.get(
+        f"{PUBLIC_SHORT_LIST_URL}?tag=comedy,lagos&tag_mode=all"
+    )
+
+    assert {s["id"] for s in any_response.data["results"]} == {both.id, comedy.id}
+    assert [s["id"] for s in all_response.data["results"]] == [both.id]
+
+
+def test_public_short_list_search_matches_whole_tags(anonymous_client):
+    tagged = ShortFactory(is_released=True, caption="Opening", tags=["night"])
+    captioned = ShortFactory(is_released=True, caption="A long night out", tags=[])
+    ShortFactory(is_released=True, caption="Opening", tags=["nightlife"])
+
+    response = anonymous_client.get(f"{PUBLIC_SHORT_LIST_URL}?search=night")
+
+    assert {s["id"] for s in response.data["results"]} == {tagged.id, captioned.id}
+
+
+def test_short_tags_normalized_on_create(creator_client, film, file_model):
+    response = creator_client.post(
+        LIST_CREATE_SHORT_URL,
+        build_short_payload(film, file_model, tags=[" Comedy ", "comedy", "Big  Day"]),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert Short.objects.get(id=response.data["id"]).tags == ["comedy", "big day"]
+
+
+def test_short_tag_autocomplete(anonymous_client):
+    ShortFactory.create_batch(2, is_released=True, tags=["comedy"])
+    ShortFactory(is_released=True, tags=["comic", "drama"])
+    ShortFactory(is_released=False, tags=["comeback"])
+    refresh_short_tags()
+
+    response = anonymous_client.get(f"{SHORT_TAG_AUTOCOMPLETE_URL}?q=Com")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == [
+        {"name": "comedy", "shorts_count": 2},
+        {"name": "comic", "shorts_count": 1},
+    ]
+
+
+def test_refresh_short_tags_drops_unused(anonymous_client):
+    short = ShortFactory(is_released=True, tags=["old"])
+    refresh_short_tags()
+    short.tags = ["new"]
+    short.save(update_fields=["tags"])
+    refresh_short_tags()
+
+    assert list(ShortTag.objects.values_list("name", flat=True)) == ["new"]
+
+
+def test_short_tag_autocomplete_requires_query(anonymous_client):
+    response = anonymous_client.get(SHORT_TAG_AUTOCOMPLETE_URL)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Ranked shorts
+
+
+def test_ranked_shorts_pages_by_score(anonymous_client, django_assert_num_queries):
+    today = timezone.now().date()
+    liked = ShortFactory(is_released=True, likes_count=50, release_date=today)
+    viewed = ShortFactory(is_released=True, views_count=50, release_date=today)
+    old = ShortFactory(
+        is_released=True, likes_count=50, release_date=today - timedelta(days=30)
+    )
+    ShortFactory(is_released=False, likes_count=500)
+    rank_shorts()
+
+    seen, url = [], f"{RANKED_SHORT_LIST_URL}?page_size=2"
+    while url:
+        with django_assert_num_queries(1):
+            response = anonymous_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen += [short["id"] for short in response.data["results"]]
+        url = response.data["next"]
+
+    assert seen == [liked.id, viewed.id, old.id]
+
+
+def test_ranked_shorts_by_tag_and_language(anonymous_client):
+    comedy = ShortFactory(is_released=True, tags=["comedy"], language="en")
+    yoruba = ShortFactory(is_released=True, tags=["drama"], language="yo")
+    rank_shorts()
+
+    by_tag = anonymous_client.get(f"{RANKED_SHORT_LIST_URL}?tag=Comedy")
+    by_language = anonymous_client.get(f"{RANKED_SHORT_LIST_URL}?language=yo")
+
+    assert [s["id"] for s in by_tag.data["results"]] == [comedy.id]
+    assert [s["id"] for s in by_language.data["results"]] == [yoruba.id]
+
+
+def test_ranked_shorts_cursor_keeps_its_generation(anonymous_client):
+    first, second = ShortFactory.create_batch(2, is_released=True)
+    first.likes_count = 10
+    first.save()
+    rank_shorts()
+    page = anonymous_client.get(f"{RANKED_SHORT_LIST_URL}?page_size=1")
+
+    second.likes_count = 100
+    second.save()
+    rank_shorts()
+    following = anonymous_client.get(page.data["next"])
+
+    assert [s["id"] for s in page.data["results"]] == [first.id]
+    assert [s["id"] for s in following.data["results"]] == [second.id]
+    assert following.data["next"] is None
+
+
+def test_ranked_shorts_invalid_query(anonymous_client):
+    both = anonymous_client.get(f"{RANKED_SHORT_LIST_URL}?tag=a&language=en")
+    bad_cursor = anonymous_client.get(f"{RANKED_SHORT_LIST_URL}?cursor=nope")
+
+    assert both.status_code == status.HTTP_400_BAD_REQUEST
+    assert bad_cursor.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_ranked_shorts_empty_before_first_run(anonymous_client):
+    ShortFactory(is_released=True)
+
+    response = anonymous_client.get(RANKED_SHORT_LIST_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"next": None, "results": []}
+
+
 # User short list
 
 
@@ -1028,3 +1562,212 @@ def test_user_shorts_list_not_found(anonymous_client, creator_user):
     response = anonymous_client.get(f"{user_shorts_url(creator_user.id)}unknown/")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# View counting
+
+
+def test_record_views_flushes_counts_and_rollups(
+    anonymous_client, authenticated_client, released_short, film
+):
+    events = [
+        {"type": enums.ViewTargetType.SHORT.value, "id": released_short.id},
+        {"type": enums.ViewTargetType.SHORT.value, "id": released_short.id},
+        {"type": enums.ViewTargetType.FILM.value, "id": film.id},
+    ]
+    response = authenticated_client.post(
+        RECORD_VIEWS_URL, {"events": events}, format="json"
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    # the repeated short in the batch is one view
+    assert response.data["accepted"] == 2
+
+    response = anonymous_client.post(
+        RECORD_VIEWS_URL,
+        {"events": events[:1], "viewer_id": ViewCounterUtils.issue_viewer_id()},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert flush_view_counts() == {"items": 2, "views": 3}
+    released_short.refresh_from_db()
+    film.refresh_from_db()
+    assert released_short.views_count == 2
+    assert film.views_count == 1
+    rollup = DailyViewCount.objects.get(
+        target_type=enums.ViewTargetType.SHORT.value, target_id=released_short.id
+    )
+    assert (rollup.views, rollup.unique_views) == (2, 2)
+
+    # replays by a viewer already counted are dropped
+    response = authenticated_client.post(
+        RECORD_VIEWS_URL, {"events": events[:1]}, format="json"
+    )
+    assert response.data["accepted"] == 0
+
+    # later views on the same day add to the rollup
+    anonymous_client.post(
+        RECORD_VIEWS_URL,
+        {"events": events[:1], "viewer_id": ViewCounterUtils.issue_viewer_id()},
+        format="json",
+    )
+    assert flush_view_counts() == {"items": 1, "views": 1}
+    rollup.refresh_from_db()
+    assert (rollup.views, rollup.unique_views) == (3, 3)
+
+
+def test_record_views_rollup_does_not_go_down_when_counters_expire(
+    anonymous_client, released_short
+):
+    events = [{"type": enums.ViewTargetType.SHORT.value, "id": released_short.id}]
+    for _ in range(2):
+        anonymous_client.post(
+            RECORD_VIEWS_URL,
+            {"events": events, "viewer_id": ViewCounterUtils.issue_viewer_id()},
+            format="json",
+        )
+    flush_view_counts()
+    RedisTools.get_connection().delete(*RedisTools.get_connection().keys("views:hll:*"))
+
+    anonymous_client.post(
+        RECORD_VIEWS_URL,
+        {"events": events, "viewer_id": ViewCounterUtils.issue_viewer_id()},
+        format="json",
+    )
+    flush_view_counts()
+
+    rollup = DailyViewCount.objects.get(
+        target_type=enums.ViewTargetType.SHORT.value, target_id=released_short.id
+    )
+    assert (rollup.views, rollup.unique_views) == (3, 2)
+
+
+def test_record_views_ignores_viewer_ids_it_did_not_issue(
+    anonymous_client, released_short
+):
+    events = [{"type": enums.ViewTargetType.SHORT.value, "id": released_short.id}]
+
+    responses = [
+        anonymous_client.post(
+            RECORD_VIEWS_URL,
+            {"events": events, "viewer_id": f"player-{n}"},
+            format="json",
+        )
+        for n in range(3)
+    ]
+
+    # made-up ids fall back to the client address, so rotating them is one viewer
+    assert [r.data["accepted"] for r in responses] == [1, 0, 0]
+    issued = responses[0].data["viewer_id"]
+    response = anonymous_client.post(
+        RECORD_VIEWS_URL, {"events": events, "viewer_id": issued}, format="json"
+    )
+    assert response.data["accepted"] == 1
+    assert "viewer_id" not in response.data
+
+
+def test_record_views_throttled(monkeypatch, anonymous_client, released_short):
+    monkeypatch.setattr(
+        feed_throttles.RecordViewsThrottle,
+        "THROTTLE_RATES",
+        {"record_views": "2/minute"},
+    )
+    payload = {
+        "events": [{"type": enums.ViewTargetType.SHORT.value, "id": released_short.id}]
+    }
+
+    statuses = [
+        anonymous_client.post(RECORD_VIEWS_URL, payload, format="json").status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [
+        status.HTTP_202_ACCEPTED,
+        status.HTTP_202_ACCEPTED,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+
+
+def test_record_views_invalid_payload(anonymous_client):
+    response = anonymous_client.post(
+        RECORD_VIEWS_URL, {"events": [{"type": "album", "id": 1}]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Likes and comments
+
+
+def test_like_short_is_written_behind(authenticated_client, user, released_short):
+    response = authenticated_client.post(like_short_url(released_short.id))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["liked"] is True
+    authenticated_client.post(like_short_url(released_short.id))
+
+    assert not ShortLike.objects.exists()
+    response = authenticated_client.get(
+        LIKED_SHORTS_URL, {"ids": f"{released_short.id},999999"}
+    )
+    assert response.data["liked"] == [released_short.id]
+
+    flush_engagement_counts()
+    released_short.refresh_from_db()
+    assert released_short.likes_count == 1
+    assert ShortLike.objects.filter(user=user, short=released_short).exists()
+
+    response = authenticated_client.delete(like_short_url(released_short.id))
+    assert response.data["liked"] is False
+    flush_engagement_counts()
+    released_short.refresh_from_db()
+    assert released_short.likes_count == 0
+    assert not ShortLike.objects.exists()
+
+
+def test_liked_shorts_loads_membership_from_database(
+    authenticated_client, user, released_short
+):
+    ShortLike.objects.create(user=user, short=released_short)
+
+    response = authenticated_client.get(
+        LIKED_SHORTS_URL, {"ids": str(released_short.id)}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["liked"] == [released_short.id]
+
+
+def test_like_short_not_found(authenticated_client, short):
+    response = authenticated_client.post(like_short_url(short.id))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_like_short_unauthorized(anonymous_client, released_short):
+    response = anonymous_client.post(like_short_url(released_short.id))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_short_comments_success(authenticated_client, anonymous_client, released_short):
+    response = authenticated_client.post(
+        short_comments_url(released_short.id), {"body": "Great!"}, format="json"
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert ShortComment.objects.filter(short=released_short).count() == 1
+
+    flush_engagement_counts()
+    released_short.refresh_from_db()
+    assert released_short.comments_count == 1
+
+    response = anonymous_client.get(short_comments_url(released_short.id))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["body"] == "Great!"
+
+
+def test_short_comments_invalid_payload(authenticated_client, released_short):
+    response = authenticated_client.post(
+        short_comments_url(released_short.id), {}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
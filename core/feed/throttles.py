@@ -0,0 +1,5 @@
+from core.utils.throttles import UserTokenBucketThrottle
+
+
+class RecordViewsThrottle(UserTokenBucketThrottle):
+    scope = "record_views"
@@ -2,14 +2,22 @@ from django.urls import path
 
 from .views import (
     Bookmark,
+    FilmFacets,
+    LikedShorts,
+    LikeShort,
     ListCreateFeed,
     ListCreateShort,
+    ListCreateShortComment,
     PublicFeedList,
     PublicShortsList,
     PurchaseFilm,
+    RankedShortsList,
+    RecordViews,
     RemoveBookmark,
     RetrieveUpdateDeleteFeed,
     RetrieveUpdateDeleteShort,
+    SearchFilms,
+    ShortTagAutocomplete,
     UserFeedsList,
     UserShortsList,
 )
@@ -17,6 +25,8 @@ from .views import (
 urlpatterns = [
     path("films/", ListCreateFeed.as_view(), name="list-create-film"),
     path("films/all/", PublicFeedList.as_view(), name="public-film-list"),
+    path("films/search/", SearchFilms.as_view(), name="search-films"),
+    path("films/facets/", FilmFacets.as_view(), name="film-facets"),
     path("users/<int:pk>/feeds/", UserFeedsList.as_view(), name="user-film-list"),
     path("films/<int:pk>/", RetrieveUpdateDeleteFeed.as_view(), name="rud-film"),
     path("films/<int:pk>/purchase", PurchaseFilm.as_view(), name="purchase-film"),
@@ -25,6 +35,16 @@ urlpatterns = [
     path("remove_bookmark/", RemoveBookmark.as_view(), name="unbookmark-film"),
     path("shorts/", ListCreateShort.as_view(), name="list-create-short"),
     path("shorts/all/", PublicShortsList.as_view(), name="public-short-list"),
+    path("shorts/ranked/", RankedShortsList.as_view(), name="ranked-short-list"),
+    path("shorts/tags/", ShortTagAutocomplete.as_view(), name="short-tag-autocomplete"),
     path("users/<int:pk>/shorts/", UserShortsList.as_view(), name="user-short-list"),
     path("shorts/<int:pk>/", RetrieveUpdateDeleteShort.as_view(), name="rud-short"),
+    path("shorts/<int:pk>/like/", LikeShort.as_view(), name="like-short"),
+    path("shorts/liked/", LikedShorts.as_view(), name="liked-shorts"),
+    path(
+        "shorts/<int:pk>/comments/",
+        ListCreateShortComment.as_view(),
+        name="list-create-short-comment",
+    ),
+    path("views/", RecordViews.as_view(), name="record-views"),
 ]
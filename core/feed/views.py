@@ -1,4 +1,5 @@
 from django.apps import apps
+from django.conf import settings
 from django.db import transaction as db_transaction
 
 from django_filters.rest_framework import DjangoFilterBackend
@@ -7,14 +8,22 @@ from loguru import logger
 from rest_framework import filters, generics, response, status, views
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 
 from core.utils import enums, exceptions
 from core.utils.commons.utils import serializers
 from core.utils.helpers import payment
+from core.utils.helpers.analytics import (
+    EngagementUtils,
+    ShortRankingUtils,
+    ViewCounterUtils,
+)
 from core.utils.helpers.decorators import (
+    CatalogCacheDecorator,
     IdempotencyDecorator,
     RequestDataManipulationsDecorators,
 )
+from core.utils.pagination import KeysetPagination
 from core.utils.permissions import (
     FilmNotReleased,
     IsAccountType,
@@ -24,8 +33,17 @@ from core.utils.permissions import (
 )
 
 from .filters import FilmFilter, ShortFilter
-from .models import Feed, Short
-from .serializers import FeedSerializer, FilmPurchaseSerializer, ShortSerializer
+from .models import Feed, Short, ShortComment
+from .serializers import (
+    FeedSerializer,
+    FilmFacetsSerializer,
+    FilmPurchaseSerializer,
+    ShortEngagementSerializer,
+    ShortSerializer,
+    ShortTagSerializer,
+    ViewBeaconSerializer,
+)
+from .throttles import RecordViewsThrottle
 
 
 @extend_schema(tags=["feed"])
@@ -94,6 +112,7 @@ class RetrieveUpdateDeleteFeed(views.APIView):
         request=None,
         responses={200: FeedSerializer.FeedRetrieve},
     )
+    @CatalogCacheDecorator.cache_response("film", owner_key="owner")
     def get(self, request, pk):
         try:
             feed = Feed.objects.get(id=pk)
@@ -154,14 +173,84 @@ class RetrieveUpdateDeleteFeed(views.APIView):
 
 @extend_schema(tags=["feed"])
 class PublicFeedList(generics.ListAPIView):
+    """
+    Released films for infinite scroll, keyset paginated; each ordering
+    option has a matching (is_released, <field>, id) index.
+    """
+
     permission_classes = [AllowAny]
     serializer_class = FeedSerializer.FeedRetrieve
-    queryset = Feed.objects.filter(is_released=True)
+    queryset = Feed.objects.filter(is_released=True).select_related("owner")
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = FilmFilter
-    ordering_fields = ["release_date", "price"]
+    ordering_fields = ["release_date", "date_added", "price"]
     ordering = ["-release_date"]
 
+    @CatalogCacheDecorator.cache_response("films")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+@extend_schema(tags=["feed"])
+class SearchFilms(generics.ListAPIView):
+    """
+    Ranked full-text search over released films, narrowed by the same
+    facets as the public list.
+    """
+
+    permission_classes = [AllowAny]
+    serializer_class = FeedSerializer.FeedRetrieve
+    queryset = Feed.objects.filter(is_released=True).select_related("owner")
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = FilmFilter
+
+    def filter_queryset(self, queryset):
+        from core.utils.helpers.feed import FilmSearchUtils
+
+        query = FeedSerializer.FilmSearchQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return FilmSearchUtils.search(
+            super().filter_queryset(queryset), query.validated_data["q"]
+        )
+
+    @extend_schema(
+        description="endpoint for searching released films, best matches first",
+        parameters=[FeedSerializer.FilmSearchQuerySerializer],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+@extend_schema(tags=["feed"])
+class FilmFacets(generics.GenericAPIView):
+    """
+    Released film counts per genre, language, type and sale type, for the
+    FilmFilter parameters given or the whole catalog without any.
+    """
+
+    permission_classes = [AllowAny]
+    serializer_class = FilmFacetsSerializer
+    queryset = Feed.objects.filter(is_released=True)
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = FilmFilter
+    pagination_class = None
+
+    @extend_schema(
+        description="endpoint for film facet counts under the current filter",
+        responses={200: FilmFacetsSerializer},
+    )
+    def get(self, request):
+        from core.utils.helpers.feed import FilmFacetUtils
+
+        if set(request.query_params) & set(FilmFilter.base_filters):
+            facets = FilmFacetUtils.count_facets(
+                self.filter_queryset(self.get_queryset())
+            )
+        else:
+            facets = FilmFacetUtils.get_catalog_facets()
+        return response.Response(data=facets, status=status.HTTP_200_OK)
+
 
 @extend_schema(tags=["feed"])
 class UserFeedsList(generics.ListAPIView):
@@ -174,7 +263,13 @@ class UserFeedsList(generics.ListAPIView):
 
     def get_queryset(self):
         owner_id = self.kwargs.get("pk")
-        return Feed.objects.filter(is_released=True, owner_id=owner_id)
+        return Feed.objects.filter(is_released=True, owner_id=owner_id).select_related(
+            "owner"
+        )
+
+    @CatalogCacheDecorator.cache_response("user-films")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
 
 @extend_schema(tags=["shorts"])
@@ -294,14 +389,94 @@ class RetrieveUpdateDeleteShort(views.APIView):
 
 @extend_schema(tags=["shorts"])
 class PublicShortsList(generics.ListAPIView):
+    """
+    Released shorts for infinite scroll, keyset paginated like PublicFeedList.
+    """
+
     permission_classes = [AllowAny]
     serializer_class = ShortSerializer.ShortRetrieve
-    queryset = Short.objects.filter(is_released=True)
+    queryset = Short.objects.filter(is_released=True).select_related("owner", "film")
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = ShortFilter
-    ordering_fields = ["release_date", "views_count", "likes_count", "comments_count"]
+    ordering_fields = [
+        "release_date",
+        "date_added",
+        "views_count",
+        "likes_count",
+        "comments_count",
+    ]
     ordering = ["-release_date"]
 
+    @CatalogCacheDecorator.cache_response("shorts")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+@extend_schema(tags=["shorts"])
+class RankedShortsList(views.APIView):
+    """
+    Released shorts in precomputed rank order, globally or within a tag or
+    language. Pages follow a cursor through one ranking generation.
+    """
+
+    http_method_names = ["get"]
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        description="endpoint for the ranked shorts feed",
+        parameters=[ShortSerializer.RankedShortsQuerySerializer],
+        responses={200: ShortSerializer.ShortRetrieve(many=True)},
+    )
+    def get(self, request):
+        query = ShortSerializer.RankedShortsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        short_ids, next_cursor = ShortRankingUtils.get_page(
+            ShortRankingUtils.get_scope(params.get("tag"), params.get("language")),
+            params.get("cursor"),
+            params.get("page_size") or settings.REST_FRAMEWORK["PAGE_SIZE"],
+        )
+        serializer = ShortSerializer.ShortRetrieve(
+            ShortRankingUtils.hydrate(short_ids), many=True
+        )
+        next_link = (
+            replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+            if next_cursor
+            else None
+        )
+        return response.Response(
+            data={"next": next_link, "results": serializer.data},
+            status=status.HTTP_200_OK,
+        )
+
+
+@extend_schema(tags=["shorts"])
+class ShortTagAutocomplete(generics.ListAPIView):
+    """
+    Tags in use on released shorts that start with q, most used first.
+    """
+
+    permission_classes = [AllowAny]
+    serializer_class = ShortTagSerializer.TagRetrieve
+    pagination_class = None
+
+    def get_queryset(self):
+        from core.utils.helpers.feed import ShortTagUtils
+
+        query = ShortTagSerializer.AutocompleteQuerySerializer(
+            data=self.request.query_params
+        )
+        query.is_valid(raise_exception=True)
+        return ShortTagUtils.autocomplete(query.validated_data["q"])
+
+    @extend_schema(
+        description="endpoint for suggesting short tags as the user types",
+        parameters=[ShortTagSerializer.AutocompleteQuerySerializer],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=["shorts"])
 class UserShortsList(generics.ListAPIView):
@@ -314,7 +489,143 @@ class UserShortsList(generics.ListAPIView):
 
     def get_queryset(self):
         owner_id = self.kwargs.get("pk")
-        return Short.objects.filter(is_released=True, owner_id=owner_id)
+        return Short.objects.filter(is_released=True, owner_id=owner_id).select_related(
+            "owner", "film"
+        )
+
+    @CatalogCacheDecorator.cache_response("user-shorts")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+def _get_released_short_id(pk: int) -> int:
+    if not Short.objects.filter(id=pk, is_released=True).exists():
+        raise exceptions.CustomException(
+            message="Short not found", status_code=status.HTTP_404_NOT_FOUND
+        )
+    return pk
+
+
+@extend_schema(tags=["shorts"])
+class LikeShort(views.APIView):
+    """
+    Like state changes only touch redis; the like table and likes_count are
+    written by the flush_engagement_counts task.
+    """
+
+    http_method_names = ["post", "delete"]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        description="endpoint for liking a short",
+        request=None,
+        responses={200: ShortEngagementSerializer.LikeStateSerializer},
+    )
+    def post(self, request, pk):
+        EngagementUtils.set_like(request.user, _get_released_short_id(pk), True)
+        return response.Response(
+            data={"short_id": pk, "liked": True}, status=status.HTTP_200_OK
+        )
+
+    @extend_schema(
+        description="endpoint for removing a like from a short",
+        request=None,
+        responses={200: ShortEngagementSerializer.LikeStateSerializer},
+    )
+    def delete(self, request, pk):
+        EngagementUtils.set_like(request.user, pk, False)
+        return response.Response(
+            data={"short_id": pk, "liked": False}, status=status.HTTP_200_OK
+        )
+
+
+@extend_schema(tags=["shorts"])
+class LikedShorts(views.APIView):
+    http_method_names = ["get"]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        description="endpoint for checking which of a page of shorts the user liked",
+        parameters=[ShortEngagementSerializer.LikedShortsQuerySerializer],
+        responses={200: ShortEngagementSerializer.LikedShortsSerializer},
+    )
+    def get(self, request):
+        serializer = ShortEngagementSerializer.LikedShortsQuerySerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        liked = EngagementUtils.get_liked(
+            request.user, serializer.validated_data["ids"]
+        )
+        return response.Response(data={"liked": liked}, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["shorts"])
+class ListCreateShortComment(generics.ListCreateAPIView):
+    def get_permissions(self):
+        if self.request.method == "GET":
+            return [AllowAny()]
+        return [IsAuthenticated()]
+
+    def get_serializer_class(self):
+        if self.request.method == "POST":
+            return ShortEngagementSerializer.CommentCreate
+        return ShortEngagementSerializer.CommentRetrieve
+
+    def get_queryset(self):
+        return (
+            ShortComment.objects.filter(short_id=self.kwargs["pk"])
+            .select_related("owner")
+            .order_by("-date_added")
+        )
+
+    @extend_schema(
+        description="endpoint for commenting on a short",
+        request=ShortEngagementSerializer.CommentCreate,
+        responses={201: ShortEngagementSerializer.CommentRetrieve},
+    )
+    def post(self, request, pk):
+        serializer = ShortEngagementSerializer.CommentCreate(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        comment = serializer.save(
+            owner=request.user, short_id=_get_released_short_id(pk)
+        )
+        EngagementUtils.add_comment(pk)
+        serializer = ShortEngagementSerializer.CommentRetrieve(instance=comment)
+        return response.Response(data=serializer.data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(tags=["feed"])
+class RecordViews(views.APIView):
+    """
+    Ingests batched player beacons. Views are counted in redis and written
+    to the database by the flush_view_counts task.
+    """
+
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    permission_classes = [AllowAny]
+    throttle_classes = [RecordViewsThrottle]
+
+    @extend_schema(
+        description="endpoint for recording a batch of film and short views",
+        request=ViewBeaconSerializer,
+        responses={202: None},
+    )
+    def post(self, request):
+        serializer = ViewBeaconSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        viewer = ViewCounterUtils.get_viewer(
+            request, serializer.validated_data.get("viewer_id")
+        )
+        accepted = ViewCounterUtils.record_views(
+            serializer.validated_data["events"], viewer
+        )
+        data = {"accepted": accepted}
+        if viewer.startswith("ip:"):
+            # signed out without a valid id; the player sends this one next time
+            data["viewer_id"] = ViewCounterUtils.issue_viewer_id()
+        return response.Response(data=data, status=status.HTTP_202_ACCEPTED)
 
 
 @extend_schema(tags=["purchases"])
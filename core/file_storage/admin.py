@@ -80,7 +80,9 @@ class FileProcessingJobModelAdmin(ModelAdmin):
                     "stages",
                     "metadata",
                     "renditions",
+                    "packaging_mode",
                     "packaging",
+                    "storage",
                     "thumbnails",
                     "audio",
                     "error",
@@ -108,7 +110,11 @@ class FileProcessingJobModelAdmin(ModelAdmin):
         ),
     )
 
-    list_display = ["file__id", "status", "current_stage"]
+    list_display = ["file__id", "status", "current_stage", "stored_bytes"]
     search_fields = ["source_key", "file__id"]
     readonly_fields = ["date_added", "date_last_modified"]
     ordering = ["date_last_modified"]
+
+    @admin.display(description=_("Stored bytes"))
+    def stored_bytes(self, obj):
+        return (obj.storage or {}).get("total")
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.helpers.file_storage import PipelineEstimator, PipelineSimulator
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay an arrival log (or completed job history) against pools of "
+        "pipeline workers to compare queueing delay per pool size and policy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            nargs="+",
+            type=int,
+            default=[2, 4, 8],
+            help="pool sizes to simulate",
+        )
+        parser.add_argument(
+            "--policy",
+            choices=PipelineSimulator.POLICIES,
+            nargs="+",
+            default=PipelineSimulator.POLICIES,
+            help="queue ordering policies to compare",
+        )
+        parser.add_argument(
+            "--log",
+            help="JSON-lines arrival log; defaults to completed job history",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="number of completed jobs to replay when no log is given",
+        )
+
+    def handle(self, *args, **options):
+        # offline, so fit the estimator now rather than predict from defaults
+        PipelineEstimator.build_model()
+        if options["log"]:
+            try:
+                with open(options["log"]) as log:
+                    arrivals = PipelineSimulator.load_arrival_log(log)
+            except (OSError, ValueError, KeyError) as error:
+                raise CommandError(f"could not read arrival log: {error}")
+        else:
+            arrivals = PipelineSimulator.load_job_history(options["limit"])
+
+        if not arrivals:
+            raise CommandError("no arrivals to replay")
+
+        self.stdout.write(
+            f"{'workers':>8} {'policy':>6} {'mean_wait':>10} {'p95_wait':>10} "
+            f"{'max_wait':>10} {'turnaround':>11} {'util':>6}"
+        )
+        for workers in options["workers"]:
+            for policy in options["policy"]:
+                result = PipelineSimulator.simulate(arrivals, workers, policy)
+                self.stdout.write(
+                    f"{workers:>8} {policy:>6} {result['mean_wait']:>10} "
+                    f"{result['p95_wait']:>10} {result['max_wait']:>10} "
+                    f"{result['mean_turnaround']:>11} {result['utilization']:>6}"
+                )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_storage", "0007_alter_filemodel_processing_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="filemodel",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("deferred", "DEFERRED"),
+                    ("pending", "PENDING"),
+                    ("running", "RUNNING"),
+                    ("retrying", "RETRYING"),
+                    ("failed", "FAILED"),
+                    ("completed", "COMPLETED"),
+                ],
+                default="pending",
+                max_length=16,
+                verbose_name="Processing Status",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="fileprocessingjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("deferred", "DEFERRED"),
+                    ("pending", "PENDING"),
+                    ("running", "RUNNING"),
+                    ("retrying", "RETRYING"),
+                    ("failed", "FAILED"),
+                    ("completed", "COMPLETED"),
+                ],
+                default="pending",
+                help_text="The status of the file processing job",
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_storage", "0008_alter_filemodel_processing_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileprocessingjob",
+            name="estimates",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="predicted wall time per stage and in total",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_storage", "0009_fileprocessingjob_estimates"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="filemodel",
+            name="checksum",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="checksum reported by the object store, as <algorithm>:<base64 digest>",
+                max_length=128,
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="fileprocessingjob",
+            name="source_checksum",
+            field=models.CharField(
+                blank=True,
+                help_text="checksum of the uploaded source, as reported by the object store",
+                max_length=128,
+                null=True,
+            ),
+        ),
+    ]
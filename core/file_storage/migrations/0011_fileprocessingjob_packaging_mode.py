@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_storage", "0010_alter_filemodel_checksum_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileprocessingjob",
+            name="packaging_mode",
+            field=models.CharField(
+                choices=[("segmented", "SEGMENTED"), ("byte_range", "BYTE_RANGE")],
+                default="segmented",
+                help_text="segmented writes a file per segment; byte_range writes one file per rendition addressed by byte ranges",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_storage", "0011_fileprocessingjob_packaging_mode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileprocessingjob",
+            name="storage",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="stored bytes per artifact type and lifecycle actions taken",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from django.db import models
 from django.db.models import JSONField
 from django.utils import timezone
@@ -68,7 +70,10 @@ class FileModel(BaseModelMixin):
         max_length=128,
         null=True,
         blank=True,
-        help_text=_("checksum for file integrity verification"),
+        db_index=True,
+        help_text=_(
+            "checksum reported by the object store, as <algorithm>:<base64 digest>"
+        ),
     )
     file_width = models.IntegerField(_("Width of File"), null=True, blank=True)
     file_height = models.IntegerField(_("Height of File"), null=True, blank=True)
@@ -131,7 +136,7 @@ class FileProcessingJob(BaseModelMixin):
         max_length=128,
         blank=True,
         null=True,
-        help_text=_("checksum generated by client during file upload"),
+        help_text=_("checksum of the uploaded source, as reported by the object store"),
     )
     status = models.CharField(
         max_length=32,
@@ -161,6 +166,15 @@ class FileProcessingJob(BaseModelMixin):
         null=True,
         help_text=_("list of produced renditions (keys, sizes e.t.c)"),
     )
+    packaging_mode = models.CharField(
+        max_length=16,
+        choices=enums.PackagingMode.choices(),
+        default=enums.PackagingMode.SEGMENTED.value,
+        help_text=_(
+            "segmented writes a file per segment; byte_range writes one file per "
+            "rendition addressed by byte ranges"
+        ),
+    )
     packaging = JSONField(
         default=dict,
         blank=True,
@@ -173,6 +187,18 @@ class FileProcessingJob(BaseModelMixin):
     audio = JSONField(
         default=dict, blank=True, null=True, help_text=_("audio related outputs")
     )
+    estimates = JSONField(
+        default=dict,
+        blank=True,
+        null=True,
+        help_text=_("predicted wall time per stage and in total"),
+    )
+    storage = JSONField(
+        default=dict,
+        blank=True,
+        null=True,
+        help_text=_("stored bytes per artifact type and lifecycle actions taken"),
+    )
     error = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -190,6 +216,10 @@ class FileProcessingJob(BaseModelMixin):
                     "stage": instance.current_stage,
                     "file_id": instance.file.id,
                     "file_name": instance.file.original_filename,
+                    "estimated_stage_seconds": (
+                        (instance.estimates or {}).get("stages") or {}
+                    ).get(instance.current_stage),
+                    "estimated_remaining_seconds": instance.get_remaining_seconds(),
                     "timestamp": timezone.now().isoformat(),
                 },
             }
@@ -240,15 +270,54 @@ class FileProcessingJob(BaseModelMixin):
     def emit_event(self, event_type: str):
         emit_websocket_event(self, event_type)
 
+    def get_remaining_seconds(self) -> float | None:
+        """
+        Predicted seconds until the job completes, from its stored estimates
+        and the stages that have started so far.
+        """
+        estimates = self.estimates or {}
+        if "total_seconds" not in estimates:
+            return None
+        if self.status == enums.JobStatus.COMPLETED.value:
+            return 0.0
+
+        now = timezone.now()
+        started = {
+            stage: datetime.fromisoformat(data["started_at"])
+            for stage, data in (self.stages or {}).items()
+            if (data or {}).get("started_at")
+        }
+        predicted = estimates.get("stages") or {}
+        if not predicted:
+            elapsed = (now - min(started.values())).total_seconds() if started else 0.0
+            return max(estimates["total_seconds"] - elapsed, 0.0)
+
+        remaining, current = 0.0, None
+        for index, step in enumerate(enums.PIPELINE_STEPS):
+            if any(stage in started for stage in step):
+                current = index
+        for index, step in enumerate(enums.PIPELINE_STEPS):
+            step_seconds = max(predicted.get(stage, 0.0) for stage in step)
+            if current is None or index > current:
+                remaining += step_seconds
+            elif index == current:
+                step_start = min(started[stage] for stage in step if stage in started)
+                elapsed = (now - step_start).total_seconds()
+                remaining += max(step_seconds - elapsed, 0.0)
+        return round(remaining, 1)
+
     def mark_stage(self, stage: str, data: dict = None):
         self.current_stage = stage
         self.status = enums.JobStatus.RUNNING.value
         s = self.stages or {}
+        now = timezone.now().isoformat()
         s[stage] = {
             **(s.get(stage) or {}),
             **(data or {}),
-            "ts": timezone.now().isoformat(),
+            "ts": now,
         }
+        # keep the first start so parallel tasks and retries don't reset it
+        s[stage].setdefault("started_at", now)
         self.stages = s
         self.save(
             update_fields=["current_stage", "status", "stages", "date_last_modified"]
@@ -278,7 +347,13 @@ class FileProcessingJob(BaseModelMixin):
     def mark_completed(self):
         self.status = enums.JobStatus.COMPLETED.value
         self.current_stage = enums.Stage.FINALIZE.value
-        self.save(update_fields=["status", "current_stage", "date_last_modified"])
+        now = timezone.now().isoformat()
+        s = self.stages or {}
+        s[enums.Stage.FINALIZE.value] = {"ts": now, "started_at": now}
+        self.stages = s
+        self.save(
+            update_fields=["status", "current_stage", "stages", "date_last_modified"]
+        )
         self.emit_event(enums.FileProcessingEventType.FILE_JOB_COMPLETED.value)
 
     def __str__(self):
@@ -1,14 +1,61 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
 
 from core.feed.serializers import FeedSerializer
 from core.users.serializers import BaseUserSerializer
-from core.utils.enums import FilePurposeType
+from core.utils.enums import ChecksumAlgorithm, FilePurposeType, PackagingMode
+from core.utils.helpers.file_storage import StorageLifecycleUtils
+
+from .models import FileModel, FileProcessingJob
+
+CHECKSUM_DIGEST_SIZES = {
+    ChecksumAlgorithm.SHA256.value: 32,
+    ChecksumAlgorithm.CRC32C.value: 4,
+}
 
-from .models import FileModel
+
+def validate_client_checksum(attrs: dict) -> dict:
+    """
+    Check that a client checksum comes with its algorithm and is a base64
+    digest of the right length for it.
+    """
+    algorithm, checksum = attrs.get("checksum_algorithm"), attrs.get("checksum")
+    if not algorithm and not checksum:
+        return attrs
+    if not (algorithm and checksum):
+        raise serializers.ValidationError(
+            _("checksum and checksum_algorithm must be sent together")
+        )
+    try:
+        digest = base64.b64decode(checksum, validate=True)
+    except (binascii.Error, ValueError):
+        raise serializers.ValidationError({"checksum": _("Must be base64 encoded")})
+    if len(digest) != CHECKSUM_DIGEST_SIZES[algorithm]:
+        raise serializers.ValidationError(
+            {"checksum": _("Digest length does not match the checksum algorithm")}
+        )
+    return attrs
 
 
 class FileSerializer:
     class FileCreate(serializers.ModelSerializer):
+        checksum_algorithm = serializers.ChoiceField(
+            choices=ChecksumAlgorithm.choices(), required=False, write_only=True
+        )
+        checksum = serializers.CharField(
+            required=False,
+            write_only=True,
+            help_text=_(
+                "base64 checksum the client computed; checked against the checksum "
+                "the object store reports"
+            ),
+        )
+
         class Meta:
             model = FileModel
             exclude = [
@@ -16,20 +63,79 @@ class FileSerializer:
                 "last_processed_at",
                 "is_verified",
                 "file_key",
+                "file_size",
                 "hls_master_key",
                 "dash_mpd_key",
                 "has_audio",
                 "last_error",
             ]
 
+        def validate(self, attrs):
+            return validate_client_checksum(super().validate(attrs))
+
+        @staticmethod
+        def pop_checksum(validated_data: dict) -> dict | None:
+            """
+            Remove the declared checksum from validated data, returning it as
+            {"algorithm", "value"}.
+            """
+            algorithm = validated_data.pop("checksum_algorithm", None)
+            value = validated_data.pop("checksum", None)
+            if not (algorithm and value):
+                return None
+            return {"algorithm": algorithm, "value": value}
+
+    class BatchCreate(serializers.Serializer):
+        files = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=settings.UPLOAD_BATCH_MAX_FILES,
+        )
+
+        def validate_files(self, value):
+            """
+            Files already registered from their storage event, passed in the
+            "ingested" context as {id: FileModel}, are validated as partial
+            updates of those files.
+            """
+            ingested = self.context.get("ingested", {})
+            validated, errors = [], []
+            for item in value:
+                instance = ingested.get(item.get("id"))
+                serializer = FileSerializer.FileCreate(
+                    instance=instance, data=item, partial=instance is not None
+                )
+                if serializer.is_valid():
+                    validated.append(serializer.validated_data)
+                    errors.append({})
+                else:
+                    errors.append(serializer.errors)
+            if any(errors):
+                raise serializers.ValidationError(errors)
+
+            ids = [item["id"] for item in validated]
+            if len(ids) != len(set(ids)):
+                raise serializers.ValidationError(_("Duplicate file ids in batch"))
+            return validated
+
     class ListRetrieve(serializers.ModelSerializer):
         owner = BaseUserSerializer()
         film = FeedSerializer.FeedRetrieve()
+        processing_estimate = serializers.SerializerMethodField()
 
         class Meta:
             model = FileModel
             fields = "__all__"
 
+        def get_processing_estimate(self, obj) -> dict | None:
+            try:
+                job = obj.jobs
+            except FileProcessingJob.DoesNotExist:
+                return None
+            if not job.estimates:
+                return None
+            return {**job.estimates, "remaining_seconds": job.get_remaining_seconds()}
+
 
 class SignedURLSerializer:
     class SignedURLRequestSerializer(serializers.Serializer):
@@ -37,7 +143,149 @@ class SignedURLSerializer:
         purpose = serializers.ChoiceField(
             choices=FilePurposeType.choices(), required=True
         )
+        file_size = serializers.IntegerField(
+            required=True,
+            min_value=1,
+            help_text=_(
+                "Size of the file in bytes, counted against the upload quota; the "
+                "signed url only accepts an upload of exactly this size"
+            ),
+        )
+        checksum_algorithm = serializers.ChoiceField(
+            choices=ChecksumAlgorithm.choices(), required=False
+        )
+        checksum = serializers.CharField(
+            required=False,
+            help_text=_(
+                "base64 checksum of the file; the object store rejects uploads "
+                "that do not match it"
+            ),
+        )
+        packaging_mode = serializers.ChoiceField(
+            choices=PackagingMode.choices(),
+            required=False,
+            help_text=_(
+                "how the processed video is packaged; byte_range stores one file "
+                "per rendition instead of one per segment"
+            ),
+        )
+
+        def validate(self, attrs):
+            return validate_client_checksum(attrs)
 
     class SignedURLResponseSerializer(serializers.Serializer):
         file_id = serializers.CharField(read_only=True)
         signed_url = serializers.CharField(read_only=True)
+        upload_headers = serializers.DictField(
+            read_only=True,
+            help_text=_("headers to send with the upload request"),
+        )
+
+    class BatchSignedURLRequestSerializer(serializers.Serializer):
+        files = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=settings.UPLOAD_BATCH_MAX_FILES,
+        )
+
+        def validate_files(self, value):
+            serializer = SignedURLSerializer.SignedURLRequestSerializer(
+                data=value, many=True
+            )
+            serializer.is_valid(raise_exception=True)
+            return serializer.validated_data
+
+    class BatchSignedURLResponseSerializer(serializers.Serializer):
+        files = serializers.ListField(child=serializers.DictField(), read_only=True)
+
+
+class UploadPartSerializer(serializers.Serializer):
+    part_number = serializers.IntegerField(min_value=1)
+    etag = serializers.CharField()
+    checksum = serializers.CharField(required=False, allow_null=True)
+    size = serializers.IntegerField(read_only=True)
+
+
+class PresignedPartSerializer(serializers.Serializer):
+    part_number = serializers.IntegerField(read_only=True)
+    url = serializers.CharField(read_only=True)
+    headers = serializers.DictField(read_only=True)
+
+
+class MultipartUploadSerializer:
+    class InitiateRequestSerializer(serializers.Serializer):
+        file_name = serializers.CharField(required=True)
+        purpose = serializers.ChoiceField(
+            choices=FilePurposeType.choices(), required=True
+        )
+        file_size = serializers.IntegerField(
+            required=True,
+            min_value=1,
+            help_text=_("Size of the file in bytes, used to lay out the parts"),
+        )
+        checksum_algorithm = serializers.ChoiceField(
+            choices=ChecksumAlgorithm.choices(),
+            required=False,
+            help_text=_("when set, every part must be presigned with its checksum"),
+        )
+        packaging_mode = serializers.ChoiceField(
+            choices=PackagingMode.choices(), required=False
+        )
+
+    class InitiateResponseSerializer(serializers.Serializer):
+        file_id = serializers.CharField(read_only=True)
+        upload_id = serializers.CharField(read_only=True)
+        part_size = serializers.IntegerField(read_only=True)
+        part_count = serializers.IntegerField(read_only=True)
+        checksum_algorithm = serializers.CharField(read_only=True, allow_null=True)
+
+    class PresignPartsRequestSerializer(serializers.Serializer):
+        part_numbers = serializers.ListField(
+            child=serializers.IntegerField(min_value=1),
+            allow_empty=False,
+            max_length=settings.MULTIPART_MAX_PARTS_PER_REQUEST,
+        )
+        checksums = serializers.DictField(
+            child=serializers.CharField(),
+            required=False,
+            help_text=_("base64 checksum of each part, keyed by part number"),
+        )
+
+    class PresignPartsResponseSerializer(serializers.Serializer):
+        parts = PresignedPartSerializer(many=True, read_only=True)
+
+    class ListPartsResponseSerializer(serializers.Serializer):
+        upload_id = serializers.CharField(read_only=True)
+        part_size = serializers.IntegerField(read_only=True)
+        part_count = serializers.IntegerField(read_only=True)
+        parts = UploadPartSerializer(many=True, read_only=True)
+
+    class CompleteRequestSerializer(serializers.Serializer):
+        parts = UploadPartSerializer(
+            many=True,
+            required=False,
+            help_text=_(
+                "part numbers and etags to assemble; defaults to the parts S3 holds"
+            ),
+        )
+
+
+class StorageReportSerializer(serializers.Serializer):
+    owner_id = serializers.IntegerField(read_only=True)
+    owner_email = serializers.EmailField(source="owner__email", read_only=True)
+    jobs = serializers.IntegerField(read_only=True)
+    source_bytes = serializers.IntegerField(read_only=True)
+    mp4_bytes = serializers.IntegerField(read_only=True)
+    hls_bytes = serializers.IntegerField(read_only=True)
+    dash_bytes = serializers.IntegerField(read_only=True)
+    thumbnails_bytes = serializers.IntegerField(read_only=True)
+    stored_bytes = serializers.IntegerField(read_only=True)
+    archived_bytes = serializers.IntegerField(read_only=True)
+    monthly_cost = serializers.SerializerMethodField(
+        help_text=_("estimated storage cost per month at the configured rates")
+    )
+
+    def get_monthly_cost(self, obj) -> float:
+        return StorageLifecycleUtils.get_monthly_cost(
+            obj["stored_bytes"], obj["archived_bytes"]
+        )
@@ -1,18 +1,28 @@
 import os
 from datetime import timedelta
 
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
 from celery import chain, group, shared_task
 from loguru import logger
 from rest_framework import status
 
 from core.file_storage.models import FileProcessingJob
-from core.utils.enums import DEFAULT_RENDITIONS, Stage
+from core.utils.enums import DEFAULT_RENDITIONS, JobStatus, PackagingMode, Stage
 from core.utils.exceptions import exceptions
 from core.utils.helpers.file_storage import (
     FileProcessingUtils,
+    HLSManifestUtils,
+    PipelineEstimator,
     StorageClient,
+    StorageIngestUtils,
+    StorageLifecycleUtils,
     StorageUtils,
+    UploadAdmissionUtils,
 )
+from core.utils.helpers.playback import AccessUtils
 
 
 def resolve_renditions(user_renditions: list[dict] | None) -> list[dict]:
@@ -105,6 +115,9 @@ def validate_and_extract_metadata(self, job_id: int):
     job.metadata = meta
     FileProcessingUtils.update_obj_fields(job, {"metadata": meta})
 
+    # refine the size-based estimate now that duration and codec are known
+    PipelineEstimator.estimate_job(job)
+
     # update file fields
     FileProcessingUtils.update_obj_fields(
         job.file,
@@ -253,6 +266,7 @@ def package_hls(self, job_id: int):
     mp4_dir = StorageUtils.ensure_dir(os.path.join(job_dir, "mp4"))
     hls_dir = StorageUtils.ensure_dir(os.path.join(job_dir, "hls"))
     client = StorageClient()
+    byte_range = job.packaging_mode == PackagingMode.BYTE_RANGE.value
 
     # For each rendition, repackage to HLS (segment)
     variant_infos = []
@@ -280,22 +294,44 @@ def package_hls(self, job_id: int):
             "6",
             "-hls_playlist_type",
             "vod",
-            "-hls_segment_filename",
-            os.path.join(variant_dir, f"{name}_%04d.ts"),
-            variant_m3u8,
         ]
+        if byte_range:
+            # one .ts per rendition; the playlist addresses segments with
+            # EXT-X-BYTERANGE instead of naming a file for each
+            cmd += [
+                "-hls_flags",
+                "single_file",
+                "-hls_segment_filename",
+                os.path.join(variant_dir, f"{name}.ts"),
+            ]
+        else:
+            cmd += [
+                "-hls_segment_filename",
+                os.path.join(variant_dir, f"{name}_%04d.ts"),
+            ]
+        cmd.append(variant_m3u8)
         StorageUtils.run_cmd(cmd, timeout=60 * 60, job=job)
 
-        # Upload variant playlist + segments
+        # Measure the produced segments and write the I-frame playlist
+        # before uploading, so both land under the variant prefix
+        streams = FileProcessingUtils.ffprobe_get_json(local_mp4, job=job).get(
+            "streams", []
+        )
+        nominal = (r.get("video_bitrate", 1000) + r.get("audio_bitrate", 0)) * 1000
+        variant = HLSManifestUtils.describe_variant(variant_m3u8, streams, nominal)
+
+        # Upload variant playlist, I-frame playlist + segments
         prefix = f"processed/{job.owner.email}/{job.id}/hls/{job.file.id}/{name}"
         FileProcessingUtils.upload_packaging_outputs(variant_dir, prefix, job=job)
+        if variant["iframe"]:
+            variant["iframe"]["playlist"] = f"{prefix}/{variant['iframe']['playlist']}"
 
         variant_infos.append(
             {
                 "name": name,
                 "playlist": f"{prefix}/{name}.m3u8",
-                "bandwidth": r.get("video_bitrate", 1000) * 1000,
                 "resolution": f"{r.get('width')}x{r.get('height')}",
+                **variant,
             }
         )
 
@@ -304,9 +340,15 @@ def package_hls(self, job_id: int):
     )
 
     packaging = job.packaging or {}
-    packaging["hls"] = {"master": master_key, "variants": variant_infos}
+    packaging["hls"] = {
+        "master": master_key,
+        "mode": job.packaging_mode,
+        "variants": variant_infos,
+    }
     FileProcessingUtils.update_obj_fields(job, {"packaging": packaging})
     FileProcessingUtils.update_obj_fields(job.file, {"hls_master_key": master_key})
+    if job.file.film_id:
+        AccessUtils.invalidate_film_entitlements(job.file.film_id)
     return {"hls_master": master_key}
 
 
@@ -357,25 +399,29 @@ def package_dash(self, job_id: int):
         cmd += ["-map", f"{idx}:v:0"]
         cmd += ["-map", f"{idx}:a:0?"]
 
-    cmd += [
-        "-c",
-        "copy",
-        "-f",
-        "dash",
-        "-use_timeline",
-        "1",
-        "-use_template",
-        "1",
-        "-seg_duration",
-        "6",
-        "-init_seg_name",
-        "init_$RepresentationID$.m4s",
-        "-media_seg_name",
-        "chunk_$RepresentationID$_$Number%05d$.m4s",
-        "-adaptation_sets",
-        "id=0,streams=v id=1,streams=a",
-        local_mpd,
-    ]
+    cmd += ["-c", "copy", "-f", "dash", "-seg_duration", "6"]
+    if job.packaging_mode == PackagingMode.BYTE_RANGE.value:
+        # one fragmented mp4 per representation; the manifest describes it
+        # with a SegmentList whose Initialization range and SegmentURL
+        # mediaRange entries address each fragment by byte range
+        cmd += [
+            "-single_file",
+            "1",
+            "-single_file_name",
+            "stream_$RepresentationID$.mp4",
+        ]
+    else:
+        cmd += [
+            "-use_timeline",
+            "1",
+            "-use_template",
+            "1",
+            "-init_seg_name",
+            "init_$RepresentationID$.m4s",
+            "-media_seg_name",
+            "chunk_$RepresentationID$_$Number%05d$.m4s",
+        ]
+    cmd += ["-adaptation_sets", "id=0,streams=v id=1,streams=a", local_mpd]
     StorageUtils.run_cmd(cmd, timeout=60 * 60, cwd=dash_dir, job=job)
 
     # Upload all DASH outputs
@@ -383,7 +429,7 @@ def package_dash(self, job_id: int):
     FileProcessingUtils.upload_packaging_outputs(dash_dir, prefix)
 
     packaging = job.packaging or {}
-    packaging["dash"] = {"mpd": f"{prefix}/stream.mpd"}
+    packaging["dash"] = {"mpd": f"{prefix}/stream.mpd", "mode": job.packaging_mode}
     FileProcessingUtils.update_obj_fields(job, {"packaging": packaging})
     FileProcessingUtils.update_obj_fields(
         job.file, {"dash_mpd_key": f"{prefix}/stream.mpd"}
@@ -455,6 +501,8 @@ def finalize_job(self, job_id: int):
     job = FileProcessingJob.objects.get(pk=job_id)
     job.mark_completed()
 
+    if settings.USING_MANAGED_STORAGE:
+        StorageLifecycleUtils.measure_job(job)
     StorageUtils.cleanup_job_workdir(job_id)
     logger.success(f"Processing job {job_id} completed")
     return job_id
@@ -505,3 +553,79 @@ def start_pipeline(self, job_id: int, renditions: list[dict] = None):
         "job_id": job_id,
         "renditions": [r["name"] for r in renditions],
     }
+
+
+@shared_task(name="file_pipeline.admit_deferred", queue="beats")
+def admit_deferred_jobs():
+    """
+    Start deferred jobs, shortest predicted first (aged by time waited), while
+    the pipeline has free capacity.
+    """
+    headroom = (
+        settings.PIPELINE_MAX_ACTIVE_JOBS - UploadAdmissionUtils.count_started_jobs()
+    )
+    if headroom <= 0:
+        return 0
+
+    now = timezone.now()
+    with transaction.atomic():
+        # order and limit in SQL so only the jobs being started are locked
+        job_ids = list(
+            FileProcessingJob.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.DEFERRED.value)
+            .alias(priority=PipelineEstimator.get_scheduling_priority_expression())
+            .order_by("priority", "id")
+            .values_list("id", flat=True)[:headroom]
+        )
+        FileProcessingJob.objects.filter(id__in=job_ids).update(
+            status=JobStatus.PENDING.value, date_last_modified=now
+        )
+
+    for job_id in job_ids:
+        start_pipeline.delay(job_id)
+
+    if job_ids:
+        logger.info(f"admit_deferred_jobs: started={len(job_ids)}")
+    return len(job_ids)
+
+
+@shared_task(name="file_pipeline.refresh_estimator", queue="beats")
+def refresh_pipeline_estimator():
+    model = PipelineEstimator.build_model()
+    samples = model.get(PipelineEstimator.GLOBAL_PROFILE, {}).get("samples", 0)
+    logger.info(f"refresh_pipeline_estimator: profiles={len(model)} samples={samples}")
+    return samples
+
+
+@shared_task(name="file_pipeline.sweep_stranded_uploads", queue="beats")
+def sweep_stranded_uploads():
+    """
+    Register uploads whose storage event and client callback were both lost.
+    """
+    if not settings.USING_MANAGED_STORAGE:
+        return 0
+
+    results = StorageIngestUtils.sweep_stranded_uploads()
+    ingested = [r for r in results if r["status"] in ("processing", "deferred")]
+    if ingested:
+        logger.warning(f"sweep_stranded_uploads: ingested={len(ingested)}")
+    return len(ingested)
+
+
+@shared_task(name="file_pipeline.apply_storage_lifecycle", queue="beats")
+def apply_storage_lifecycle():
+    """
+    Archive or delete intermediates of titles that have been playable for
+    longer than the grace period, per STORAGE_LIFECYCLE_POLICY.
+    """
+    if not settings.USING_MANAGED_STORAGE:
+        return 0
+
+    storage_helper = StorageClient()
+    applied = 0
+    for job in StorageLifecycleUtils.get_due_jobs():
+        if StorageLifecycleUtils.apply_policy(job, storage_helper) is not None:
+            applied += 1
+    if applied:
+        logger.info(f"apply_storage_lifecycle: jobs={applied}")
+    return applied
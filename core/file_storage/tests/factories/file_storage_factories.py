@@ -1,6 +1,6 @@
 import factory
 
-from core.file_storage.models import FileModel
+from core.file_storage.models import FileModel, FileProcessingJob
 from core.users.tests.factories.user_factories import UserFactory
 from core.utils import enums
 
@@ -16,3 +16,13 @@ class FileModelFactory(factory.django.DjangoModelFactory):
     mime_type = "video/mp4"
     original_filename = "video.mp4"
     is_verified = True
+
+
+class FileProcessingJobFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FileProcessingJob
+
+    owner = factory.SubFactory(UserFactory)
+    file = factory.SubFactory(FileModelFactory, owner=factory.SelfAttribute("..owner"))
+    source_key = factory.SelfAttribute("file.file_key")
+    status = enums.JobStatus.PENDING.value
@@ -1,18 +1,43 @@
+from datetime import timedelta
+
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 
 import pytest
 from rest_framework import status
 from rest_framework.permissions import IsAdminUser
 from rest_framework.test import APIClient
 
+from core.file_storage import tasks as file_storage_tasks
 from core.file_storage import views as file_storage_views
 from core.file_storage.models import FileModel, FileProcessingJob
+from core.file_storage.tests.factories.file_storage_factories import (
+    FileModelFactory,
+    FileProcessingJobFactory,
+)
 from core.utils import enums
+from core.utils.helpers.file_storage import (
+    HLSManifestUtils,
+    PipelineEstimator,
+    PipelineSimulator,
+    StorageClient,
+)
+from core.utils.helpers.file_storage import ingest as ingest_utils
+from core.utils.helpers.file_storage import lifecycle as lifecycle_utils
+from core.utils.helpers.file_storage import multipart as multipart_utils
+from core.utils.helpers.file_storage import upload as upload_utils
 
 pytestmark = pytest.mark.django_db
 
+SHA256_CHECKSUM = "47DEQpj8HBSa+/TImW+5JCeuQeRkm5NMpJWZG3hSuFU="
+
 GET_SIGNED_URL = reverse("get-signed-url")
 CREATE_FILE_OBJECT_URL = reverse("create-file-object")
+INITIATE_MULTIPART_URL = reverse("initiate-multipart-upload")
+GET_SIGNED_URLS = reverse("get-signed-urls")
+CREATE_FILE_OBJECTS_URL = reverse("create-file-objects")
+STORAGE_REPORT_URL = reverse("storage-report")
 
 
 def retrieve_file_url(file_id):
@@ -23,10 +48,23 @@ def delete_file_url(file_id):
     return reverse("delete-file", args=[file_id])
 
 
+def presign_parts_url(file_id):
+    return reverse("presign-multipart-parts", args=[file_id])
+
+
+def list_parts_url(file_id):
+    return reverse("list-multipart-parts", args=[file_id])
+
+
+def complete_multipart_url(file_id):
+    return reverse("complete-multipart-upload", args=[file_id])
+
+
 def build_signed_url_payload(**overrides):
     payload = {
         "file_name": "video.mp4",
         "purpose": enums.FilePurposeType.MAIN_FILE.value,
+        "file_size": 1024,
     }
     payload.update(overrides)
     return payload
@@ -47,6 +85,116 @@ def patch_file_cache(monkeypatch, cached_value):
     monkeypatch.setattr(file_storage_views.cache, "delete", lambda key: None)
 
 
+class FakeMultipartS3Client:
+    def __init__(self):
+        self.completed = []
+        self.presigned = []
+        self.object_checksums = {}
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.presigned.append(Params)
+        if operation == "put_object":
+            return f"https://example.com/{Params['Key']}"
+        return f"https://example.com/{Params['UploadId']}/{Params['PartNumber']}"
+
+    def list_parts(self, **kwargs):
+        return {
+            "Parts": [
+                {"PartNumber": 1, "ETag": '"etag-1"', "Size": 64 * 1024 * 1024},
+                {"PartNumber": 2, "ETag": '"etag-2"', "Size": 1024},
+            ],
+            "IsTruncated": False,
+        }
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed.append(kwargs)
+
+    def head_object(self, Bucket, Key, ChecksumMode):
+        return self.object_checksums.get(Key, {})
+
+
+@pytest.fixture
+def fake_multipart_s3(monkeypatch, settings):
+    settings.USING_MANAGED_STORAGE = True
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    s3_client = FakeMultipartS3Client()
+
+    class FakeStorageClient(StorageClient):
+        def __init__(self, config=None):
+            self.s3_client = s3_client
+
+    monkeypatch.setattr(multipart_utils, "StorageClient", FakeStorageClient)
+    monkeypatch.setattr(upload_utils, "StorageClient", FakeStorageClient)
+    return s3_client
+
+
+def write_hls_variant(variant_dir, name, segment_sizes, duration=6.0):
+    variant_dir.mkdir(parents=True)
+    lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:6", "#EXT-X-PLAYLIST-TYPE:VOD"]
+    for index, size in enumerate(segment_sizes):
+        segment = f"{name}_{index:04d}.ts"
+        (variant_dir / segment).write_bytes(b"\0" * size)
+        lines += [f"#EXTINF:{duration:.6f},", segment]
+    lines.append("#EXT-X-ENDLIST")
+    playlist = variant_dir / f"{name}.m3u8"
+    playlist.write_text("\n".join(lines) + "\n")
+    return str(playlist)
+
+
+class FakeLifecycleS3Client:
+    def __init__(self, buckets):
+        self.buckets = buckets
+
+    def get_paginator(self, operation):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                objects = client.buckets.setdefault(Bucket, {})
+                yield {
+                    "Contents": [
+                        {"Key": key, "Size": size}
+                        for key, size in objects.items()
+                        if key.startswith(Prefix)
+                    ]
+                }
+
+        return Paginator()
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.buckets.setdefault(Bucket, {}):
+            raise lifecycle_utils.ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": self.buckets[Bucket][Key]}
+
+    def copy(self, CopySource, Bucket, Key):
+        size = self.buckets[CopySource["Bucket"]][CopySource["Key"]]
+        self.buckets.setdefault(Bucket, {})[Key] = size
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.buckets[Bucket].pop(obj["Key"], None)
+
+
+def build_completed_job_stages(transcode_seconds):
+    start = timezone.now() - timedelta(hours=1)
+    offsets = {
+        enums.Stage.PROBE.value: 0,
+        enums.Stage.VALIDATE.value: 10,
+        enums.Stage.TRANSCODE.value: 20,
+        enums.Stage.PACKAGE_HLS.value: 20 + transcode_seconds,
+        enums.Stage.PACKAGE_DASH.value: 20 + transcode_seconds,
+        enums.Stage.THUMBNAILS.value: 50 + transcode_seconds,
+        enums.Stage.FINALIZE.value: 60 + transcode_seconds,
+    }
+    return {
+        stage: {"started_at": (start + timedelta(seconds=offset)).isoformat()}
+        for stage, offset in offsets.items()
+    }
+
+
 # Get signed upload URL
 
 
@@ -74,6 +222,129 @@ def test_get_signed_url_success(authenticated_client, monkeypatch):
     assert response.data["signed_url"] == "https://example.com/upload"
 
 
+def test_get_signed_url_binds_client_checksum(
+    authenticated_client, user, fake_multipart_s3
+):
+    response = authenticated_client.post(
+        GET_SIGNED_URL,
+        build_signed_url_payload(
+            checksum_algorithm=enums.ChecksumAlgorithm.SHA256.value,
+            checksum=SHA256_CHECKSUM,
+        ),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["upload_headers"]["x-amz-checksum-sha256"] == SHA256_CHECKSUM
+    assert fake_multipart_s3.presigned[0]["ChecksumSHA256"] == SHA256_CHECKSUM
+
+
+def test_get_signed_url_binds_file_size(authenticated_client, fake_multipart_s3):
+    response = authenticated_client.post(
+        GET_SIGNED_URL, build_signed_url_payload(file_size=2048), format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["upload_headers"]["Content-Length"] == "2048"
+    assert fake_multipart_s3.presigned[0]["ContentLength"] == 2048
+
+
+def test_get_signed_url_requires_file_size(authenticated_client):
+    payload = build_signed_url_payload()
+    del payload["file_size"]
+
+    response = authenticated_client.post(GET_SIGNED_URL, payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_signed_url_invalid_checksum(authenticated_client):
+    response = authenticated_client.post(
+        GET_SIGNED_URL,
+        build_signed_url_payload(
+            checksum_algorithm=enums.ChecksumAlgorithm.SHA256.value,
+            checksum="AAAAAA==",
+        ),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_signed_url_throttled_when_account_has_too_many_jobs(
+    authenticated_client, user, settings
+):
+    settings.UPLOAD_MAX_PENDING_JOBS_PER_ACCOUNT = 1
+    FileProcessingJobFactory(owner=user)
+
+    response = authenticated_client.post(
+        GET_SIGNED_URL, build_signed_url_payload(), format="json"
+    )
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response.headers
+
+
+def test_get_signed_url_throttled_when_bytes_in_flight_exceeded(
+    authenticated_client, user, settings
+):
+    settings.UPLOAD_MAX_BYTES_IN_FLIGHT_PER_ACCOUNT = 1024
+    FileProcessingJobFactory(
+        owner=user, file=FileModelFactory(owner=user, file_size=1000)
+    )
+
+    response = authenticated_client.post(
+        GET_SIGNED_URL, build_signed_url_payload(file_size=100), format="json"
+    )
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_get_signed_urls_success(authenticated_client, user, monkeypatch):
+    monkeypatch.setattr(
+        file_storage_views.FileUploadUtils,
+        "generate_presigned_upload_urls",
+        lambda files, **kwargs: [f"https://example.com/{f['file_id']}" for f in files],
+    )
+    payload = {
+        "files": [
+            build_signed_url_payload(
+                file_name="poster.jpg", purpose=enums.FilePurposeType.FILM_POSTER.value
+            ),
+            build_signed_url_payload(file_size=1024),
+        ]
+    }
+
+    response = authenticated_client.post(GET_SIGNED_URLS, payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["files"]) == 2
+    file_ids = [f["file_id"] for f in response.data["files"]]
+    reservations = file_storage_views.UploadAdmissionUtils.get_reservations(user.id)
+    assert set(file_ids) <= set(reservations)
+    pending_upload = file_storage_views.cache.get(f"pending_upload-{file_ids[1]}")
+    assert pending_upload["file_size"] == 1024
+
+
+def test_get_signed_urls_throttled_when_batch_exceeds_job_quota(
+    authenticated_client, settings
+):
+    settings.UPLOAD_MAX_PENDING_JOBS_PER_ACCOUNT = 1
+    payload = {"files": [build_signed_url_payload(), build_signed_url_payload()]}
+
+    response = authenticated_client.post(GET_SIGNED_URLS, payload, format="json")
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_get_signed_urls_invalid_payload(authenticated_client):
+    payload = {"files": [build_signed_url_payload(purpose="invalid")]}
+
+    response = authenticated_client.post(GET_SIGNED_URLS, payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_get_signed_url_unauthorized(anonymous_client):
     response = anonymous_client.post(
         GET_SIGNED_URL, build_signed_url_payload(), format="json"
@@ -142,6 +413,351 @@ def test_create_file_object_success(authenticated_client, user, monkeypatch):
     assert FileProcessingJob.objects.filter(file_id=file_id, owner=user).exists()
 
 
+def test_create_file_object_stores_provider_checksum(
+    authenticated_client, user, fake_multipart_s3, monkeypatch
+):
+    file_key = "uploads/test.mp4"
+    fake_multipart_s3.object_checksums[file_key] = {"ChecksumSHA256": SHA256_CHECKSUM}
+    patch_file_cache(monkeypatch, {"file_key": file_key, "owner": user.id})
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(
+            "upload-file-1",
+            checksum_algorithm=enums.ChecksumAlgorithm.SHA256.value,
+            checksum=SHA256_CHECKSUM,
+        ),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = FileProcessingJob.objects.get(file_id="upload-file-1")
+    assert job.file.checksum == f"sha256:{SHA256_CHECKSUM}"
+    assert job.source_checksum == job.file.checksum
+
+
+def test_create_file_object_stores_provider_file_size(
+    authenticated_client, user, fake_multipart_s3, monkeypatch
+):
+    file_key = "uploads/test.mp4"
+    fake_multipart_s3.object_checksums[file_key] = {"ContentLength": 4096}
+    patch_file_cache(
+        monkeypatch, {"file_key": file_key, "owner": user.id, "file_size": 1024}
+    )
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload("upload-file-1", file_size=1),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert FileModel.objects.get(id="upload-file-1").file_size == 4096
+
+
+def test_create_file_object_uses_requested_packaging_mode(
+    authenticated_client, user, monkeypatch
+):
+    patch_file_cache(
+        monkeypatch,
+        {
+            "file_key": "uploads/test.mp4",
+            "owner": user.id,
+            "packaging_mode": enums.PackagingMode.BYTE_RANGE.value,
+        },
+    )
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload("upload-file-1"),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = FileProcessingJob.objects.get(file_id="upload-file-1")
+    assert job.packaging_mode == enums.PackagingMode.BYTE_RANGE.value
+
+
+def test_create_file_object_checksum_mismatch(
+    authenticated_client, user, fake_multipart_s3, monkeypatch
+):
+    file_key = "uploads/test.mp4"
+    fake_multipart_s3.object_checksums[file_key] = {
+        "ChecksumSHA256": "n4bQgYhMfWWaL+qgxVrQFaO/TxsrC4Is0V1sFbDwCgg="
+    }
+    patch_file_cache(
+        monkeypatch,
+        {
+            "file_key": file_key,
+            "owner": user.id,
+            "checksum": {
+                "algorithm": enums.ChecksumAlgorithm.SHA256.value,
+                "value": SHA256_CHECKSUM,
+            },
+        },
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload("upload-file-1"),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not FileModel.objects.filter(id="upload-file-1").exists()
+
+
+def test_create_file_object_deferred_when_pipeline_is_full(
+    authenticated_client, user, monkeypatch, settings
+):
+    settings.PIPELINE_MAX_ACTIVE_JOBS = 1
+    FileProcessingJobFactory(status=enums.JobStatus.RUNNING.value)
+    file_id = "upload-file-deferred"
+    cached_metadata = {"file_key": "uploads/test.mp4", "owner": user.id}
+    started = []
+
+    patch_file_cache(monkeypatch, cached_metadata)
+    monkeypatch.setattr(
+        file_storage_views.start_pipeline, "delay", lambda *args: started.append(args)
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(file_id),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert not started
+    assert FileProcessingJob.objects.get(file_id=file_id).status == (
+        enums.JobStatus.DEFERRED.value
+    )
+
+
+def test_create_file_object_returns_processing_estimate(
+    authenticated_client, user, monkeypatch, settings
+):
+    settings.PIPELINE_ESTIMATOR_MIN_SAMPLES = 3
+    for _ in range(3):
+        FileProcessingJobFactory(
+            file=FileModelFactory(file_size=1000),
+            status=enums.JobStatus.COMPLETED.value,
+            stages=build_completed_job_stages(transcode_seconds=300),
+        )
+    PipelineEstimator.build_model()
+    cached_metadata = {
+        "file_key": "uploads/test.mp4",
+        "owner": user.id,
+        "file_size": 2000,
+    }
+
+    patch_file_cache(monkeypatch, cached_metadata)
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload("upload-file-estimated"),
+        format="json",
+    )
+
+    estimate = response.data["data"]["processing_estimate"]
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert estimate["basis"] == "size"
+    assert estimate["stages"][enums.Stage.TRANSCODE.value] == 600
+    assert estimate["total_seconds"] == 720
+
+
+def test_estimator_model_miss_queues_refresh_instead_of_building(monkeypatch):
+    FileProcessingJobFactory(
+        status=enums.JobStatus.COMPLETED.value,
+        stages=build_completed_job_stages(transcode_seconds=300),
+    )
+    queued = []
+    monkeypatch.setattr(
+        file_storage_tasks.refresh_pipeline_estimator,
+        "delay",
+        lambda: queued.append(True),
+    )
+    monkeypatch.setattr(
+        PipelineEstimator,
+        "build_model",
+        lambda: pytest.fail("model rebuilt in the request path"),
+    )
+
+    assert PipelineEstimator.predict({"size": 1000})["basis"] == "default"
+    assert PipelineEstimator.predict({"size": 1000})["basis"] == "default"
+    assert queued == [True]
+
+
+def test_admit_deferred_jobs_starts_shortest_job_first(monkeypatch, settings):
+    settings.PIPELINE_MAX_ACTIVE_JOBS = 1
+    long_job = FileProcessingJobFactory(
+        status=enums.JobStatus.DEFERRED.value, estimates={"total_seconds": 3600}
+    )
+    short_job = FileProcessingJobFactory(
+        status=enums.JobStatus.DEFERRED.value, estimates={"total_seconds": 60}
+    )
+    started = []
+    monkeypatch.setattr(
+        file_storage_tasks.start_pipeline, "delay", lambda *args: started.append(args)
+    )
+
+    file_storage_tasks.admit_deferred_jobs()
+
+    assert started == [(short_job.id,)]
+    long_job.refresh_from_db()
+    assert long_job.status == enums.JobStatus.DEFERRED.value
+
+
+def test_admit_deferred_jobs_ages_waiting_jobs_in_sql(monkeypatch, settings):
+    settings.PIPELINE_MAX_ACTIVE_JOBS = 2
+    waited = FileProcessingJobFactory(
+        status=enums.JobStatus.DEFERRED.value, estimates={"total_seconds": 3600}
+    )
+    FileProcessingJob.objects.filter(id=waited.id).update(
+        date_added=timezone.now() - timedelta(hours=2)
+    )
+    unestimated = FileProcessingJobFactory(
+        status=enums.JobStatus.DEFERRED.value, estimates={}
+    )
+    FileProcessingJobFactory(
+        status=enums.JobStatus.DEFERRED.value, estimates={"total_seconds": 1800}
+    )
+    settings.PIPELINE_DEFAULT_JOB_SECONDS = 60
+    started = []
+    monkeypatch.setattr(
+        file_storage_tasks.start_pipeline, "delay", lambda *args: started.append(args)
+    )
+
+    file_storage_tasks.admit_deferred_jobs()
+
+    # the long job has waited past its estimate; the unestimated one uses the
+    # default; the fresh 30 minute job keeps waiting
+    assert started == [(waited.id,), (unestimated.id,)]
+
+
+def test_simulate_pipeline_command_replays_arrival_log(tmp_path, capsys):
+    log = tmp_path / "arrivals.jsonl"
+    log.write_text(
+        "\n".join(
+            f'{{"arrival": {arrival}, "service_seconds": 600}}'
+            for arrival in (0, 10, 20, 30)
+        )
+    )
+
+    call_command("simulate_pipeline", "--log", str(log), "--workers", "1", "4")
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 5
+    assert lines[-1].split()[:3] == ["4", "sjf", "0.0"]
+
+
+def test_simulated_sjf_ages_waiting_jobs_like_the_scheduler():
+    arrivals = [
+        {"arrival": 0, "service": 100, "predicted": 100},
+        {"arrival": 10, "service": 200, "predicted": 200},
+        {"arrival": 90, "service": 150, "predicted": 150},
+    ]
+
+    result = PipelineSimulator.simulate(arrivals, workers=1, policy="sjf")
+
+    # the job waiting since 10s outranks the shorter one that arrived at 90s
+    assert result["max_wait"] == 210
+    assert result["mean_wait"] == 100
+
+
+def test_create_file_object_after_storage_event_attaches_metadata(
+    authenticated_client, user, film
+):
+    file = FileModelFactory(owner=user, original_filename="upload.mp4")
+    FileProcessingJobFactory(owner=user, file=file)
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(file.id, film=film.id),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    file.refresh_from_db()
+    assert file.film == film
+    assert FileProcessingJob.objects.filter(file=file).count() == 1
+
+
+def test_create_file_object_ingested_during_registration_attaches_metadata(
+    authenticated_client, user, film, monkeypatch
+):
+    file_id = "upload-file-raced"
+    patch_file_cache(monkeypatch, {"file_key": "uploads/raced.mp4", "owner": user.id})
+
+    def inspect_then_ingest(file_key, declared, storage_helper=None):
+        # the storage event lands after the lookup but before the insert
+        file = FileModelFactory(id=file_id, owner=user, file_key=file_key)
+        FileProcessingJobFactory(owner=user, file=file)
+        return {"checksum": None, "file_size": None}
+
+    monkeypatch.setattr(
+        upload_utils.FileUploadUtils, "inspect_upload", inspect_then_ingest
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(file_id, film=film.id),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["message"] == "file already registered"
+    assert FileModel.objects.get(id=file_id).film == film
+    assert FileProcessingJob.objects.filter(file_id=file_id).count() == 1
+
+
+def test_sweep_stranded_uploads_walks_tracked_uploads(user, monkeypatch, settings):
+    settings.USING_MANAGED_STORAGE = True
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    prefix = f"uploads/{user.email.lower()}/main_file"
+    registered = FileModelFactory(owner=user, file_key=f"{prefix}/registered.mp4")
+    keys = {
+        name: f"{prefix}/{name}.mp4"
+        for name in ("stranded", "fresh", "in_flight", "abandoned")
+    }
+    upload_utils.FileUploadUtils.track_uploads(*keys.values(), registered.file_key)
+    tracked = upload_utils.FileUploadUtils.PENDING_UPLOADS_KEY
+    client = ingest_utils.RedisTools.get_connection()
+    hour_ago = timezone.now().timestamp() - 3600
+    for key in [registered.file_key, *keys.values()]:
+        if key != keys["fresh"]:
+            client.zadd(tracked, {key: hour_ago})
+    file_storage_views.cache.set(
+        "pending_upload-in_flight", {"file_key": keys["in_flight"], "owner": user.id}
+    )
+    heads = []
+
+    class FakeS3Client:
+        def head_object(self, Bucket, Key, ChecksumMode=None):
+            heads.append(Key)
+            if Key != keys["stranded"]:
+                raise ingest_utils.ClientError({"Error": {"Code": "404"}}, "HeadObject")
+            return {"ContentLength": 20}
+
+    class FakeStorageClient(StorageClient):
+        def __init__(self, config=None):
+            self.s3_client = FakeS3Client()
+
+    monkeypatch.setattr(ingest_utils, "StorageClient", FakeStorageClient)
+    monkeypatch.setattr(file_storage_tasks.start_pipeline, "delay", lambda *_: None)
+
+    assert file_storage_tasks.sweep_stranded_uploads() == 1
+    assert FileModel.objects.get(id="stranded").file_size == 20
+    assert registered.file_key not in heads
+    assert keys["fresh"] not in heads
+    remaining = {member.decode() for member in client.zrange(tracked, 0, -1)}
+    assert remaining == {keys["fresh"], keys["in_flight"]}
+
+
 def test_create_file_object_unauthorized(anonymous_client):
     response = anonymous_client.post(
         CREATE_FILE_OBJECT_URL,
@@ -194,6 +810,320 @@ def test_create_file_object_not_found(anonymous_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_create_file_objects_success(authenticated_client, user, monkeypatch, settings):
+    settings.PIPELINE_MAX_ACTIVE_JOBS = 1
+    file_ids = ["batch-file-1", "batch-file-2"]
+    for file_id in file_ids:
+        file_storage_views.cache.set(
+            f"pending_upload-{file_id}",
+            {"file_key": f"uploads/{file_id}.mp4", "owner": user.id},
+        )
+    started = []
+    monkeypatch.setattr(
+        file_storage_views.start_pipeline, "delay", lambda *args: started.append(args)
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECTS_URL,
+        {"files": [build_create_file_payload(file_id) for file_id in file_ids]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert len(response.data["data"]) == 2
+    jobs = FileProcessingJob.objects.filter(file_id__in=file_ids).order_by("file_id")
+    assert [job.status for job in jobs] == [
+        enums.JobStatus.PENDING.value,
+        enums.JobStatus.DEFERRED.value,
+    ]
+    assert started == [(jobs[0].id,)]
+    assert file_storage_views.cache.get("pending_upload-batch-file-1") is None
+
+
+def test_create_file_objects_after_storage_event_attaches_metadata(
+    authenticated_client, user, film, monkeypatch
+):
+    file_keys = {}
+    for file_id in ["batch-file-4", "batch-file-5"]:
+        file_keys[file_id] = f"uploads/{user.email.lower()}/main_file/{file_id}.mp4"
+        file_storage_views.cache.set(
+            f"pending_upload-{file_id}",
+            {"file_key": file_keys[file_id], "owner": user.id},
+        )
+    monkeypatch.setattr(file_storage_tasks.start_pipeline, "delay", lambda *_: None)
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+    ingest_utils.StorageIngestUtils.ingest_object(file_keys["batch-file-4"])
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECTS_URL,
+        {
+            "files": [
+                build_create_file_payload("batch-file-4", film=film.id),
+                build_create_file_payload("batch-file-5"),
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert [f["id"] for f in response.data["data"]] == list(file_keys)
+    assert FileModel.objects.get(id="batch-file-4").film == film
+    assert FileModel.objects.filter(id="batch-file-5").exists()
+    assert FileProcessingJob.objects.filter(file_id__in=file_keys).count() == 2
+
+
+def test_create_file_objects_forbidden(authenticated_client, other_creator_user):
+    file_storage_views.cache.set(
+        "pending_upload-batch-file-3",
+        {"file_key": "uploads/batch-file-3.mp4", "owner": other_creator_user.id},
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECTS_URL,
+        {"files": [build_create_file_payload("batch-file-3")]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not FileModel.objects.filter(id="batch-file-3").exists()
+
+
+def test_create_file_objects_duplicate_ids(authenticated_client):
+    payload = {
+        "files": [
+            build_create_file_payload("batch-file-4"),
+            build_create_file_payload("batch-file-4"),
+        ]
+    }
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECTS_URL, payload, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_create_file_objects_unauthorized(anonymous_client):
+    response = anonymous_client.post(
+        CREATE_FILE_OBJECTS_URL,
+        {"files": [build_create_file_payload("batch-file-5")]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# Multipart upload
+
+
+def test_multipart_upload_success(
+    authenticated_client, user, fake_multipart_s3, monkeypatch
+):
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=64 * 1024 * 1024 + 1024),
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["upload_id"] == "upload-1"
+    assert response.data["part_size"] == 64 * 1024 * 1024
+    assert response.data["part_count"] == 2
+    file_id = response.data["file_id"]
+
+    response = authenticated_client.post(
+        presign_parts_url(file_id), {"part_numbers": [2, 1]}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [part["part_number"] for part in response.data["parts"]] == [1, 2]
+    assert [params["ContentLength"] for params in fake_multipart_s3.presigned] == [
+        64 * 1024 * 1024,
+        1024,
+    ]
+
+    response = authenticated_client.get(list_parts_url(file_id))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["parts"]) == 2
+
+    response = authenticated_client.post(
+        complete_multipart_url(file_id), {}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(fake_multipart_s3.completed[0]["MultipartUpload"]["Parts"]) == 2
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL, build_create_file_payload(file_id), format="json"
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert FileModel.objects.get(id=file_id).file_size == 64 * 1024 * 1024 + 1024
+
+
+def test_multipart_upload_composite_checksum_is_not_compared_or_stored(
+    authenticated_client, fake_multipart_s3, monkeypatch
+):
+    monkeypatch.setattr(file_storage_views.start_pipeline, "delay", lambda *_: None)
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(
+            file_size=1024, checksum_algorithm=enums.ChecksumAlgorithm.SHA256.value
+        ),
+        format="json",
+    )
+    file_id = response.data["file_id"]
+    authenticated_client.post(complete_multipart_url(file_id), {}, format="json")
+    file_key = multipart_utils.cache.get(f"pending_upload-{file_id}")["file_key"]
+    fake_multipart_s3.object_checksums[file_key] = {
+        "ChecksumSHA256": "Zm9vYmFyYmF6cXV4cXV1eGNvcmdlZ3JhdWx0Z2FycGx5PQ==-2",
+        "ChecksumType": "COMPOSITE",
+    }
+
+    # a full-object checksum declared by the client cannot equal the composite
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(
+            file_id,
+            checksum_algorithm=enums.ChecksumAlgorithm.SHA256.value,
+            checksum=SHA256_CHECKSUM,
+        ),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = FileProcessingJob.objects.get(file_id=file_id)
+    assert job.file.checksum is None
+    assert job.source_checksum is None
+
+
+def test_complete_multipart_upload_after_ingest_keeps_pending_entry_gone(
+    authenticated_client, fake_multipart_s3, monkeypatch
+):
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=1024),
+        format="json",
+    )
+    file_id = response.data["file_id"]
+    pending_key = f"pending_upload-{file_id}"
+
+    def complete_and_ingest(**kwargs):
+        # the ObjectCreated event is ingested before complete returns
+        multipart_utils.cache.delete(pending_key)
+
+    monkeypatch.setattr(
+        fake_multipart_s3, "complete_multipart_upload", complete_and_ingest
+    )
+
+    response = authenticated_client.post(
+        complete_multipart_url(file_id), {}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert multipart_utils.cache.get(pending_key) is None
+
+
+def test_create_file_object_rejects_incomplete_multipart_upload(
+    authenticated_client, fake_multipart_s3
+):
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=1024),
+        format="json",
+    )
+
+    response = authenticated_client.post(
+        CREATE_FILE_OBJECT_URL,
+        build_create_file_payload(response.data["file_id"]),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_presign_parts_out_of_range(authenticated_client, fake_multipart_s3):
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=1024),
+        format="json",
+    )
+
+    response = authenticated_client.post(
+        presign_parts_url(response.data["file_id"]),
+        {"part_numbers": [1, 2]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_presign_parts_requires_checksums(authenticated_client, fake_multipart_s3):
+    response = authenticated_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(
+            file_size=64 * 1024 * 1024 + 1024,
+            checksum_algorithm=enums.ChecksumAlgorithm.CRC32C.value,
+        ),
+        format="json",
+    )
+    file_id = response.data["file_id"]
+
+    response = authenticated_client.post(
+        presign_parts_url(file_id),
+        {"part_numbers": [1, 2], "checksums": {"1": "yZRlqg=="}},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = authenticated_client.post(
+        presign_parts_url(file_id),
+        {"part_numbers": [1, 2], "checksums": {"1": "yZRlqg==", "2": "AAAAAA=="}},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["parts"][1]["headers"] == {
+        "Content-Length": "1024",
+        "x-amz-checksum-crc32c": "AAAAAA==",
+    }
+    assert fake_multipart_s3.presigned[-1]["ChecksumCRC32C"] == "AAAAAA=="
+
+
+def test_presign_parts_forbidden(
+    authenticated_client, creator_client, fake_multipart_s3
+):
+    response = creator_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=1024),
+        format="json",
+    )
+
+    response = authenticated_client.post(
+        presign_parts_url(response.data["file_id"]),
+        {"part_numbers": [1]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_initiate_multipart_upload_unauthorized(anonymous_client):
+    response = anonymous_client.post(
+        INITIATE_MULTIPART_URL,
+        build_signed_url_payload(file_size=1024),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_initiate_multipart_upload_missing_file_size(authenticated_client):
+    payload = build_signed_url_payload()
+    del payload["file_size"]
+
+    response = authenticated_client.post(INITIATE_MULTIPART_URL, payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 # Retrieve file
 
 
@@ -249,3 +1179,280 @@ def test_delete_file_not_found(creator_client):
     response = creator_client.delete(delete_file_url("missing-file"))
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# HLS manifests
+
+
+def iframe_maps(playlist: str) -> dict:
+    """
+    The EXT-X-MAP byte range in force for each I-frame's media file. Fails if
+    a frame has no map or its map names another file.
+    """
+    lines = playlist.splitlines()
+    assert "#EXT-X-VERSION:5" in lines
+    maps, current = {}, None
+    for line in lines:
+        if line.startswith("#EXT-X-MAP:"):
+            attributes = dict(
+                attribute.split("=", 1)
+                for attribute in line[len("#EXT-X-MAP:") :].split(",")
+            )
+            current = {key: value.strip('"') for key, value in attributes.items()}
+        elif line and not line.startswith("#"):
+            assert current and current["URI"] == line
+            maps[line] = current["BYTERANGE"]
+    return maps
+
+
+def test_hls_variant_measured_with_iframe_playlist(tmp_path, monkeypatch):
+    playlist = write_hls_variant(tmp_path / "720p", "720p", [600_000, 900_000])
+    # the first video packet follows the PAT/PMT at the start of each segment
+    packets = [
+        {"time": 0.0, "pos": 376, "keyframe": True},
+        {"time": 0.04, "pos": 40_000, "keyframe": False},
+        {"time": 2.0, "pos": 200_000, "keyframe": True},
+        {"time": 2.04, "pos": 230_000, "keyframe": False},
+    ]
+    monkeypatch.setattr(
+        HLSManifestUtils,
+        "probe_video_packets",
+        staticmethod(
+            lambda path, **kwargs: [
+                {**p, "time": p["time"] + (6.0 if path.endswith("0001.ts") else 0)}
+                for p in packets
+            ]
+        ),
+    )
+    streams = [
+        {
+            "codec_type": "video",
+            "codec_name": "h264",
+            "profile": "Main",
+            "level": 31,
+            "avg_frame_rate": "30000/1001",
+        },
+        {"codec_type": "audio", "codec_name": "aac", "profile": "LC"},
+    ]
+
+    variant = HLSManifestUtils.describe_variant(playlist, streams, 3_000_000)
+
+    assert variant["bandwidth"] == 1_200_000
+    assert variant["average_bandwidth"] == 1_000_000
+    assert variant["codecs"] == "avc1.4D401F,mp4a.40.2"
+    assert variant["frame_rate"] == "29.970"
+    iframes = (tmp_path / "720p" / "720p_iframes.m3u8").read_text()
+    assert "#EXT-X-I-FRAMES-ONLY" in iframes
+    assert "#EXT-X-BYTERANGE:39624@376\n720p_0000.ts" in iframes
+    assert "#EXTINF:4.000000,\n#EXT-X-BYTERANGE:30000@200000\n720p_0001.ts" in iframes
+    assert iframe_maps(iframes) == {
+        "720p_0000.ts": "376@0",
+        "720p_0001.ts": "376@0",
+    }
+    assert variant["iframe"]["average_bandwidth"] == 92_832
+
+
+def test_hls_master_starts_on_variant_within_budget(tmp_path, settings):
+    settings.HLS_START_BANDWIDTH = 2_000_000
+    variants = [
+        {
+            "playlist": f"processed/hls/{name}/{name}.m3u8",
+            "resolution": resolution,
+            "bandwidth": bandwidth,
+            "average_bandwidth": bandwidth // 2,
+            "codecs": "avc1.4D401F,mp4a.40.2",
+            "frame_rate": "30.000",
+            "iframe": {
+                "playlist": f"processed/hls/{name}/{name}_iframes.m3u8",
+                "bandwidth": bandwidth // 10,
+                "average_bandwidth": bandwidth // 20,
+            },
+        }
+        for name, resolution, bandwidth in [
+            ("1080p", "1920x1080", 6_000_000),
+            ("360p", "640x360", 900_000),
+            ("720p", "1280x720", 3_000_000),
+        ]
+    ]
+
+    master = HLSManifestUtils.build_master_playlist(variants).splitlines()
+
+    uris = [line for line in master if line.endswith(".m3u8")]
+    assert uris == ["720p/720p.m3u8", "360p/360p.m3u8", "1080p/1080p.m3u8"]
+    assert master[3] == (
+        "#EXT-X-STREAM-INF:BANDWIDTH=3000000,AVERAGE-BANDWIDTH=1500000,"
+        'CODECS="avc1.4D401F,mp4a.40.2",RESOLUTION=1280x720,FRAME-RATE=30.000'
+    )
+    assert master[-3] == (
+        "#EXT-X-I-FRAME-STREAM-INF:BANDWIDTH=300000,AVERAGE-BANDWIDTH=150000,"
+        'CODECS="avc1.4D401F",RESOLUTION=1280x720,URI="720p/720p_iframes.m3u8"'
+    )
+
+
+def test_hls_single_file_variant_uses_byte_ranges(tmp_path, monkeypatch):
+    variant_dir = tmp_path / "480p"
+    variant_dir.mkdir()
+    (variant_dir / "480p.ts").write_bytes(b"\0" * 1_200_000)
+    (variant_dir / "480p.m3u8").write_text(
+        "#EXTM3U\n#EXT-X-VERSION:4\n#EXT-X-TARGETDURATION:6\n"
+        "#EXTINF:6.000000,\n#EXT-X-BYTERANGE:450000@0\n480p.ts\n"
+        "#EXTINF:6.000000,\n#EXT-X-BYTERANGE:750000\n480p.ts\n#EXT-X-ENDLIST\n"
+    )
+    probed = []
+
+    def probe(path, **kwargs):
+        probed.append(path)
+        return [
+            {"time": 0.0, "pos": 376, "keyframe": True},
+            {"time": 0.04, "pos": 30_000, "keyframe": False},
+            {"time": 6.0, "pos": 450_000, "keyframe": True},
+        ]
+
+    monkeypatch.setattr(HLSManifestUtils, "probe_video_packets", staticmethod(probe))
+
+    segments = HLSManifestUtils.parse_media_playlist(str(variant_dir / "480p.m3u8"))
+    variant = HLSManifestUtils.describe_variant(
+        str(variant_dir / "480p.m3u8"), [], 1_000_000
+    )
+
+    assert [(seg["offset"], seg["length"]) for seg in segments] == [
+        (0, 450_000),
+        (450_000, 750_000),
+    ]
+    assert variant["bandwidth"] == 1_000_000
+    assert variant["average_bandwidth"] == 800_000
+    assert probed == [str(variant_dir / "480p.ts")]
+    iframes = (variant_dir / "480p_iframes.m3u8").read_text()
+    assert "#EXT-X-BYTERANGE:29624@376\n480p.ts" in iframes
+    assert "#EXT-X-BYTERANGE:750000@450000\n480p.ts" in iframes
+    assert iframes.count("#EXT-X-MAP") == 1
+    assert iframe_maps(iframes) == {"480p.ts": "376@0"}
+
+
+# Storage lifecycle
+
+
+def test_apply_storage_lifecycle_archives_source_and_deletes_mp4(monkeypatch, settings):
+    settings.USING_MANAGED_STORAGE = True
+    settings.AWS_STORAGE_BUCKET_NAME = "media"
+    settings.STORAGE_ARCHIVE_BUCKET = "archive"
+    settings.STORAGE_LIFECYCLE_POLICY = {"source": "archive", "mp4": "delete"}
+    job = FileProcessingJobFactory(status=enums.JobStatus.COMPLETED.value)
+    job.file.hls_master_key = "processed/master.m3u8"
+    job.file.save(update_fields=["hls_master_key"])
+    FileProcessingJob.objects.filter(id=job.id).update(
+        date_last_modified=timezone.now() - timedelta(days=7)
+    )
+    base = f"processed/{job.owner.email}/{job.id}"
+    s3_client = FakeLifecycleS3Client(
+        {
+            "media": {
+                job.source_key: 9_000,
+                f"{base}/mp4/{job.file.id}/720p.mp4": 3_000,
+                f"{base}/mp4/{job.file.id}/480p.mp4": 1_000,
+                f"{base}/hls/{job.file.id}/720p/720p.ts": 2_500,
+                f"{base}/thumbnails/{job.file.id}/thumb_001.jpg": 50,
+            }
+        }
+    )
+
+    class FakeStorageClient(StorageClient):
+        def __init__(self):
+            self.s3_client = s3_client
+
+    monkeypatch.setattr(file_storage_tasks, "StorageClient", FakeStorageClient)
+    monkeypatch.setattr(lifecycle_utils, "StorageClient", FakeStorageClient)
+
+    assert file_storage_tasks.apply_storage_lifecycle() == 1
+    assert file_storage_tasks.apply_storage_lifecycle() == 0
+
+    assert s3_client.buckets["archive"] == {job.source_key: 9_000}
+    assert sorted(s3_client.buckets["media"]) == [
+        f"{base}/hls/{job.file.id}/720p/720p.ts",
+        f"{base}/thumbnails/{job.file.id}/thumb_001.jpg",
+    ]
+    job.refresh_from_db()
+    assert job.storage["lifecycle"] == {"source": "archive", "mp4": "delete"}
+    assert job.storage["bytes"]["mp4"] == 0
+    assert job.storage["total"] == 2_550
+    assert job.storage["archived"]["source"] == 9_000
+
+
+def test_apply_storage_lifecycle_continues_past_a_failing_job(monkeypatch, settings):
+    settings.USING_MANAGED_STORAGE = True
+    settings.AWS_STORAGE_BUCKET_NAME = "media"
+    settings.STORAGE_ARCHIVE_BUCKET = "archive"
+    settings.STORAGE_LIFECYCLE_POLICY = {"source": "archive"}
+    jobs = FileProcessingJobFactory.create_batch(
+        2, status=enums.JobStatus.COMPLETED.value
+    )
+    for age, job in zip((8, 7), jobs):
+        job.file.hls_master_key = "processed/master.m3u8"
+        job.file.save(update_fields=["hls_master_key"])
+        FileProcessingJob.objects.filter(id=job.id).update(
+            date_last_modified=timezone.now() - timedelta(days=age)
+        )
+    failing, healthy = jobs
+    s3_client = FakeLifecycleS3Client(
+        {"media": {failing.source_key: 9_000, healthy.source_key: 4_000}}
+    )
+    copy = s3_client.copy
+
+    def copy_or_fail(CopySource, Bucket, Key):
+        if Key == failing.source_key:
+            raise lifecycle_utils.ClientError(
+                {"Error": {"Code": "AccessDenied"}}, "CopyObject"
+            )
+        copy(CopySource, Bucket, Key)
+
+    s3_client.copy = copy_or_fail
+
+    class FakeStorageClient(StorageClient):
+        def __init__(self):
+            self.s3_client = s3_client
+
+    monkeypatch.setattr(file_storage_tasks, "StorageClient", FakeStorageClient)
+    monkeypatch.setattr(lifecycle_utils, "StorageClient", FakeStorageClient)
+
+    assert file_storage_tasks.apply_storage_lifecycle() == 1
+
+    assert s3_client.buckets["archive"] == {healthy.source_key: 4_000}
+    failing.refresh_from_db()
+    assert "lifecycle_applied_at" not in failing.storage
+    assert "AccessDenied" in failing.storage["lifecycle_error"]
+    # the failed job waits out the grace period again instead of blocking
+    assert file_storage_tasks.apply_storage_lifecycle() == 0
+
+
+def test_storage_report_per_creator(
+    creator_client, admin_client, creator_user, settings
+):
+    settings.STORAGE_GB_MONTH_COST = 0.02
+    settings.STORAGE_ARCHIVE_GB_MONTH_COST = 0.01
+    gigabyte = 1024**3
+    for hls_bytes in (gigabyte, 2 * gigabyte):
+        FileProcessingJobFactory(
+            owner=creator_user,
+            storage={
+                "bytes": {"source": 0, "hls": hls_bytes},
+                "total": hls_bytes,
+                "archived_total": 2 * gigabyte,
+            },
+        )
+    FileProcessingJobFactory(storage={"bytes": {"mp4": 10}, "total": 10})
+
+    response = creator_client.get(STORAGE_REPORT_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 1
+    row = response.data["results"][0]
+    assert row["owner_id"] == creator_user.id
+    assert row["jobs"] == 2
+    assert row["hls_bytes"] == 3 * gigabyte
+    assert row["mp4_bytes"] == 0
+    assert row["monthly_cost"] == 0.1
+
+    response = admin_client.get(STORAGE_REPORT_URL)
+
+    assert response.data["count"] == 2
+    assert response.data["results"][0]["owner_id"] == creator_user.id
@@ -1,10 +1,55 @@
 from django.urls import path
 
-from .views import CreateFileObject, DeleteFile, GetSignedUploadURL, RetrieveFile
+from .views import (
+    AbortMultipartUpload,
+    CompleteMultipartUpload,
+    CreateFileObject,
+    CreateFileObjects,
+    DeleteFile,
+    GetSignedUploadURL,
+    GetSignedUploadURLs,
+    InitiateMultipartUpload,
+    ListMultipartParts,
+    ListStorageReport,
+    PresignMultipartParts,
+    RetrieveFile,
+)
 
 urlpatterns = [
     path("get_signed_url/", GetSignedUploadURL.as_view(), name="get-signed-url"),
+    path("get_signed_urls/", GetSignedUploadURLs.as_view(), name="get-signed-urls"),
+    path(
+        "multipart/initiate/",
+        InitiateMultipartUpload.as_view(),
+        name="initiate-multipart-upload",
+    ),
+    path(
+        "multipart/<str:pk>/presign_parts/",
+        PresignMultipartParts.as_view(),
+        name="presign-multipart-parts",
+    ),
+    path(
+        "multipart/<str:pk>/parts/",
+        ListMultipartParts.as_view(),
+        name="list-multipart-parts",
+    ),
+    path(
+        "multipart/<str:pk>/complete/",
+        CompleteMultipartUpload.as_view(),
+        name="complete-multipart-upload",
+    ),
+    path(
+        "multipart/<str:pk>/abort/",
+        AbortMultipartUpload.as_view(),
+        name="abort-multipart-upload",
+    ),
     path("create_file_object/", CreateFileObject.as_view(), name="create-file-object"),
+    path(
+        "create_file_objects/",
+        CreateFileObjects.as_view(),
+        name="create-file-objects",
+    ),
+    path("storage/report/", ListStorageReport.as_view(), name="storage-report"),
     path("<str:pk>/", RetrieveFile.as_view(), name="retrieve-file"),
     path("<str:pk>/delete/", DeleteFile.as_view(), name="delete-file"),
 ]
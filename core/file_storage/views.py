@@ -1,24 +1,39 @@
 import mimetypes
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 from drf_spectacular.utils import extend_schema
 from loguru import logger
-from rest_framework import response, status, views
+from rest_framework import generics, response, status, views
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import JSONRenderer
 
-from core.utils import exceptions
+from core.utils import enums, exceptions
 from core.utils.helpers.decorators import (
     IdempotencyDecorator,
     RequestDataManipulationsDecorators,
 )
-from core.utils.helpers.file_storage import FileUploadUtils
+from core.utils.helpers.file_storage import (
+    FileUploadUtils,
+    MultipartUploadUtils,
+    PipelineEstimator,
+    StorageClient,
+    StorageLifecycleUtils,
+    UploadAdmissionUtils,
+)
 from core.utils.permissions import FileMediaNotReleased, IsAccountType
 
 from .models import FileModel, FileProcessingJob
-from .serializers import FileSerializer, SignedURLSerializer
+from .serializers import (
+    FileSerializer,
+    MultipartUploadSerializer,
+    SignedURLSerializer,
+    StorageReportSerializer,
+)
 from .tasks import start_pipeline
 
 
@@ -40,14 +55,33 @@ class GetSignedUploadURL(views.APIView):
 
         file_name = serializer.validated_data["file_name"]
         file_purpose = serializer.validated_data["purpose"]
-
-        file_metadata = FileUploadUtils.get_file_key(
-            request.user, file_name, file_purpose
+        file_size = serializer.validated_data["file_size"]
+        checksum = FileUploadUtils.build_checksum(
+            serializer.validated_data.get("checksum_algorithm"),
+            serializer.validated_data.get("checksum"),
         )
+
+        # admission check and reservation must not interleave for the same account
+        with UploadAdmissionUtils.account_lock(request.user.id):
+            UploadAdmissionUtils.admit_upload(request.user, file_size)
+            file_metadata = FileUploadUtils.get_file_key(
+                request.user,
+                file_name,
+                file_purpose,
+                file_size=file_size,
+                checksum=checksum,
+                packaging_mode=serializer.validated_data.get("packaging_mode"),
+            )
         signed_url = FileUploadUtils.generate_presigned_upload_url(
-            file_metadata["file_key"], file_name
+            file_metadata["file_key"], file_name, checksum=checksum, file_size=file_size
         )
-        response_data = {"file_id": file_metadata["file_id"], "signed_url": signed_url}
+        response_data = {
+            "file_id": file_metadata["file_id"],
+            "signed_url": signed_url,
+            "upload_headers": FileUploadUtils.get_upload_headers(
+                file_name, checksum, file_size
+            ),
+        }
         return response.Response(data=response_data, status=status.HTTP_200_OK)
 
 
@@ -70,6 +104,20 @@ class CreateFileObject(views.APIView):
 
         return mime_type
 
+    @staticmethod
+    def attach_metadata(request, ingested):
+        serializer = FileSerializer.FileCreate(
+            instance=ingested, data=request.data, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        FileSerializer.FileCreate.pop_checksum(serializer.validated_data)
+        file = serializer.save()
+        serializer = FileSerializer.ListRetrieve(instance=file)
+        return response.Response(
+            data={"message": "file already registered", "data": serializer.data},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
     @extend_schema(
         description="endpoint to create file object",
         request=FileSerializer.FileCreate,
@@ -77,6 +125,14 @@ class CreateFileObject(views.APIView):
     )
     @RequestDataManipulationsDecorators.update_request_data_with_owner_data("owner")
     def post(self, request):
+        # the upload may already have been registered from its storage event;
+        # the callback then only attaches the client's metadata
+        ingested = FileModel.objects.filter(
+            id=request.data.get("id"), owner=request.user
+        ).first()
+        if ingested:
+            return self.attach_metadata(request, ingested)
+
         serializer = FileSerializer.FileCreate(data=request.data)
         serializer.is_valid(raise_exception=True)
         file_id = serializer.validated_data["id"]
@@ -93,24 +149,261 @@ class CreateFileObject(views.APIView):
             raise exceptions.CustomException(
                 message="Permssion Denied", status_code=status.HTTP_403_FORBIDDEN
             )
-        file = serializer.save(
-            file_key=cached_metadata["file_key"],
-            mime_type=self.get_mime_type(file_name=file_name),
+
+        if cached_metadata.get("upload_id"):
+            raise exceptions.CustomException(
+                message="Multipart upload has not been completed",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # the object store computed the checksum and size on upload; no need
+        # to re-read, and neither is taken from the client
+        upload = FileUploadUtils.inspect_upload(
+            cached_metadata["file_key"],
+            FileSerializer.FileCreate.pop_checksum(serializer.validated_data)
+            or cached_metadata.get("checksum"),
         )
+        checksum = upload["checksum"]
+        try:
+            with transaction.atomic():
+                file = serializer.save(
+                    checksum=checksum,
+                    file_key=cached_metadata["file_key"],
+                    mime_type=self.get_mime_type(file_name=file_name),
+                    file_size=upload["file_size"] or cached_metadata.get("file_size"),
+                )
+        except IntegrityError:
+            # the storage event registered the upload after the lookup above
+            ingested = FileModel.objects.filter(id=file_id, owner=request.user).first()
+            if not ingested:
+                raise
+            return self.attach_metadata(request, ingested)
         cache.delete(f"pending_upload-{file_id}")
 
-        # create job and start file processing pipeline
+        # create job and start file processing pipeline, or defer it if the
+        # pipeline is at capacity. The job now carries the upload's quota usage.
         job, created = FileProcessingJob.objects.get_or_create(
-            owner=request.user, file=file, source_key=file.file_key
+            owner=request.user,
+            file=file,
+            source_key=file.file_key,
+            defaults={
+                "source_checksum": checksum,
+                "packaging_mode": FileUploadUtils.get_packaging_mode(cached_metadata),
+            },
         )
-        start_pipeline.delay(job.id)
+        UploadAdmissionUtils.release(request.user.id, file.id)
+        PipelineEstimator.estimate_job(job)
+        if UploadAdmissionUtils.pipeline_has_capacity(exclude_id=job.id):
+            start_pipeline.delay(job.id)
+            message = "file currently being processed"
+            logger.info(
+                f"processing pipeline started for file {file.id}. key {file.file_key}"
+            )
+        else:
+            job.status = enums.JobStatus.DEFERRED.value
+            job.save(update_fields=["status", "date_last_modified"])
+            message = "file queued for processing"
+            logger.info(f"processing deferred for file {file.id}. key {file.file_key}")
+
+        serializer = FileSerializer.ListRetrieve(instance=file)
+        return response.Response(
+            data={"message": message, "data": serializer.data},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+@extend_schema(tags=["Files"])
+class GetSignedUploadURLs(views.APIView):
+    """
+    Presign uploads for all assets of a release (poster, trailer, teasers,
+    main file) in one request.
+    """
+
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description="endpoint to get signed upload urls for several files at once",
+        request=SignedURLSerializer.BatchSignedURLRequestSerializer,
+        responses={200: SignedURLSerializer.BatchSignedURLResponseSerializer},
+    )
+    @IdempotencyDecorator.make_endpoint_idempotent(ttl=3600)
+    def post(self, request, *args, **kwargs):
+        serializer = SignedURLSerializer.BatchSignedURLRequestSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        files = serializer.validated_data["files"]
+
+        with UploadAdmissionUtils.account_lock(request.user.id):
+            UploadAdmissionUtils.admit_upload(
+                request.user,
+                sum(f["file_size"] for f in files),
+                file_count=len(files),
+            )
+            files_metadata = FileUploadUtils.get_file_keys(request.user, files)
+        signed_urls = FileUploadUtils.generate_presigned_upload_urls(files_metadata)
+        response_data = {
+            "files": [
+                {
+                    "file_id": metadata["file_id"],
+                    "signed_url": signed_url,
+                    "upload_headers": FileUploadUtils.get_upload_headers(
+                        metadata["file_name"],
+                        metadata["checksum"],
+                        metadata["file_size"],
+                    ),
+                }
+                for metadata, signed_url in zip(files_metadata, signed_urls)
+            ]
+        }
+        return response.Response(data=response_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Files"])
+class CreateFileObjects(views.APIView):
+    """
+    Batch form of CreateFileObject: registers several uploaded files and
+    starts (or defers) their processing jobs in one transaction.
+    """
+
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description="create File objects for several uploaded files",
+        request=FileSerializer.BatchCreate,
+        responses={202: FileSerializer.ListRetrieve(many=True)},
+    )
+    def post(self, request):
+        files_data = request.data.get("files")
+        if isinstance(files_data, list):
+            files_data = [
+                {**item, "owner": request.user.id}
+                for item in files_data
+                if isinstance(item, dict)
+            ]
+        # uploads already registered from their storage event only get the
+        # client's metadata attached, as in CreateFileObject
+        ingested = FileModel.objects.filter(
+            id__in=[
+                item.get("id")
+                for item in files_data or []
+                if isinstance(item, dict) and isinstance(item.get("id"), str)
+            ],
+            owner=request.user,
+        ).in_bulk()
+        serializer = FileSerializer.BatchCreate(
+            data={"files": files_data}, context={"ingested": ingested}
+        )
+        serializer.is_valid(raise_exception=True)
+        validated_files = serializer.validated_data["files"]
+        new_files = [item for item in validated_files if item["id"] not in ingested]
+
+        attached, attached_fields = [], set()
+        for item in validated_files:
+            file = ingested.get(item["id"])
+            if file is None:
+                continue
+            file.date_last_modified = timezone.now()
+            FileSerializer.FileCreate.pop_checksum(item)
+            for field, value in item.items():
+                if field not in ("id", "owner"):
+                    setattr(file, field, value)
+                    attached_fields.add(field)
+            attached.append(file)
+
+        cache_keys = [f"pending_upload-{item['id']}" for item in new_files]
+        pending_uploads = cache.get_many(cache_keys)
+        for item, cache_key in zip(new_files, cache_keys):
+            cached_metadata = pending_uploads.get(cache_key)
+            if not cached_metadata:
+                raise exceptions.CustomException(
+                    message=f"Expired or Invalid file id: {item['id']}",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            if cached_metadata["owner"] != request.user.id:
+                raise exceptions.CustomException(
+                    message="Permssion Denied", status_code=status.HTTP_403_FORBIDDEN
+                )
+            if cached_metadata.get("upload_id"):
+                raise exceptions.CustomException(
+                    message=f"Multipart upload has not been completed: {item['id']}",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+
+        files, jobs = [], []
+        storage_helper = StorageClient() if settings.USING_MANAGED_STORAGE else None
+        for item, cache_key in zip(new_files, cache_keys):
+            cached_metadata = pending_uploads[cache_key]
+            upload = FileUploadUtils.inspect_upload(
+                cached_metadata["file_key"],
+                FileSerializer.FileCreate.pop_checksum(item)
+                or cached_metadata.get("checksum"),
+                storage_helper=storage_helper,
+            )
+            checksum = upload["checksum"]
+            file = FileModel(
+                **{**item, "owner": request.user},
+                checksum=checksum,
+                file_key=cached_metadata["file_key"],
+                mime_type=CreateFileObject.get_mime_type(
+                    file_name=item.get("original_filename")
+                ),
+                file_size=upload["file_size"] or cached_metadata.get("file_size"),
+            )
+            job = FileProcessingJob(
+                owner=request.user,
+                file=file,
+                source_key=file.file_key,
+                source_checksum=checksum,
+                packaging_mode=FileUploadUtils.get_packaging_mode(cached_metadata),
+            )
+            job.estimates = PipelineEstimator.predict(
+                PipelineEstimator.get_job_features(job)
+            )
+            files.append(file)
+            jobs.append(job)
+
+        # start as many jobs as the pipeline has room for, defer the rest
+        headroom = max(
+            settings.PIPELINE_MAX_ACTIVE_JOBS
+            - UploadAdmissionUtils.count_started_jobs(),
+            0,
+        )
+        for job in jobs[headroom:]:
+            job.status = enums.JobStatus.DEFERRED.value
+
+        with transaction.atomic():
+            if attached_fields:
+                FileModel.objects.bulk_update(
+                    attached, [*attached_fields, "date_last_modified"]
+                )
+            FileModel.objects.bulk_create(files)
+            FileProcessingJob.objects.bulk_create(jobs)
+
+        if files:
+            cache.delete_many(cache_keys)
+            UploadAdmissionUtils.release(request.user.id, *[file.id for file in files])
+        for job in jobs[:headroom]:
+            start_pipeline.delay(job.id)
         logger.info(
-            f"processing pipeline started for file {file.id}. key {file.file_key}"
+            f"{len(files)} files registered for user {request.user.id}: "
+            f"{min(headroom, len(jobs))} started, {max(len(jobs) - headroom, 0)} deferred, "
+            f"{len(attached)} already registered"
         )
 
-        serializer = FileSerializer.ListRetrieve(instance=file)
+        registered = {file.id: file for file in [*attached, *files]}
+        serializer = FileSerializer.ListRetrieve(
+            instance=[registered[item["id"]] for item in validated_files], many=True
+        )
         return response.Response(
-            data={"message": "file currently being processed", "data": serializer.data},
+            data={
+                "message": "files registered for processing",
+                "data": serializer.data,
+            },
             status=status.HTTP_202_ACCEPTED,
         )
 
@@ -174,3 +467,149 @@ class DeleteFile(views.APIView):
         file.delete()
         logger.success(f"file {file.id} deleted successfully")
         return response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(tags=["Files"])
+class InitiateMultipartUpload(views.APIView):
+    """
+    Start a resumable multipart upload for a large file. The client uploads
+    parts in parallel, completes the upload and then calls CreateFileObject.
+    """
+
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description="initiate a multipart upload and get the upload id and part size",
+        request=MultipartUploadSerializer.InitiateRequestSerializer,
+        responses={201: MultipartUploadSerializer.InitiateResponseSerializer},
+    )
+    @IdempotencyDecorator.make_endpoint_idempotent(ttl=3600)
+    def post(self, request, *args, **kwargs):
+        serializer = MultipartUploadSerializer.InitiateRequestSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        file_size = serializer.validated_data["file_size"]
+
+        with UploadAdmissionUtils.account_lock(request.user.id):
+            UploadAdmissionUtils.admit_upload(request.user, file_size)
+            upload = MultipartUploadUtils.initiate(
+                request.user,
+                serializer.validated_data["file_name"],
+                serializer.validated_data["purpose"],
+                file_size,
+                checksum_algorithm=serializer.validated_data.get("checksum_algorithm"),
+                packaging_mode=serializer.validated_data.get("packaging_mode"),
+            )
+        return response.Response(data=upload, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(tags=["Files"])
+class PresignMultipartParts(views.APIView):
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description="presign upload URLs for a batch of parts of a multipart upload",
+        request=MultipartUploadSerializer.PresignPartsRequestSerializer,
+        responses={200: MultipartUploadSerializer.PresignPartsResponseSerializer},
+    )
+    def post(self, request, pk):
+        serializer = MultipartUploadSerializer.PresignPartsRequestSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        pending = MultipartUploadUtils.get_pending_upload(request.user, pk)
+        parts = MultipartUploadUtils.presign_parts(
+            pending,
+            serializer.validated_data["part_numbers"],
+            checksums=serializer.validated_data.get("checksums"),
+        )
+        return response.Response(data={"parts": parts}, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Files"])
+class ListMultipartParts(views.APIView):
+    http_method_names = ["get"]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description="list the parts uploaded so far, to resume a multipart upload",
+        request=None,
+        responses={200: MultipartUploadSerializer.ListPartsResponseSerializer},
+    )
+    def get(self, request, pk):
+        pending = MultipartUploadUtils.get_pending_upload(request.user, pk)
+        response_data = {
+            "upload_id": pending["upload_id"],
+            "part_size": pending["part_size"],
+            "part_count": pending["part_count"],
+            "parts": MultipartUploadUtils.list_parts(pending),
+        }
+        return response.Response(data=response_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Files"])
+class CompleteMultipartUpload(views.APIView):
+    http_method_names = ["post"]
+    parser_classes = [JSONParser]
+    renderer_classes = [JSONRenderer]
+
+    @extend_schema(
+        description=(
+            "assemble the uploaded parts. The file is then registered with the "
+            "create file object endpoint"
+        ),
+        request=MultipartUploadSerializer.CompleteRequestSerializer,
+        responses={200: None},
+    )
+    def post(self, request, pk):
+        serializer = MultipartUploadSerializer.CompleteRequestSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        pending = MultipartUploadUtils.get_pending_upload(request.user, pk)
+        MultipartUploadUtils.complete(
+            pk, pending, serializer.validated_data.get("parts")
+        )
+        return response.Response(
+            data={"message": "upload completed", "file_id": pk},
+            status=status.HTTP_200_OK,
+        )
+
+
+@extend_schema(tags=["Files"])
+class AbortMultipartUpload(views.APIView):
+    http_method_names = ["delete"]
+
+    @extend_schema(
+        description="abort a multipart upload and discard its uploaded parts",
+        request=None,
+        responses={204: None},
+    )
+    def delete(self, request, pk):
+        pending = MultipartUploadUtils.get_pending_upload(request.user, pk)
+        MultipartUploadUtils.abort(pk, pending)
+        return response.Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(tags=["Files"])
+class ListStorageReport(generics.ListAPIView):
+    """
+    Stored bytes per artifact type and estimated monthly cost per creator.
+    Creators see their own totals, staff see every creator.
+    """
+
+    http_method_names = ["get"]
+    permission_classes = [IsAuthenticated]
+    serializer_class = StorageReportSerializer
+
+    def get_queryset(self):
+        return StorageLifecycleUtils.get_creator_report(self.request.user)
+
+    @extend_schema(description="endpoint for storage usage and cost per creator")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
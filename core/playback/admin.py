@@ -1 +1,23 @@
-# Register your models here.
+from django.contrib import admin
+
+from unfold.admin import ModelAdmin
+
+from .models import PlaybackQoEHourly
+
+
+@admin.register(PlaybackQoEHourly)
+class PlaybackQoEHourlyAdmin(ModelAdmin):
+    list_display = [
+        "hour",
+        "target_type",
+        "target_id",
+        "rendition",
+        "region",
+        "sessions",
+        "rebuffer_ms",
+        "errors",
+    ]
+    list_filter = ["target_type", "rendition", "region"]
+    search_fields = ["target_id"]
+    readonly_fields = ["date_added", "date_last_modified"]
+    ordering = ["-hour"]
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import re
+
+from django.conf import settings
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from core.utils.helpers.file_storage import StorageClient
+from core.utils.helpers.playback import StreamCookieVerifier
+
+
+class StreamGateway:
+    """
+    ASGI app that authorises HLS/DASH requests with the stream cookie and
+    serves the segment. Files come from a local root, using the server's
+    zero-copy send when it offers one, or from the bucket through one pooled
+    S3 client. With an accel prefix the response is an X-Accel-Redirect and
+    nginx sends the file itself. Run with config.stream_asgi.
+    """
+
+    RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+    ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+    NOT_FOUND_CODES = ["NoSuchKey", "404", "NotFound"]
+
+    def __init__(self, local_root: str = None, accel_prefix: str = None):
+        if local_root is None:
+            local_root = settings.STREAM_GATEWAY_LOCAL_ROOT
+        self.local_root = os.path.realpath(local_root) if local_root else ""
+        self.accel_prefix = (
+            accel_prefix
+            if accel_prefix is not None
+            else settings.STREAM_GATEWAY_ACCEL_PREFIX
+        ).rstrip("/")
+        self._s3_client = None
+
+    @property
+    def s3_client(self):
+        """
+        One client for the gateway's lifetime, so connections to the bucket
+        are pooled and reused across requests.
+        """
+        if self._s3_client is None:
+            self._s3_client = StorageClient(
+                config=Config(
+                    max_pool_connections=settings.STREAM_GATEWAY_S3_MAX_CONNECTIONS,
+                    tcp_keepalive=True,
+                )
+            ).s3_client
+        return self._s3_client
+
+    @staticmethod
+    def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+        """
+        (start, end) for a single satisfiable byte range, None to send the
+        whole file. Raises ValueError when the range cannot be satisfied.
+        Multiple ranges are answered with the whole file, which RFC 9110 allows.
+        """
+        match = StreamGateway.RANGE_PATTERN.match((header or "").strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first == "":
+            length = int(last)
+            if length == 0 or size == 0:
+                raise ValueError("unsatisfiable range")
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or end < start:
+            raise ValueError("unsatisfiable range")
+        return start, end
+
+    @staticmethod
+    def get_header(scope: dict, name: bytes) -> str | None:
+        for key, value in scope.get("headers", []):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    @staticmethod
+    async def send_response(
+        send, status: int, headers: list = None, body: bytes = b""
+    ) -> None:
+        headers = list(headers or [])
+        if not any(name == b"content-length" for name, _ in headers):
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def lifespan(receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        if method == "OPTIONS":
+            return await self.send_response(send, 204)
+        if method not in ("GET", "HEAD"):
+            return await self.send_response(send, 405, [(b"allow", b"GET, HEAD")])
+
+        path = StreamCookieVerifier.normalize_path(scope["path"])
+        cookie = StreamCookieVerifier.get_cookie(self.get_header(scope, b"cookie"))
+        if not path or not cookie or not StreamCookieVerifier.authorize(cookie, path):
+            return await self.send_response(send, 403, body=b"Unauthorized")
+
+        key = path.lstrip("/")
+        range_header = self.get_header(scope, b"range")
+        if self.accel_prefix:
+            return await self.send_response(
+                send,
+                200,
+                [(b"x-accel-redirect", f"{self.accel_prefix}/{key}".encode())],
+            )
+        if self.local_root:
+            return await self.serve_local(scope, send, key, range_header)
+        if settings.USING_MANAGED_STORAGE:
+            return await self.serve_s3(scope, send, key, range_header)
+        return await self.send_response(send, 503, body=b"No storage configured")
+
+    def resolve_local_path(self, key: str) -> str | None:
+        full_path = os.path.realpath(os.path.join(self.local_root, key))
+        if os.path.commonpath([full_path, self.local_root]) != self.local_root:
+            return None
+        return full_path
+
+    async def serve_local(self, scope, send, key: str, range_header: str | None):
+        full_path = self.resolve_local_path(key)
+        try:
+            file = open(full_path, "rb") if full_path else None
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            file = None
+        if file is None:
+            return await self.send_response(send, 404, body=b"Not Found")
+
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            try:
+                byte_range = self.parse_range(range_header, size)
+            except ValueError:
+                return await self.send_response(
+                    send, 416, [(b"content-range", f"bytes */{size}".encode())]
+                )
+
+            start, end = byte_range or (0, size - 1)
+            length = end - start + 1 if size else 0
+            headers = [
+                (b"content-type", StorageClient.get_mime_type(key).encode()),
+                (b"content-length", str(length).encode()),
+                (b"accept-ranges", b"bytes"),
+            ]
+            if byte_range:
+                headers.append(
+                    (b"content-range", f"bytes {start}-{end}/{size}".encode())
+                )
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 206 if byte_range else 200,
+                    "headers": headers,
+                }
+            )
+            if scope["method"] == "HEAD" or not length:
+                return await send({"type": "http.response.body", "body": b""})
+
+            if self.ZERO_COPY_EXTENSION in (scope.get("extensions") or {}):
+                return await send(
+                    {
+                        "type": self.ZERO_COPY_EXTENSION,
+                        "file": file,
+                        "offset": start,
+                        "count": length,
+                    }
+                )
+
+            fd, offset, remaining = file.fileno(), start, length
+            chunk_size = settings.STREAM_GATEWAY_CHUNK_SIZE
+            while remaining:
+                chunk = await asyncio.to_thread(
+                    os.pread, fd, min(chunk_size, remaining), offset
+                )
+                if not chunk:
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": bool(remaining),
+                    }
+                )
+            if remaining:
+                await send({"type": "http.response.body", "body": b""})
+
+    async def serve_s3(self, scope, send, key: str, range_header: str | None):
+        params = {"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key}
+        if range_header and self.RANGE_PATTERN.match(range_header.strip()):
+            params["Range"] = range_header.strip()
+
+        head = scope["method"] == "HEAD"
+        try:
+            if head:
+                obj = await asyncio.to_thread(self.s3_client.head_object, **params)
+            else:
+                obj = await asyncio.to_thread(self.s3_client.get_object, **params)
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+            if code in self.NOT_FOUND_CODES:
+                return await self.send_response(send, 404, body=b"Not Found")
+            if code == "InvalidRange":
+                return await self.send_response(send, 416)
+            logger.error(f"stream gateway fetch failed for {key}: {error}")
+            return await self.send_response(send, 502, body=b"Bad Gateway")
+
+        headers = [
+            (b"content-type", (obj.get("ContentType") or "").encode()),
+            (b"content-length", str(obj.get("ContentLength") or 0).encode()),
+            (b"accept-ranges", b"bytes"),
+        ]
+        if obj.get("ContentRange"):
+            headers.append((b"content-range", obj["ContentRange"].encode()))
+        if obj.get("ETag"):
+            headers.append((b"etag", obj["ETag"].encode()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 206 if obj.get("ContentRange") else 200,
+                "headers": headers,
+            }
+        )
+        if head:
+            return await send({"type": "http.response.body", "body": b""})
+
+        body = obj["Body"]
+        chunks = body.iter_chunks(settings.STREAM_GATEWAY_CHUNK_SIZE)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, b"")
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                    if chunk
+                    else {"type": "http.response.body", "body": b""}
+                )
+                if not chunk:
+                    break
+        finally:
+            body.close()
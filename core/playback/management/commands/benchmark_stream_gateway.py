@@ -0,0 +1,167 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+import requests
+
+from core.playback.gateway import StreamGateway
+from core.utils.helpers.playback import AccessUtils, StreamCookieVerifier
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure stream gateway throughput. By default a synthetic segment is "
+        "served in-process, with and without the cookie verification cache; "
+        "with --url a running gateway is hit over HTTP with keep-alive."
+    )
+
+    SEGMENT_KEY = "processed/benchmark/1/hls/1/720p/720p_0000.ts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--segment-size",
+            type=int,
+            default=1024 * 1024,
+            help="bytes in the synthetic segment",
+        )
+        parser.add_argument(
+            "--range",
+            help="Range header to send, e.g. bytes=0-65535",
+        )
+        parser.add_argument(
+            "--url",
+            help="segment URL on a running gateway; its path is signed into the cookie",
+        )
+
+    def build_cookie(self, path: str) -> str:
+        if not settings.STREAM_COOKIE_SECRET:
+            raise CommandError("STREAM_COOKIE_SECRET is not configured")
+        return AccessUtils._sign_stream_cookie(
+            {
+                "sub": "benchmark",
+                "path": AccessUtils._build_stream_cookie_path(path),
+                "exp": int(time.time()) + 60 * 60,
+            }
+        )
+
+    def report(self, mode: str, latencies: list[float], elapsed: float, total: int):
+        latencies.sort()
+        count = len(latencies)
+        self.stdout.write(
+            f"{mode:>10} {count:>9} {count / elapsed:>10.1f} "
+            f"{total / elapsed / 1024 / 1024:>9.1f} "
+            f"{latencies[count // 2] * 1000:>8.2f} "
+            f"{latencies[int(0.95 * (count - 1))] * 1000:>8.2f}"
+        )
+
+    async def drive_gateway(self, gateway, headers, options, cached: bool):
+        latencies, total = [], 0
+        queue = asyncio.Queue()
+        for _ in range(options["requests"]):
+            queue.put_nowait(None)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def worker():
+            nonlocal total
+            while not queue.empty():
+                queue.get_nowait()
+                received = 0
+
+                async def send(message):
+                    nonlocal received
+                    received += len(message.get("body", b""))
+
+                if not cached:
+                    StreamCookieVerifier.clear()
+                started = time.perf_counter()
+                await gateway(
+                    {
+                        "type": "http",
+                        "method": "GET",
+                        "path": f"/{self.SEGMENT_KEY}",
+                        "headers": headers,
+                    },
+                    receive,
+                    send,
+                )
+                latencies.append(time.perf_counter() - started)
+                total += received
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+        return latencies, time.perf_counter() - started, total
+
+    def run_in_process(self, options):
+        cookie = self.build_cookie(f"/{self.SEGMENT_KEY}")
+        headers = [
+            (b"cookie", f"{settings.STREAM_COOKIE_NAME}={cookie}".encode()),
+        ]
+        if options["range"]:
+            headers.append((b"range", options["range"].encode()))
+
+        with tempfile.TemporaryDirectory() as root:
+            segment = os.path.join(root, self.SEGMENT_KEY)
+            os.makedirs(os.path.dirname(segment))
+            with open(segment, "wb") as file:
+                file.write(os.urandom(options["segment_size"]))
+
+            gateway = StreamGateway(local_root=root, accel_prefix="")
+            for mode, cached in (("cached", True), ("uncached", False)):
+                StreamCookieVerifier.clear()
+                latencies, elapsed, total = asyncio.run(
+                    self.drive_gateway(gateway, headers, options, cached)
+                )
+                self.report(mode, latencies, elapsed, total)
+
+    def run_over_http(self, options):
+        url = options["url"]
+        cookie = self.build_cookie(urlparse(url).path)
+        headers = {"Range": options["range"]} if options["range"] else {}
+        sessions = threading.local()
+
+        def fetch(_):
+            session = getattr(sessions, "session", None)
+            if session is None:
+                session = sessions.session = requests.Session()
+                session.cookies.set(settings.STREAM_COOKIE_NAME, cookie)
+            started = time.perf_counter()
+            response = session.get(url, headers=headers)
+            elapsed = time.perf_counter() - started
+            if response.status_code not in (200, 206):
+                raise CommandError(f"gateway answered {response.status_code}")
+            return elapsed, len(response.content)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(fetch, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        self.report(
+            "http",
+            [latency for latency, _ in results],
+            elapsed,
+            sum(size for _, size in results),
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("requests and concurrency must be positive")
+
+        self.stdout.write(
+            f"{'mode':>10} {'requests':>9} {'req/s':>10} {'MiB/s':>9} "
+            f"{'p50_ms':>8} {'p95_ms':>8}"
+        )
+        if options["url"]:
+            self.run_over_http(options)
+        else:
+            self.run_in_process(options)
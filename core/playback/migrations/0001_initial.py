@@ -0,0 +1,216 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:47
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PlaybackBeacon",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("film", "FILM"), ("short", "SHORT")],
+                        max_length=10,
+                        verbose_name="Target Type",
+                    ),
+                ),
+                ("target_id", models.BigIntegerField(verbose_name="Target Id")),
+                (
+                    "session_id",
+                    models.CharField(max_length=64, verbose_name="Player Session"),
+                ),
+                (
+                    "rendition",
+                    models.CharField(
+                        blank=True, max_length=16, verbose_name="Rendition"
+                    ),
+                ),
+                (
+                    "region",
+                    models.CharField(
+                        default="unknown", max_length=8, verbose_name="Region"
+                    ),
+                ),
+                (
+                    "startup_ms",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Time to first frame; only sent on a session's first beacon",
+                        null=True,
+                        verbose_name="Startup Time (ms)",
+                    ),
+                ),
+                (
+                    "played_ms",
+                    models.PositiveIntegerField(default=0, verbose_name="Played (ms)"),
+                ),
+                (
+                    "rebuffer_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Rebuffer Count"
+                    ),
+                ),
+                (
+                    "rebuffer_ms",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Rebuffering (ms)"
+                    ),
+                ),
+                (
+                    "bitrate_switches",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Bitrate Switches"
+                    ),
+                ),
+                (
+                    "bitrate_kbps",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Average Bitrate (kbps)"
+                    ),
+                ),
+                (
+                    "errors",
+                    models.PositiveIntegerField(default=0, verbose_name="Errors"),
+                ),
+            ],
+            options={
+                "verbose_name": "Playback Beacon",
+                "verbose_name_plural": "Playback Beacons",
+                "indexes": [
+                    django.contrib.postgres.indexes.BrinIndex(
+                        fields=["date_added"], name="playbackbeacon_added_brin"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PlaybackQoEHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_added", models.DateTimeField(auto_now_add=True)),
+                ("date_last_modified", models.DateTimeField(auto_now=True)),
+                ("hour", models.DateTimeField(verbose_name="Hour")),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("film", "FILM"), ("short", "SHORT")],
+                        max_length=10,
+                        verbose_name="Target Type",
+                    ),
+                ),
+                ("target_id", models.BigIntegerField(verbose_name="Target Id")),
+                (
+                    "rendition",
+                    models.CharField(
+                        blank=True, max_length=16, verbose_name="Rendition"
+                    ),
+                ),
+                (
+                    "region",
+                    models.CharField(
+                        default="unknown", max_length=8, verbose_name="Region"
+                    ),
+                ),
+                (
+                    "sessions",
+                    models.PositiveIntegerField(default=0, verbose_name="Sessions"),
+                ),
+                (
+                    "beacons",
+                    models.PositiveIntegerField(default=0, verbose_name="Beacons"),
+                ),
+                (
+                    "startup_samples",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Startup Samples"
+                    ),
+                ),
+                (
+                    "startup_ms_total",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Startup Time Total (ms)"
+                    ),
+                ),
+                (
+                    "startup_ms_max",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Slowest Startup (ms)"
+                    ),
+                ),
+                (
+                    "played_ms",
+                    models.BigIntegerField(default=0, verbose_name="Played (ms)"),
+                ),
+                (
+                    "rebuffer_count",
+                    models.BigIntegerField(default=0, verbose_name="Rebuffer Count"),
+                ),
+                (
+                    "rebuffer_ms",
+                    models.BigIntegerField(default=0, verbose_name="Rebuffering (ms)"),
+                ),
+                (
+                    "bitrate_switches",
+                    models.BigIntegerField(default=0, verbose_name="Bitrate Switches"),
+                ),
+                (
+                    "bitrate_kbps_ms",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Sum of bitrate (kbps) times played ms, for weighted averages",
+                        verbose_name="Bitrate x Played Time",
+                    ),
+                ),
+                ("errors", models.BigIntegerField(default=0, verbose_name="Errors")),
+            ],
+            options={
+                "verbose_name": "Playback QoE (Hourly)",
+                "verbose_name_plural": "Playback QoE (Hourly)",
+                "indexes": [
+                    models.Index(
+                        fields=["target_type", "target_id", "hour"],
+                        name="playbackqoe_target_hour",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "hour",
+                            "target_type",
+                            "target_id",
+                            "rendition",
+                            "region",
+                        ),
+                        name="unique_playback_qoe_hourly",
+                    )
+                ],
+            },
+        ),
+    ]
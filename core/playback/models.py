@@ -1 +1,93 @@
-# Create your models here.
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from core.utils import enums
+from core.utils.mixins import BaseModelMixin
+
+
+class PlaybackBeacon(BaseModelMixin):
+    """
+    Raw player QoE beacon, one per reporting interval of a playback session.
+    Rows are only ever appended, rolled up hourly and pruned after
+    QOE_RAW_RETENTION_DAYS, so date_added carries a BRIN index.
+    """
+
+    target_type = models.CharField(
+        _("Target Type"),
+        max_length=10,
+        choices=enums.ViewTargetType.choices(),
+    )
+    target_id = models.BigIntegerField(_("Target Id"))
+    session_id = models.CharField(_("Player Session"), max_length=64)
+    rendition = models.CharField(_("Rendition"), max_length=16, blank=True)
+    region = models.CharField(_("Region"), max_length=8, default="unknown")
+    startup_ms = models.PositiveIntegerField(
+        _("Startup Time (ms)"),
+        null=True,
+        blank=True,
+        help_text=_("Time to first frame; only sent on a session's first beacon"),
+    )
+    played_ms = models.PositiveIntegerField(_("Played (ms)"), default=0)
+    rebuffer_count = models.PositiveIntegerField(_("Rebuffer Count"), default=0)
+    rebuffer_ms = models.PositiveIntegerField(_("Rebuffering (ms)"), default=0)
+    bitrate_switches = models.PositiveIntegerField(_("Bitrate Switches"), default=0)
+    bitrate_kbps = models.PositiveIntegerField(
+        _("Average Bitrate (kbps)"), null=True, blank=True
+    )
+    errors = models.PositiveIntegerField(_("Errors"), default=0)
+
+    class Meta:
+        verbose_name = _("Playback Beacon")
+        verbose_name_plural = _("Playback Beacons")
+        indexes = [
+            BrinIndex(fields=["date_added"], name="playbackbeacon_added_brin"),
+        ]
+
+
+class PlaybackQoEHourly(BaseModelMixin):
+    """
+    Hourly QoE rollup per film or short, rendition and region. Sums are kept
+    rather than averages so rows can be combined over any time range.
+    """
+
+    hour = models.DateTimeField(_("Hour"))
+    target_type = models.CharField(
+        _("Target Type"),
+        max_length=10,
+        choices=enums.ViewTargetType.choices(),
+    )
+    target_id = models.BigIntegerField(_("Target Id"))
+    rendition = models.CharField(_("Rendition"), max_length=16, blank=True)
+    region = models.CharField(_("Region"), max_length=8, default="unknown")
+    sessions = models.PositiveIntegerField(_("Sessions"), default=0)
+    beacons = models.PositiveIntegerField(_("Beacons"), default=0)
+    startup_samples = models.PositiveIntegerField(_("Startup Samples"), default=0)
+    startup_ms_total = models.BigIntegerField(_("Startup Time Total (ms)"), default=0)
+    startup_ms_max = models.PositiveIntegerField(_("Slowest Startup (ms)"), default=0)
+    played_ms = models.BigIntegerField(_("Played (ms)"), default=0)
+    rebuffer_count = models.BigIntegerField(_("Rebuffer Count"), default=0)
+    rebuffer_ms = models.BigIntegerField(_("Rebuffering (ms)"), default=0)
+    bitrate_switches = models.BigIntegerField(_("Bitrate Switches"), default=0)
+    bitrate_kbps_ms = models.BigIntegerField(
+        _("Bitrate x Played Time"),
+        default=0,
+        help_text=_("Sum of bitrate (kbps) times played ms, for weighted averages"),
+    )
+    errors = models.BigIntegerField(_("Errors"), default=0)
+
+    class Meta:
+        verbose_name = _("Playback QoE (Hourly)")
+        verbose_name_plural = _("Playback QoE (Hourly)")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "target_type", "target_id", "rendition", "region"],
+                name="unique_playback_qoe_hourly",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["target_type", "target_id", "hour"],
+                name="playbackqoe_target_hour",
+            ),
+        ]
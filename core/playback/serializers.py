@@ -1,5 +1,12 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
 
+from core.utils import enums
+
+from .models import PlaybackQoEHourly
+
 
 class FilmIDSerializer(serializers.Serializer):
     film_id = serializers.IntegerField(required=True, write_only=True)
@@ -9,6 +16,94 @@ class ShortIDSerializer(serializers.Serializer):
     short_id = serializers.IntegerField(required=True, write_only=True)
 
 
+class ShortIDsSerializer(serializers.Serializer):
+    short_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.SHORT_PLAYBACK_BATCH_MAX,
+        write_only=True,
+    )
+
+
+class ShortPlaybackURLSerializer(serializers.Serializer):
+    short_id = serializers.IntegerField(read_only=True)
+    url = serializers.CharField(read_only=True)
+
+
+class QoEEventSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=enums.ViewTargetType.choices())
+    id = serializers.IntegerField(min_value=1)
+    rendition = serializers.CharField(required=False, allow_blank=True, max_length=16)
+    startup_ms = serializers.IntegerField(required=False, min_value=0)
+    played_ms = serializers.IntegerField(required=False, min_value=0, default=0)
+    rebuffer_count = serializers.IntegerField(required=False, min_value=0, default=0)
+    rebuffer_ms = serializers.IntegerField(required=False, min_value=0, default=0)
+    bitrate_switches = serializers.IntegerField(required=False, min_value=0, default=0)
+    bitrate_kbps = serializers.IntegerField(required=False, min_value=0)
+    errors = serializers.IntegerField(required=False, min_value=0, default=0)
+
+
+class QoEBeaconSerializer(serializers.Serializer):
+    session_id = serializers.CharField(
+        max_length=64, help_text=_("Player session id, stable for one playback")
+    )
+    events = QoEEventSerializer(
+        many=True, allow_empty=False, max_length=settings.QOE_BEACON_MAX_EVENTS
+    )
+
+
+class QoERollupQuerySerializer(serializers.Serializer):
+    target_type = serializers.ChoiceField(
+        choices=enums.ViewTargetType.choices(), required=False
+    )
+    target_id = serializers.IntegerField(required=False, min_value=1)
+    rendition = serializers.CharField(required=False, max_length=16)
+    region = serializers.CharField(required=False, max_length=8)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+
+class QoERollupSerializer(serializers.ModelSerializer):
+    startup_ms_avg = serializers.SerializerMethodField()
+    rebuffer_ratio = serializers.SerializerMethodField()
+    bitrate_kbps_avg = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlaybackQoEHourly
+        fields = [
+            "hour",
+            "target_type",
+            "target_id",
+            "rendition",
+            "region",
+            "sessions",
+            "beacons",
+            "startup_ms_avg",
+            "startup_ms_max",
+            "played_ms",
+            "rebuffer_count",
+            "rebuffer_ms",
+            "rebuffer_ratio",
+            "bitrate_switches",
+            "bitrate_kbps_avg",
+            "errors",
+        ]
+
+    def get_startup_ms_avg(self, obj) -> float | None:
+        if not obj.startup_samples:
+            return None
+        return round(obj.startup_ms_total / obj.startup_samples, 1)
+
+    def get_rebuffer_ratio(self, obj) -> float:
+        watched = obj.played_ms + obj.rebuffer_ms
+        return round(obj.rebuffer_ms / watched, 4) if watched else 0.0
+
+    def get_bitrate_kbps_avg(self, obj) -> float | None:
+        if not obj.played_ms or not obj.bitrate_kbps_ms:
+            return None
+        return round(obj.bitrate_kbps_ms / obj.played_ms, 1)
+
+
 class PlaybackSerializer:
     class PlaybackURLRetrieveSerializer(serializers.Serializer):
         url = serializers.CharField(read_only=True)
@@ -16,3 +111,16 @@ class PlaybackSerializer:
 
     class PlaybackCookieRefreshSerializer(serializers.Serializer):
         expires_at = serializers.DateTimeField(read_only=True)
+
+    class ThrottleStatsSerializer(serializers.Serializer):
+        scopes = serializers.DictField(
+            read_only=True,
+            child=serializers.DictField(child=serializers.IntegerField()),
+        )
+
+    class ShortPlaybackBatchSerializer(serializers.Serializer):
+        shorts = ShortPlaybackURLSerializer(many=True, read_only=True)
+        unavailable = serializers.ListField(
+            read_only=True, child=serializers.IntegerField()
+        )
+        expires_at = serializers.DateTimeField(read_only=True)
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+
+@shared_task
+def rollup_playback_qoe():
+    """
+    Fold recent QoE beacons into the hourly rollups and prune old beacons.
+    """
+    from core.utils.helpers.analytics import QoETelemetryUtils
+
+    return {
+        "rollups": QoETelemetryUtils.rollup(),
+        "pruned": QoETelemetryUtils.prune(),
+    }
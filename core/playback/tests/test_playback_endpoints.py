@@ -1,12 +1,29 @@
+import asyncio
+import gzip
+import json
+import time
+from datetime import timedelta
+
 from django.urls import reverse
+from django.utils import timezone
 
 import pytest
 from rest_framework import status
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.test import APIClient
 
+from core.feed.models import Purchase
+from core.feed.tasks import expire_due_rentals
+from core.feed.tests.factories.feed_factories import ShortFactory
 from core.feed.tests.factories.purchase_factories import PurchaseFactory
+from core.file_storage.tests.factories.file_storage_factories import FileModelFactory
+from core.playback import throttles as playback_throttles
 from core.playback import views as playback_views
+from core.playback.gateway import StreamGateway
+from core.playback.models import PlaybackBeacon
+from core.playback.tasks import rollup_playback_qoe
+from core.utils import enums
+from core.utils.helpers.playback import AccessUtils, StreamCookieVerifier
 
 pytestmark = pytest.mark.django_db
 
@@ -14,6 +31,10 @@ RETRIEVE_FILM_PLAYBACK_URL = reverse("retrieve-film-playback-url")
 REFRESH_FILM_PLAYBACK_COOKIE_URL = reverse("refresh-film-playback-cookie")
 RETRIEVE_SHORT_PLAYBACK_URL = reverse("retrieve-short-playback-url")
 REFRESH_SHORT_PLAYBACK_COOKIE_URL = reverse("refresh-short-playback-cookie")
+RETRIEVE_SHORT_PLAYBACK_URLS = reverse("retrieve-short-playback-urls")
+THROTTLE_STATS_URL = reverse("retrieve-throttle-stats")
+RECORD_PLAYBACK_QOE_URL = reverse("record-playback-qoe")
+LIST_PLAYBACK_QOE_URL = reverse("list-playback-qoe")
 
 
 def build_film_payload(film_id):
@@ -24,6 +45,47 @@ def build_short_payload(short_id):
     return {"short_id": short_id}
 
 
+def call_gateway(gateway, path, cookie=None, headers=None):
+    """
+    Run one GET through the ASGI gateway; returns (status, headers, body).
+    """
+    scope_headers = [(b"cookie", f"stream_auth={cookie}".encode())] if cookie else []
+    scope_headers += [
+        (name.encode(), value.encode()) for name, value in (headers or {}).items()
+    ]
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(
+        gateway(
+            {"type": "http", "method": "GET", "path": path, "headers": scope_headers},
+            receive,
+            send,
+        )
+    )
+    start = messages[0]
+    return (
+        start["status"],
+        {name.decode(): value.decode() for name, value in start["headers"]},
+        b"".join(message.get("body", b"") for message in messages[1:]),
+    )
+
+
+@pytest.fixture
+def stream_gateway(tmp_path, stream_playback_settings):
+    StreamCookieVerifier.clear()
+    for key in ["media/films/720p/720p_0000.ts", "media/shorts/720p/720p_0000.ts"]:
+        segment = tmp_path / key
+        segment.parent.mkdir(parents=True, exist_ok=True)
+        segment.write_bytes(bytes(range(256)) * 4)
+    return StreamGateway(local_root=str(tmp_path), accel_prefix="")
+
+
 # Retrieve film playback URL
 
 
@@ -108,6 +170,77 @@ def test_refresh_film_playback_cookie_success(
     assert response.cookies.get(stream_playback_settings.STREAM_COOKIE_NAME) is not None
 
 
+def test_refresh_film_playback_cookie_signs_with_newest_key(
+    buyer_client,
+    active_purchase,
+    stream_playback_settings,
+):
+    now = int(time.time())
+    stream_playback_settings.STREAM_COOKIE_KEYS = [
+        {"kid": "2026-09", "secret": "old-secret", "not_after": now + 60},
+        {"kid": "2026-10", "secret": "new-secret", "not_before": now + 3600},
+    ]
+
+    response = buyer_client.post(
+        REFRESH_FILM_PLAYBACK_COOKIE_URL,
+        build_film_payload(active_purchase.film.id),
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    cookie = response.cookies[stream_playback_settings.STREAM_COOKIE_NAME]
+    assert StreamCookieVerifier.decode(cookie.value)["kid"] == "2026-09"
+    assert 0 < int(cookie["max-age"]) <= 60
+
+
+def test_refresh_film_playback_cookie_uses_cached_entitlement(
+    buyer_client,
+    active_purchase,
+    stream_playback_settings,
+    django_assert_max_num_queries,
+):
+    payload = build_film_payload(active_purchase.film.id)
+    response = buyer_client.post(
+        REFRESH_FILM_PLAYBACK_COOKIE_URL, payload, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # a state change that bypasses the invalidation hooks is not seen
+    Purchase.objects.filter(id=active_purchase.id).update(
+        status=enums.PurchaseStatusType.REVOKED.value
+    )
+    with django_assert_max_num_queries(1):
+        response = buyer_client.post(
+            REFRESH_FILM_PLAYBACK_COOKIE_URL, payload, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_refresh_film_playback_cookie_forbidden_after_rental_expires(
+    buyer_client,
+    active_purchase,
+    stream_playback_settings,
+):
+    active_purchase.expiry_time = timezone.now() + timedelta(hours=1)
+    active_purchase.save(update_fields=["expiry_time"])
+    payload = build_film_payload(active_purchase.film.id)
+    response = buyer_client.post(
+        REFRESH_FILM_PLAYBACK_COOKIE_URL, payload, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    Purchase.objects.filter(id=active_purchase.id).update(
+        expiry_time=timezone.now() - timedelta(minutes=1)
+    )
+    assert expire_due_rentals() == 1
+    Purchase.objects.filter(id=active_purchase.id).update(expiry_time=None)
+
+    response = buyer_client.post(
+        REFRESH_FILM_PLAYBACK_COOKIE_URL, payload, format="json"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 def test_refresh_film_playback_cookie_unauthorized(anonymous_client):
     response = anonymous_client.post(
         REFRESH_FILM_PLAYBACK_COOKIE_URL,
@@ -228,6 +361,94 @@ def test_retrieve_short_playback_url_not_found(anonymous_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+# Retrieve short playback URLs
+
+
+def test_retrieve_short_playback_urls_success(
+    anonymous_client,
+    creator_user,
+    film,
+    released_short,
+    released_short_with_playback,
+    stream_playback_settings,
+    django_assert_max_num_queries,
+):
+    other_short = ShortFactory(
+        owner=creator_user,
+        film=film,
+        file=FileModelFactory(
+            owner=creator_user, hls_master_key="media/shorts/other/master.m3u8"
+        ),
+        is_released=True,
+    )
+    short_ids = [released_short_with_playback.id, other_short.id, released_short.id]
+
+    with django_assert_max_num_queries(1):
+        response = anonymous_client.post(
+            RETRIEVE_SHORT_PLAYBACK_URLS, {"short_ids": short_ids}, format="json"
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [s["short_id"] for s in response.data["shorts"]] == short_ids[:2]
+    assert response.data["unavailable"] == [released_short.id]
+    cookie = response.cookies.get(stream_playback_settings.STREAM_COOKIE_NAME)
+    assert cookie["path"] == "/media/shorts/"
+
+
+def test_retrieve_short_playback_urls_cookie_cannot_fetch_film_segments(
+    anonymous_client,
+    creator_user,
+    film,
+    released_short_with_playback,
+    released_film_with_playback,
+    stream_gateway,
+    stream_playback_settings,
+):
+    clip = ShortFactory(
+        owner=creator_user,
+        film=film,
+        file=FileModelFactory(
+            owner=creator_user, hls_master_key="media/clips/master.m3u8"
+        ),
+        is_released=True,
+    )
+
+    response = anonymous_client.post(
+        RETRIEVE_SHORT_PLAYBACK_URLS,
+        {"short_ids": [released_short_with_playback.id, clip.id]},
+        format="json",
+    )
+
+    cookie = response.cookies.get(stream_playback_settings.STREAM_COOKIE_NAME)
+    # the cookie's scope spans the film's directory too
+    assert cookie["path"] == "/media/"
+    film_segment = "/media/films/720p/720p_0000.ts"
+    short_segment = "/media/shorts/720p/720p_0000.ts"
+    assert StreamCookieVerifier.authorize(cookie.value, film_segment) is None
+    code, _, _ = call_gateway(stream_gateway, film_segment, cookie.value)
+    assert code == status.HTTP_403_FORBIDDEN
+    code, _, _ = call_gateway(stream_gateway, short_segment, cookie.value)
+    assert code == status.HTTP_200_OK
+
+
+def test_retrieve_short_playback_urls_not_found(anonymous_client):
+    response = anonymous_client.post(
+        RETRIEVE_SHORT_PLAYBACK_URLS, {"short_ids": [999999]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_retrieve_short_playback_urls_too_many(anonymous_client, settings):
+    response = anonymous_client.post(
+        RETRIEVE_SHORT_PLAYBACK_URLS,
+        {"short_ids": list(range(1, settings.SHORT_PLAYBACK_BATCH_MAX + 2))},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 # Refresh short playback cookie
 
 
@@ -300,3 +521,277 @@ def test_refresh_short_playback_cookie_not_found(anonymous_client):
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Stream gateway
+
+
+def test_stream_gateway_serves_segment_and_ranges(stream_gateway, active_purchase):
+    cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+    path = "/media/films/720p/720p_0000.ts"
+
+    code, headers, body = call_gateway(stream_gateway, path, cookie)
+    assert code == status.HTTP_200_OK
+    assert headers["content-type"] == "video/mp2t"
+    assert len(body) == 1024
+
+    code, headers, body = call_gateway(
+        stream_gateway, path, cookie, {"range": "bytes=256-511"}
+    )
+    assert code == status.HTTP_206_PARTIAL_CONTENT
+    assert headers["content-range"] == "bytes 256-511/1024"
+    assert body == bytes(range(256))
+
+    code, headers, _ = call_gateway(
+        stream_gateway, path, cookie, {"range": "bytes=2048-"}
+    )
+    assert code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert headers["content-range"] == "bytes */1024"
+
+
+def test_stream_gateway_rejects_invalid_cookies(stream_gateway, active_purchase):
+    cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+    payload_b64, signature_b64 = cookie.split(".")
+    expired = AccessUtils._sign_stream_cookie(
+        {"path": "/media/films/", "exp": int(time.time()) - 1}
+    )
+    wrong_audience = AccessUtils._sign_stream_cookie(
+        {"path": "/media/films/", "aud": "admin", "exp": int(time.time()) + 60}
+    )
+
+    for path, value in [
+        ("/media/films/720p/720p_0000.ts", None),
+        ("/media/films/720p/720p_0000.ts", f"{payload_b64}.{signature_b64[::-1]}"),
+        ("/media/films/720p/720p_0000.ts", expired),
+        ("/media/films/720p/720p_0000.ts", wrong_audience),
+        ("/media/shorts/720p/720p_0000.ts", cookie),
+        ("/media/films/../shorts/720p/720p_0000.ts", cookie),
+    ]:
+        code, _, _ = call_gateway(stream_gateway, path, value)
+        assert code == status.HTTP_403_FORBIDDEN, (path, value)
+
+
+def test_stream_gateway_accepts_cookies_across_key_rotation(
+    stream_gateway, stream_playback_settings, active_purchase
+):
+    now = int(time.time())
+    old_key = {"kid": "2026-09", "secret": "old-secret"}
+    stream_playback_settings.STREAM_COOKIE_KEYS = [old_key]
+    old_cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+
+    stream_playback_settings.STREAM_COOKIE_KEYS = [
+        old_key,
+        {"kid": "2026-10", "secret": "new-secret", "not_before": now - 1},
+    ]
+    new_cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+    path = "/media/films/720p/720p_0000.ts"
+
+    assert StreamCookieVerifier.decode(new_cookie)["kid"] == "2026-10"
+    assert call_gateway(stream_gateway, path, old_cookie)[0] == status.HTTP_200_OK
+    assert call_gateway(stream_gateway, path, new_cookie)[0] == status.HTTP_200_OK
+
+    StreamCookieVerifier.clear()
+    stream_playback_settings.STREAM_COOKIE_KEYS[0]["not_after"] = now - 1
+    assert (
+        call_gateway(stream_gateway, path, old_cookie)[0] == status.HTTP_403_FORBIDDEN
+    )
+    assert call_gateway(stream_gateway, path, new_cookie)[0] == status.HTTP_200_OK
+
+
+def test_stream_gateway_limits_batch_cookie_to_listed_shorts(stream_gateway):
+    cookie = AccessUtils._sign_stream_cookie(
+        {
+            "path": "/media/",
+            "paths": ["/media/shorts/"],
+            "aud": "shorts",
+            "exp": int(time.time()) + 60,
+        }
+    )
+
+    code, _, _ = call_gateway(stream_gateway, "/media/shorts/720p/720p_0000.ts", cookie)
+    assert code == status.HTTP_200_OK
+    code, _, _ = call_gateway(stream_gateway, "/media/films/720p/720p_0000.ts", cookie)
+    assert code == status.HTTP_403_FORBIDDEN
+
+
+def test_stream_gateway_caches_cookie_verification(
+    monkeypatch, stream_gateway, active_purchase
+):
+    cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+    decoded = []
+    decode = StreamCookieVerifier.decode
+    monkeypatch.setattr(
+        StreamCookieVerifier,
+        "decode",
+        staticmethod(lambda value: decoded.append(value) or decode(value)),
+    )
+
+    for _ in range(3):
+        code, _, _ = call_gateway(
+            stream_gateway, "/media/films/720p/720p_0000.ts", cookie
+        )
+        assert code == status.HTTP_200_OK
+    assert decoded == [cookie]
+
+
+def test_stream_gateway_hands_off_to_nginx_with_accel_prefix(
+    stream_gateway, active_purchase
+):
+    cookie, _, _ = AccessUtils.generate_stream_cookie(active_purchase, None)
+    gateway = StreamGateway(local_root="", accel_prefix="/protected/")
+
+    code, headers, body = call_gateway(
+        gateway, "/media/films/720p/720p_0000.ts", cookie
+    )
+
+    assert code == status.HTTP_200_OK
+    assert headers["x-accel-redirect"] == "/protected/media/films/720p/720p_0000.ts"
+    assert body == b""
+
+
+# Playback QoE
+
+
+def build_qoe_payload(film_id, session_id="session-1", **event):
+    return {
+        "session_id": session_id,
+        "events": [{"type": "film", "id": film_id, "rendition": "720p", **event}],
+    }
+
+
+def test_record_playback_qoe_accepts_gzip_and_rolls_up(
+    anonymous_client, creator_client, other_creator_client, released_film
+):
+    beacons = [
+        build_qoe_payload(
+            released_film.id,
+            "session-1",
+            startup_ms=800,
+            played_ms=9000,
+            rebuffer_ms=1000,
+            bitrate_kbps=3000,
+        ),
+        build_qoe_payload(
+            released_film.id, "session-2", startup_ms=1200, played_ms=6000
+        ),
+    ]
+    for beacon in beacons:
+        response = anonymous_client.post(
+            RECORD_PLAYBACK_QOE_URL,
+            gzip.compress(json.dumps(beacon).encode()),
+            content_type="application/json",
+            HTTP_CONTENT_ENCODING="gzip",
+            HTTP_CF_IPCOUNTRY="ng",
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert PlaybackBeacon.objects.filter(region="NG").count() == 2
+    assert rollup_playback_qoe()["rollups"] == 1
+
+    response = creator_client.get(LIST_PLAYBACK_QOE_URL, {"target_type": "film"})
+    assert response.status_code == status.HTTP_200_OK
+    [rollup] = response.data["results"]
+    assert rollup["target_id"] == released_film.id
+    assert rollup["region"] == "NG"
+    assert rollup["sessions"] == 2
+    assert rollup["startup_ms_avg"] == 1000.0
+    assert rollup["rebuffer_ratio"] == 0.0625
+    assert rollup["bitrate_kbps_avg"] == 1800.0
+
+    response = other_creator_client.get(LIST_PLAYBACK_QOE_URL)
+    assert response.data["results"] == []
+
+
+def test_record_playback_qoe_rejects_bad_bodies(anonymous_client, settings):
+    settings.QOE_BEACON_MAX_BYTES = 1024
+    oversized = build_qoe_payload(1, session_id="x" * 64)
+    oversized["events"] *= 50
+
+    response = anonymous_client.post(
+        RECORD_PLAYBACK_QOE_URL,
+        gzip.compress(json.dumps(oversized).encode()),
+        content_type="application/json",
+        HTTP_CONTENT_ENCODING="gzip",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = anonymous_client.post(
+        RECORD_PLAYBACK_QOE_URL,
+        b"{}",
+        content_type="application/json",
+        HTTP_CONTENT_ENCODING="br",
+    )
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    assert not PlaybackBeacon.objects.exists()
+
+
+def test_record_playback_qoe_throttles_signed_in_clients(
+    monkeypatch, authenticated_client, released_film
+):
+    monkeypatch.setattr(
+        playback_throttles.RecordPlaybackQoEThrottle,
+        "THROTTLE_RATES",
+        {"playback_qoe": "2/minute"},
+    )
+
+    statuses = [
+        authenticated_client.post(
+            RECORD_PLAYBACK_QOE_URL,
+            build_qoe_payload(released_film.id),
+            format="json",
+        ).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [
+        status.HTTP_202_ACCEPTED,
+        status.HTTP_202_ACCEPTED,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+    assert PlaybackBeacon.objects.count() == 2
+
+
+def test_list_playback_qoe_unauthorized(anonymous_client):
+    response = anonymous_client.get(LIST_PLAYBACK_QOE_URL)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# Throttling
+
+
+def test_refresh_short_playback_cookie_throttled_by_token_bucket(
+    monkeypatch,
+    anonymous_client,
+    admin_client,
+    released_short_with_playback,
+    stream_playback_settings,
+):
+    monkeypatch.setattr(
+        playback_throttles.RefreshShortPlaybackThrottle,
+        "THROTTLE_RATES",
+        {"short_playback_refresh": "2/minute"},
+    )
+    payload = build_short_payload(released_short_with_playback.id)
+
+    statuses = [
+        anonymous_client.post(
+            REFRESH_SHORT_PLAYBACK_COOKIE_URL, payload, format="json"
+        ).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [
+        status.HTTP_200_OK,
+        status.HTTP_200_OK,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+    response = admin_client.get(THROTTLE_STATS_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["scopes"]["short_playback_refresh"] == {"hit": 2, "deny": 1}
+
+
+def test_throttle_stats_forbidden(authenticated_client):
+    response = authenticated_client.get(THROTTLE_STATS_URL)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
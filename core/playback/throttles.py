@@ -1,17 +1,25 @@
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from core.utils.throttles import AnonTokenBucketThrottle, UserTokenBucketThrottle
 
 
-class RetrievePlaybackThrottle(UserRateThrottle):
+class RetrievePlaybackThrottle(UserTokenBucketThrottle):
     scope = "playback_retrieve"
 
 
-class RefreshPlaybackThrottle(UserRateThrottle):
+class RefreshPlaybackThrottle(UserTokenBucketThrottle):
     scope = "playback_refresh"
 
 
-class RetrieveShortPlaybackThrottle(AnonRateThrottle):
+class RetrieveShortPlaybackThrottle(AnonTokenBucketThrottle):
     scope = "short_playback_retrieve"
 
 
-class RefreshShortPlaybackThrottle(AnonRateThrottle):
+class RefreshShortPlaybackThrottle(AnonTokenBucketThrottle):
     scope = "short_playback_refresh"
+
+
+class RetrieveShortPlaybackBatchThrottle(AnonTokenBucketThrottle):
+    scope = "short_playback_batch"
+
+
+class RecordPlaybackQoEThrottle(UserTokenBucketThrottle):
+    scope = "playback_qoe"
@@ -1,13 +1,24 @@
 from django.urls import path
 
 from .views import (
+    ListPlaybackQoE,
+    RecordPlaybackQoE,
     RefreshFilmPlaybackCookie,
     RefreshShortPlaybackCookie,
     RetrieveFilmPlaybackURL,
     RetrieveShortPlaybackURL,
+    RetrieveShortPlaybackURLs,
+    RetrieveThrottleStats,
 )
 
 urlpatterns = [
+    path("qoe/", RecordPlaybackQoE.as_view(), name="record-playback-qoe"),
+    path("qoe/rollups/", ListPlaybackQoE.as_view(), name="list-playback-qoe"),
+    path(
+        "throttles/stats/",
+        RetrieveThrottleStats.as_view(),
+        name="retrieve-throttle-stats",
+    ),
     path(
         "films/get_url/",
         RetrieveFilmPlaybackURL.as_view(),
@@ -23,6 +34,11 @@ urlpatterns = [
         RetrieveShortPlaybackURL.as_view(),
         name="retrieve-short-playback-url",
     ),
+    path(
+        "shorts/get_urls/",
+        RetrieveShortPlaybackURLs.as_view(),
+        name="retrieve-short-playback-urls",
+    ),
     path(
         "shorts/token/refresh/",
         RefreshShortPlaybackCookie.as_view(),
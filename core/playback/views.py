@@ -1,18 +1,31 @@
 from django.conf import settings
 
 from drf_spectacular.utils import extend_schema
-from rest_framework import response, status, views
+from rest_framework import generics, response, status, views
 from rest_framework.parsers import JSONParser
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
+from core.utils.helpers.analytics import QoETelemetryUtils
 from core.utils.helpers.decorators import IdempotencyDecorator
 from core.utils.helpers.playback import AccessUtils
+from core.utils.parsers import CompressedJSONParser
+from core.utils.throttles import TokenBucketThrottleMixin
 
-from .serializers import FilmIDSerializer, PlaybackSerializer, ShortIDSerializer
+from .serializers import (
+    FilmIDSerializer,
+    PlaybackSerializer,
+    QoEBeaconSerializer,
+    QoERollupQuerySerializer,
+    QoERollupSerializer,
+    ShortIDSerializer,
+    ShortIDsSerializer,
+)
 from .throttles import (
+    RecordPlaybackQoEThrottle,
     RefreshPlaybackThrottle,
     RefreshShortPlaybackThrottle,
     RetrievePlaybackThrottle,
+    RetrieveShortPlaybackBatchThrottle,
     RetrieveShortPlaybackThrottle,
 )
 
@@ -40,14 +53,14 @@ class RetrieveFilmPlaybackURL(views.APIView):
         film_id = serializer.validated_data["film_id"]
 
         user = request.user
-        purchase, cookie_value, expires_at, cookie_path = (
+        entitlement, cookie_value, expires_at, cookie_path = (
             AccessUtils.return_stream_cookie_for_film(film_id, user)
         )
 
-        playback_url = AccessUtils.build_playback_url(purchase)
+        playback_url = AccessUtils.build_stream_url(entitlement["master_key"])
         cookie_name = getattr(settings, "STREAM_COOKIE_NAME", "stream_auth")
         cookie_domain = getattr(settings, "STREAM_COOKIE_DOMAIN", None)
-        cookie_ttl = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
+        cookie_ttl = AccessUtils.get_cookie_max_age(expires_at)
         cookie_secure = bool(getattr(settings, "STREAM_COOKIE_SECURE", True))
         cookie_samesite = getattr(settings, "STREAM_COOKIE_SAMESITE", "None")
 
@@ -91,13 +104,13 @@ class RefreshFilmPlaybackCookie(views.APIView):
         film_id = serializer.validated_data["film_id"]
 
         user = request.user
-        purchase, cookie_value, expires_at, cookie_path = (
+        _, cookie_value, expires_at, cookie_path = (
             AccessUtils.return_stream_cookie_for_film(film_id, user)
         )
 
         cookie_name = getattr(settings, "STREAM_COOKIE_NAME", "stream_auth")
         cookie_domain = getattr(settings, "STREAM_COOKIE_DOMAIN", None)
-        cookie_ttl = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
+        cookie_ttl = AccessUtils.get_cookie_max_age(expires_at)
         cookie_secure = bool(getattr(settings, "STREAM_COOKIE_SECURE", True))
         cookie_samesite = getattr(settings, "STREAM_COOKIE_SAMESITE", "None")
 
@@ -149,7 +162,7 @@ class RetrieveShortPlaybackURL(views.APIView):
         playback_url = AccessUtils.build_short_playback_url(short)
         cookie_name = getattr(settings, "STREAM_COOKIE_NAME", "stream_auth")
         cookie_domain = getattr(settings, "STREAM_COOKIE_DOMAIN", None)
-        cookie_ttl = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
+        cookie_ttl = AccessUtils.get_cookie_max_age(expires_at)
         cookie_secure = bool(getattr(settings, "STREAM_COOKIE_SECURE", True))
         cookie_samesite = getattr(settings, "STREAM_COOKIE_SAMESITE", "None")
 
@@ -170,6 +183,73 @@ class RetrieveShortPlaybackURL(views.APIView):
         return resp
 
 
+@extend_schema(tags=["Playback"])
+class RetrieveShortPlaybackURLs(views.APIView):
+    """
+    Batch form of RetrieveShortPlaybackURL for feed prefetching: playback
+    urls for several shorts and one cookie that covers all of them.
+    """
+
+    http_method_names = [
+        "post",
+    ]
+    parser_classes = [
+        JSONParser,
+    ]
+    throttle_classes = [RetrieveShortPlaybackBatchThrottle]
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        description="endpoint to get playback urls for several shorts at once",
+        request=ShortIDsSerializer,
+        responses={200: PlaybackSerializer.ShortPlaybackBatchSerializer},
+    )
+    @IdempotencyDecorator.make_endpoint_idempotent(
+        ttl=60, namespace="short_playback_urls"
+    )
+    def post(self, request):
+        serializer = ShortIDsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        short_ids = serializer.validated_data["short_ids"]
+
+        user = request.user if request.user.is_authenticated else None
+        shorts, unavailable, cookie_value, expires_at, cookie_path = (
+            AccessUtils.return_stream_cookie_for_shorts(short_ids, user)
+        )
+
+        cookie_name = getattr(settings, "STREAM_COOKIE_NAME", "stream_auth")
+        cookie_domain = getattr(settings, "STREAM_COOKIE_DOMAIN", None)
+        cookie_ttl = AccessUtils.get_cookie_max_age(expires_at)
+        cookie_secure = bool(getattr(settings, "STREAM_COOKIE_SECURE", True))
+        cookie_samesite = getattr(settings, "STREAM_COOKIE_SAMESITE", "None")
+
+        resp = response.Response(
+            data={
+                "shorts": [
+                    {
+                        "short_id": short.id,
+                        "url": AccessUtils.build_short_playback_url(short),
+                    }
+                    for short in shorts
+                ],
+                "unavailable": unavailable,
+                "expires_at": expires_at,
+            },
+            status=status.HTTP_200_OK,
+        )
+        resp.set_cookie(
+            cookie_name,
+            cookie_value,
+            max_age=cookie_ttl,
+            domain=cookie_domain,
+            path=cookie_path,
+            secure=cookie_secure,
+            httponly=True,
+            samesite=cookie_samesite,
+        )
+        return resp
+
+
 @extend_schema(tags=["Playback"])
 class RefreshShortPlaybackCookie(views.APIView):
     http_method_names = [
@@ -201,7 +281,7 @@ class RefreshShortPlaybackCookie(views.APIView):
 
         cookie_name = getattr(settings, "STREAM_COOKIE_NAME", "stream_auth")
         cookie_domain = getattr(settings, "STREAM_COOKIE_DOMAIN", None)
-        cookie_ttl = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
+        cookie_ttl = AccessUtils.get_cookie_max_age(expires_at)
         cookie_secure = bool(getattr(settings, "STREAM_COOKIE_SECURE", True))
         cookie_samesite = getattr(settings, "STREAM_COOKIE_SAMESITE", "None")
 
@@ -219,3 +299,74 @@ class RefreshShortPlaybackCookie(views.APIView):
             samesite=cookie_samesite,
         )
         return resp
+
+
+@extend_schema(tags=["Playback"])
+class RetrieveThrottleStats(views.APIView):
+    http_method_names = ["get"]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        description="endpoint for allowed/denied request counts per throttle scope",
+        request=None,
+        responses={200: PlaybackSerializer.ThrottleStatsSerializer},
+    )
+    def get(self, request):
+        return response.Response(
+            data={"scopes": TokenBucketThrottleMixin.get_stats()},
+            status=status.HTTP_200_OK,
+        )
+
+
+@extend_schema(tags=["Playback"])
+class RecordPlaybackQoE(views.APIView):
+    """
+    Ingests batched player QoE beacons, optionally gzip-compressed. Beacons
+    are appended raw and rolled up hourly by rollup_playback_qoe.
+    """
+
+    http_method_names = ["post"]
+    parser_classes = [CompressedJSONParser]
+    permission_classes = [AllowAny]
+    throttle_classes = [RecordPlaybackQoEThrottle]
+
+    @extend_schema(
+        description="endpoint for recording a batch of player QoE beacons",
+        request=QoEBeaconSerializer,
+        responses={202: None},
+    )
+    def post(self, request):
+        serializer = QoEBeaconSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        accepted = QoETelemetryUtils.record_beacons(
+            serializer.validated_data["events"],
+            serializer.validated_data["session_id"],
+            QoETelemetryUtils.get_region(request),
+        )
+        return response.Response(
+            data={"accepted": accepted}, status=status.HTTP_202_ACCEPTED
+        )
+
+
+@extend_schema(tags=["Playback"])
+class ListPlaybackQoE(generics.ListAPIView):
+    """
+    Hourly QoE rollups. Creators see their own films and shorts, staff see
+    everything.
+    """
+
+    http_method_names = ["get"]
+    permission_classes = [IsAuthenticated]
+    serializer_class = QoERollupSerializer
+
+    def get_queryset(self):
+        query = QoERollupQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return QoETelemetryUtils.get_rollups(self.request.user, query.validated_data)
+
+    @extend_schema(
+        description="endpoint for hourly playback QoE per rendition and region",
+        parameters=[QoERollupQuerySerializer],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
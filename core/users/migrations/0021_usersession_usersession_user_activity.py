@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0020_alter_usersession_user"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usersession",
+            index=models.Index(
+                fields=["user", "is_active", "-last_activity"],
+                name="usersession_user_activity",
+            ),
+        ),
+    ]
@@ -210,6 +210,12 @@ class UserSession(mixins.BaseModelMixin):
     class Meta:
         verbose_name = "User Session"
         verbose_name_plural = "User Sessions"
+        indexes = [
+            models.Index(
+                fields=["user", "is_active", "-last_activity"],
+                name="usersession_user_activity",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.ip_address}"
@@ -42,3 +42,15 @@ class ShortType(BaseEnum):
     TRAILER = "trailer"
     TEASER = "teaser"
     SNIPPET = "snippet"
+
+
+class ViewTargetType(BaseEnum):
+    FILM = "film"
+    SHORT = "short"
+
+
+class FilmFacet(BaseEnum):
+    GENRE = "genre"
+    LANGUAGE = "language"
+    TYPE = "type"
+    SALE_TYPE = "sale_type"
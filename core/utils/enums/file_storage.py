@@ -11,7 +11,13 @@ class FilePurposeType(BaseEnum):
     OTHERS = "others"
 
 
+class ChecksumAlgorithm(BaseEnum):
+    SHA256 = "SHA256"
+    CRC32C = "CRC32C"
+
+
 class JobStatus(BaseEnum):
+    DEFERRED = "deferred"
     PENDING = "pending"
     RUNNING = "running"
     RETRYING = "retrying"
@@ -31,6 +37,25 @@ class Stage(BaseEnum):
     FINALIZE = "finalize"
 
 
+class PackagingMode(BaseEnum):
+    SEGMENTED = "segmented"
+    BYTE_RANGE = "byte_range"
+
+
+class ArtifactType(BaseEnum):
+    SOURCE = "source"
+    MP4 = "mp4"
+    HLS = "hls"
+    DASH = "dash"
+    THUMBNAILS = "thumbnails"
+
+
+class LifecycleAction(BaseEnum):
+    KEEP = "keep"
+    ARCHIVE = "archive"
+    DELETE = "delete"
+
+
 class FileProcessingEventType(BaseEnum):
     FILE_JOB_STAGE = "file_job_stage"
     FILE_JOB_RETRYING = "file_job_retrying"
@@ -62,3 +87,12 @@ DEFAULT_RENDITIONS = [
         "audio_bitrate": 96,
     },
 ]
+
+# Pipeline chain steps in order; stages within a step run in parallel
+PIPELINE_STEPS = [
+    [Stage.PROBE.value],
+    [Stage.VALIDATE.value],
+    [Stage.TRANSCODE.value],
+    [Stage.PACKAGE_HLS.value, Stage.PACKAGE_DASH.value],
+    [Stage.THUMBNAILS.value],
+]
@@ -14,6 +14,7 @@ class WebhookEvent(BaseEnum):
 
 class WebhookProvider(BaseEnum):
     FLUTTERWAVE = "flutterwave"
+    STORAGE = "storage"
 
 
 class WebhookProcessingState(BaseEnum):
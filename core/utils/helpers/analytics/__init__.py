@@ -0,0 +1,5 @@
+from .base import *
+from .counters import *
+from .engagement import *
+from .qoe import *
+from .ranking import *
@@ -0,0 +1,35 @@
+from django.db.models import BigIntegerField, Case, F, Value, When
+
+
+class BufferedCounterUtils:
+    """
+    Shared pieces of the redis write-behind buffers: claiming a pending hash
+    for a flush and turning per-row increments into one UPDATE.
+    """
+
+    @staticmethod
+    def claim_pending(client, pending_key: str, flushing_key: str) -> dict:
+        """
+        Move a pending hash aside so new writes keep accumulating while it is
+        flushed. A batch left by a failed flush is returned again before a
+        new one is claimed; delete flushing_key once it has been written.
+        """
+        if not client.exists(flushing_key):
+            if not client.exists(pending_key):
+                return {}
+            client.rename(pending_key, flushing_key)
+        return {
+            field.decode(): value.decode()
+            for field, value in client.hgetall(flushing_key).items()
+        }
+
+    @staticmethod
+    def build_increment(field: str, increments: dict):
+        """
+        F(field) plus a per-row amount, so one UPDATE applies every increment.
+        """
+        return F(field) + Case(
+            *[When(id=row_id, then=Value(n)) for row_id, n in increments.items()],
+            default=Value(0),
+            output_field=BigIntegerField(),
+        )
@@ -0,0 +1,195 @@
+import uuid
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection, transaction
+from django.utils import timezone
+
+from loguru import logger
+
+from core.feed.models import DailyViewCount, Feed, Short
+from core.utils import enums
+from core.utils.helpers.redis import RedisTools
+
+from .base import BufferedCounterUtils
+
+
+class ViewCounterUtils:
+    """
+    Buffered view counting. Each play event is a few O(1) redis commands: a
+    per-viewer marker that drops repeat plays within VIEW_DEDUPE_SECONDS, a
+    per-day HyperLogLog of viewers and an increment in the pending hash. A
+    periodic flush moves the pending increments to Postgres with one UPDATE
+    per model and one additive upsert of the daily rollups.
+    """
+
+    PENDING_KEY = "views:pending"
+    VIEWER_SALT = "views.viewer"
+    FLUSHING_KEY = "views:flushing"
+    TARGET_MODELS = {
+        enums.ViewTargetType.FILM.value: Feed,
+        enums.ViewTargetType.SHORT.value: Short,
+    }
+
+    @staticmethod
+    def _member(target_type: str, target_id: int, day: date) -> str:
+        return f"{target_type}:{target_id}:{day.isoformat()}"
+
+    @staticmethod
+    def _seen_key(member: str, viewer: str) -> str:
+        return f"views:seen:{member}:{viewer}"
+
+    @staticmethod
+    def _unique_key(member: str) -> str:
+        return f"views:hll:{member}"
+
+    @staticmethod
+    def issue_viewer_id() -> str:
+        """Signed anonymous player id, handed out by RecordViews."""
+        return signing.Signer(salt=ViewCounterUtils.VIEWER_SALT).sign(uuid.uuid4().hex)
+
+    @staticmethod
+    def get_viewer(request, viewer_id: str = None) -> str:
+        """
+        Identity used for de-duplication and unique counts: the user when
+        signed in, else an anonymous id this server issued, else the client
+        address. Ids the client made up are ignored, so rotating them does
+        not make a new viewer.
+        """
+        if request.user.is_authenticated:
+            return f"user:{request.user.id}"
+        if viewer_id:
+            try:
+                return "anon:" + signing.Signer(
+                    salt=ViewCounterUtils.VIEWER_SALT
+                ).unsign(viewer_id)
+            except signing.BadSignature:
+                pass
+        return f"ip:{request.META.get('REMOTE_ADDR')}"
+
+    @staticmethod
+    def record_views(events: list[dict], viewer: str) -> int:
+        """
+        Count a batch of play events, each {"type", "id"}, for one viewer.
+        Returns how many were counted; replays of a title the viewer already
+        played within VIEW_DEDUPE_SECONDS, in this batch or an earlier one,
+        are dropped.
+        """
+        day = timezone.now().date()
+        ttl = settings.VIEW_COUNTER_RETENTION_SECONDS
+        client = RedisTools.get_connection()
+        members = [
+            ViewCounterUtils._member(event["type"], event["id"], day)
+            for event in events
+        ]
+        pipeline = client.pipeline(transaction=False)
+        for member in members:
+            pipeline.set(
+                ViewCounterUtils._seen_key(member, viewer),
+                1,
+                nx=True,
+                ex=settings.VIEW_DEDUPE_SECONDS,
+            )
+        first_seen = pipeline.execute()
+
+        counted = [member for member, new in zip(members, first_seen) if new]
+        if not counted:
+            return 0
+        pipeline = client.pipeline(transaction=False)
+        for member in counted:
+            pipeline.hincrby(ViewCounterUtils.PENDING_KEY, member, 1)
+            pipeline.pfadd(ViewCounterUtils._unique_key(member), viewer)
+            pipeline.expire(ViewCounterUtils._unique_key(member), ttl)
+        pipeline.execute()
+        return len(counted)
+
+    @staticmethod
+    def _upsert_rollups(rollups: list[tuple]):
+        """
+        Add (target_type, target_id, date, views, unique_views) rows to the
+        daily rollups. views accumulates across flushes and unique_views only
+        grows, so a flush never lowers a day's totals.
+        """
+        table = DailyViewCount._meta.db_table
+        now = timezone.now()
+        for start in range(0, len(rollups), 1000):
+            batch = rollups[start : start + 1000]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (target_type, target_id, date, views, "
+                    "unique_views, date_added, date_last_modified) VALUES "
+                    + ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(batch))
+                    + " ON CONFLICT (target_type, target_id, date) DO UPDATE SET "
+                    f"views = {table}.views + EXCLUDED.views, "
+                    f"unique_views = GREATEST({table}.unique_views, "
+                    "EXCLUDED.unique_views), "
+                    "date_last_modified = EXCLUDED.date_last_modified",
+                    [value for row in batch for value in (*row, now, now)],
+                )
+
+    @staticmethod
+    def flush() -> dict:
+        """
+        Write buffered views to views_count and the daily rollups. The
+        number of statements per flush does not depend on traffic.
+        """
+        client = RedisTools.get_connection()
+        pending = {
+            member: int(count)
+            for member, count in BufferedCounterUtils.claim_pending(
+                client, ViewCounterUtils.PENDING_KEY, ViewCounterUtils.FLUSHING_KEY
+            ).items()
+        }
+        if not pending:
+            return {"items": 0, "views": 0}
+
+        members = list(pending)
+        pipeline = client.pipeline(transaction=False)
+        for member in members:
+            pipeline.pfcount(ViewCounterUtils._unique_key(member))
+        unique_counts = pipeline.execute()
+
+        increments = defaultdict(lambda: defaultdict(int))
+        rollups = []
+        for member, unique_views in zip(members, unique_counts):
+            target_type, target_id, day = member.split(":")
+            increments[target_type][int(target_id)] += pending[member]
+            rollups.append(
+                (
+                    target_type,
+                    int(target_id),
+                    date.fromisoformat(day),
+                    pending[member],
+                    unique_views,
+                )
+            )
+
+        existing = {}
+        with transaction.atomic():
+            for target_type, counts in increments.items():
+                model = ViewCounterUtils.TARGET_MODELS.get(target_type)
+                if model is None:
+                    continue
+                existing[target_type] = set(
+                    model.objects.filter(id__in=counts).values_list("id", flat=True)
+                )
+                if existing[target_type]:
+                    model.objects.filter(id__in=existing[target_type]).update(
+                        views_count=BufferedCounterUtils.build_increment(
+                            "views_count", counts
+                        )
+                    )
+            ViewCounterUtils._upsert_rollups(
+                [
+                    rollup
+                    for rollup in rollups
+                    if rollup[1] in existing.get(rollup[0], ())
+                ]
+            )
+        client.delete(ViewCounterUtils.FLUSHING_KEY)
+
+        total = sum(pending.values())
+        logger.info(f"flushed {total} views for {len(members)} items")
+        return {"items": len(members), "views": total}
@@ -0,0 +1,176 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from loguru import logger
+
+from core.feed.models import Short, ShortLike
+from core.utils.helpers.redis import RedisTools
+
+from .base import BufferedCounterUtils
+
+
+class EngagementUtils:
+    """
+    Write-behind likes and comment counts for shorts. Like membership lives
+    in a redis set per user and toggles touch only redis; like rows and the
+    Short counters are written in bulk by flush_engagement, so a popular
+    short never becomes a row every like waits on.
+    """
+
+    COUNTS_KEY = "engagement:counts"
+    COUNTS_FLUSHING_KEY = "engagement:counts:flushing"
+    LIKES_KEY = "engagement:likes"
+    LIKES_FLUSHING_KEY = "engagement:likes:flushing"
+    COUNTER_FIELDS = {"likes": "likes_count", "comments": "comments_count"}
+    # keeps a loaded membership set non-empty, so "no likes" is not a miss
+    LOADED_MARKER = "0"
+
+    TOGGLE_LIKE_SCRIPT = """
+    local changed
+    if ARGV[2] == "1" then
+        changed = redis.call("SADD", KEYS[1], ARGV[1])
+    else
+        changed = redis.call("SREM", KEYS[1], ARGV[1])
+    end
+    redis.call("EXPIRE", KEYS[1], ARGV[4])
+    if changed == 1 then
+        local delta = -1
+        if ARGV[2] == "1" then delta = 1 end
+        redis.call("HINCRBY", KEYS[2], "likes:" .. ARGV[1], delta)
+        redis.call("HSET", KEYS[3], ARGV[3] .. ":" .. ARGV[1], ARGV[2])
+    end
+    return changed
+    """
+
+    @staticmethod
+    def _membership_key(user_id) -> str:
+        return f"engagement:liked:{user_id}"
+
+    @staticmethod
+    def _load_membership(client, user_id) -> str:
+        """
+        Make sure the user's like set is in redis, loading it from the like
+        table after it has expired.
+        """
+        key = EngagementUtils._membership_key(user_id)
+        if client.exists(key):
+            return key
+        short_ids = ShortLike.objects.filter(user_id=user_id).values_list(
+            "short_id", flat=True
+        )
+        pipeline = client.pipeline()
+        pipeline.sadd(key, EngagementUtils.LOADED_MARKER, *short_ids)
+        pipeline.expire(key, settings.LIKE_MEMBERSHIP_TTL)
+        pipeline.execute()
+        return key
+
+    @staticmethod
+    def set_like(user, short_id: int, liked: bool) -> bool:
+        """
+        Like or unlike a short. Returns whether the state changed; repeating
+        a like or unlike is a no-op.
+        """
+        client = RedisTools.get_connection()
+        key = EngagementUtils._load_membership(client, user.id)
+        changed = client.register_script(EngagementUtils.TOGGLE_LIKE_SCRIPT)(
+            keys=[key, EngagementUtils.COUNTS_KEY, EngagementUtils.LIKES_KEY],
+            args=[
+                short_id,
+                "1" if liked else "0",
+                user.id,
+                settings.LIKE_MEMBERSHIP_TTL,
+            ],
+        )
+        return bool(changed)
+
+    @staticmethod
+    def get_liked(user, short_ids: list[int]) -> list[int]:
+        """
+        Which of these shorts the user has liked, in one round trip.
+        """
+        if not short_ids:
+            return []
+        client = RedisTools.get_connection()
+        key = EngagementUtils._load_membership(client, user.id)
+        flags = client.smismember(key, short_ids)
+        return [short_id for short_id, liked in zip(short_ids, flags) if liked]
+
+    @staticmethod
+    def add_comment(short_id: int, delta: int = 1) -> None:
+        RedisTools.get_connection().hincrby(
+            EngagementUtils.COUNTS_KEY, f"comments:{short_id}", delta
+        )
+
+    @staticmethod
+    def flush() -> dict:
+        """
+        Write buffered like rows and counter increments: one insert and one
+        delete for the like table and one UPDATE for the Short counters.
+        """
+        client = RedisTools.get_connection()
+        counts = BufferedCounterUtils.claim_pending(
+            client, EngagementUtils.COUNTS_KEY, EngagementUtils.COUNTS_FLUSHING_KEY
+        )
+        likes = BufferedCounterUtils.claim_pending(
+            client, EngagementUtils.LIKES_KEY, EngagementUtils.LIKES_FLUSHING_KEY
+        )
+        if not counts and not likes:
+            return {"likes": 0, "counters": 0}
+
+        increments = defaultdict(dict)
+        for member, delta in counts.items():
+            counter, short_id = member.split(":")
+            if int(delta):
+                increments[counter][int(short_id)] = int(delta)
+
+        added, removed = [], []
+        for member, state in likes.items():
+            user_id, short_id = (int(part) for part in member.split(":"))
+            (added if state == "1" else removed).append((user_id, short_id))
+
+        short_ids = {short_id for _, short_id in added} | {
+            short_id for rows in increments.values() for short_id in rows
+        }
+        with transaction.atomic():
+            existing = set(
+                Short.objects.filter(id__in=short_ids).values_list("id", flat=True)
+            )
+            ShortLike.objects.bulk_create(
+                [
+                    ShortLike(user_id=user_id, short_id=short_id)
+                    for user_id, short_id in added
+                    if short_id in existing
+                ],
+                ignore_conflicts=True,
+                batch_size=1000,
+            )
+            if removed:
+                query = Q()
+                for user_id, short_id in removed:
+                    query |= Q(user_id=user_id, short_id=short_id)
+                ShortLike.objects.filter(query).delete()
+
+            updates = {
+                EngagementUtils.COUNTER_FIELDS[counter]: (
+                    BufferedCounterUtils.build_increment(
+                        EngagementUtils.COUNTER_FIELDS[counter], rows
+                    )
+                )
+                for counter, rows in increments.items()
+                if counter in EngagementUtils.COUNTER_FIELDS
+            }
+            if updates:
+                Short.objects.filter(
+                    id__in={i for rows in increments.values() for i in rows}
+                ).update(**updates)
+
+        client.delete(
+            EngagementUtils.COUNTS_FLUSHING_KEY, EngagementUtils.LIKES_FLUSHING_KEY
+        )
+        logger.info(
+            f"flushed {len(likes)} like changes and {len(counts)} counter increments"
+        )
+        return {"likes": len(likes), "counters": len(counts)}
@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BigIntegerField, Count, F, Max, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncHour
+from django.utils import timezone
+
+from loguru import logger
+
+from core.feed.models import Feed, Short
+from core.playback.models import PlaybackBeacon, PlaybackQoEHourly
+from core.utils import enums
+
+
+class QoETelemetryUtils:
+    """
+    Player quality-of-experience telemetry. Beacons are appended to
+    PlaybackBeacon in one insert per batch; an hourly task folds them into
+    PlaybackQoEHourly per film or short, rendition and region, which is what
+    creators and ops query.
+    """
+
+    ROLLUP_FIELDS = [
+        "sessions",
+        "beacons",
+        "startup_samples",
+        "startup_ms_total",
+        "startup_ms_max",
+        "played_ms",
+        "rebuffer_count",
+        "rebuffer_ms",
+        "bitrate_switches",
+        "bitrate_kbps_ms",
+        "errors",
+    ]
+
+    @staticmethod
+    def get_region(request) -> str:
+        """
+        Viewer region from the edge's country header, e.g. CF-IPCountry.
+        """
+        region = request.META.get(settings.QOE_REGION_HEADER, "").strip().upper()
+        return region[:8] if region.isalpha() else "unknown"
+
+    @staticmethod
+    def record_beacons(events: list[dict], session_id: str, region: str) -> int:
+        PlaybackBeacon.objects.bulk_create(
+            [
+                PlaybackBeacon(
+                    target_type=event["type"],
+                    target_id=event["id"],
+                    session_id=session_id,
+                    rendition=event.get("rendition") or "",
+                    region=region,
+                    startup_ms=event.get("startup_ms"),
+                    played_ms=event.get("played_ms", 0),
+                    rebuffer_count=event.get("rebuffer_count", 0),
+                    rebuffer_ms=event.get("rebuffer_ms", 0),
+                    bitrate_switches=event.get("bitrate_switches", 0),
+                    bitrate_kbps=event.get("bitrate_kbps"),
+                    errors=event.get("errors", 0),
+                )
+                for event in events
+            ]
+        )
+        return len(events)
+
+    @staticmethod
+    def rollup(since=None, until=None) -> int:
+        """
+        Recompute the hourly rollups for every hour in [since, until) from
+        the raw beacons and upsert them. Recomputing whole hours keeps the
+        task idempotent and picks up beacons that arrived late.
+        """
+        now = timezone.now()
+        until = until or now
+        since = since or now - timedelta(hours=settings.QOE_ROLLUP_LOOKBACK_HOURS)
+        since = since.replace(minute=0, second=0, microsecond=0)
+
+        rows = (
+            PlaybackBeacon.objects.filter(date_added__gte=since, date_added__lt=until)
+            .annotate(
+                hour=TruncHour("date_added"),
+                bitrate_weight=Cast("bitrate_kbps", BigIntegerField()) * F("played_ms"),
+            )
+            .values("hour", "target_type", "target_id", "rendition", "region")
+            .annotate(
+                sessions=Count("session_id", distinct=True),
+                beacons=Count("id"),
+                startup_samples=Count("startup_ms"),
+                startup_ms_total=Coalesce(Sum("startup_ms"), 0),
+                startup_ms_max=Coalesce(Max("startup_ms"), 0),
+                played_ms=Sum("played_ms"),
+                rebuffer_count=Sum("rebuffer_count"),
+                rebuffer_ms=Sum("rebuffer_ms"),
+                bitrate_switches=Sum("bitrate_switches"),
+                bitrate_kbps_ms=Coalesce(Sum("bitrate_weight"), 0),
+                errors=Sum("errors"),
+            )
+        )
+        rollups = PlaybackQoEHourly.objects.bulk_create(
+            [PlaybackQoEHourly(**row) for row in rows],
+            update_conflicts=True,
+            unique_fields=["hour", "target_type", "target_id", "rendition", "region"],
+            update_fields=QoETelemetryUtils.ROLLUP_FIELDS + ["date_last_modified"],
+            batch_size=1000,
+        )
+        logger.info(f"rolled up playback QoE since {since.isoformat()}: {len(rollups)}")
+        return len(rollups)
+
+    @staticmethod
+    def prune(before=None) -> int:
+        before = before or timezone.now() - timedelta(
+            days=settings.QOE_RAW_RETENTION_DAYS
+        )
+        deleted, _ = PlaybackBeacon.objects.filter(date_added__lt=before).delete()
+        return deleted
+
+    @staticmethod
+    def get_rollups(user, filters: dict):
+        """
+        Rollups visible to the user: everything for staff, otherwise only
+        rows for the user's own films and shorts.
+        """
+        queryset = PlaybackQoEHourly.objects.all()
+        if not user.is_staff:
+            queryset = queryset.filter(
+                Q(
+                    target_type=enums.ViewTargetType.FILM.value,
+                    target_id__in=Feed.objects.filter(owner=user).values("id"),
+                )
+                | Q(
+                    target_type=enums.ViewTargetType.SHORT.value,
+                    target_id__in=Short.objects.filter(owner=user).values("id"),
+                )
+            )
+        for field in ["target_type", "target_id", "rendition", "region"]:
+            if filters.get(field) not in (None, ""):
+                queryset = queryset.filter(**{field: filters[field]})
+        if filters.get("since"):
+            queryset = queryset.filter(hour__gte=filters["since"])
+        if filters.get("until"):
+            queryset = queryset.filter(hour__lt=filters["until"])
+        return queryset.order_by("-hour", "target_type", "target_id", "rendition")
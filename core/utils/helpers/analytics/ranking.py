@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+import math
+from collections import defaultdict
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from loguru import logger
+
+from core.feed.models import Purchase, Short
+from core.utils import enums
+from core.utils.helpers.redis import RedisTools
+
+
+class ShortRankingUtils:
+    """
+    Precomputed "for you" ranking of released shorts. A periodic task scores
+    every short from its views, likes, the related film's sales and its age,
+    and writes the scores to redis sorted sets: one global, one per language
+    and one per tag. Each run writes a new generation of sets and then moves
+    the current pointer, so readers never see a half-built ranking; a feed
+    cursor stays on the generation it started on until that expires.
+    Serving a page is a ZREVRANGE plus one id__in query for the shorts.
+    """
+
+    GENERATION_KEY = "ranking:shorts:generation"
+    CURRENT_KEY = "ranking:shorts:current"
+    GLOBAL_SCOPE = "global"
+    WRITE_BATCH_SIZE = 1000
+
+    @staticmethod
+    def get_key(generation, scope: str) -> str:
+        return f"ranking:shorts:{generation}:{scope}"
+
+    @staticmethod
+    def get_scope(tag: str = None, language: str = None) -> str:
+        if tag:
+            return f"tag:{tag}"
+        if language:
+            return f"lang:{language}"
+        return ShortRankingUtils.GLOBAL_SCOPE
+
+    @staticmethod
+    def get_published_at(release_date, date_added) -> datetime:
+        if release_date is None:
+            return date_added
+        return timezone.make_aware(datetime.combine(release_date, time.min))
+
+    @staticmethod
+    def score(views: int, likes: int, sales: int, age_hours: float) -> float:
+        """
+        Log-damped engagement over a power of age, so a short needs ever more
+        engagement to hold its place as it gets older.
+        """
+        weights = settings.SHORT_RANKING_WEIGHTS
+        engagement = (
+            weights.get("views", 0) * math.log1p(views)
+            + weights.get("likes", 0) * math.log1p(likes)
+            + weights.get("sales", 0) * math.log1p(sales)
+        )
+        age_hours = max(age_hours, 0)
+        return (engagement + 1) / (age_hours + 2) ** settings.SHORT_RANKING_GRAVITY
+
+    @staticmethod
+    def get_film_sales() -> dict:
+        return dict(
+            Purchase.objects.filter(
+                payment_status=enums.PurchasePaymentStatus.COMPLETED.value
+            )
+            .values("film_id")
+            .annotate(sales=Count("id"))
+            .values_list("film_id", "sales")
+        )
+
+    @staticmethod
+    def rebuild(now=None) -> int:
+        """
+        Score every released short into a new generation of sorted sets and
+        make it current. Returns the number of shorts ranked.
+        """
+        now = now or timezone.now()
+        client = RedisTools.get_connection()
+        generation = client.incr(ShortRankingUtils.GENERATION_KEY)
+        sales = ShortRankingUtils.get_film_sales()
+
+        scopes = defaultdict(dict)
+        rows = (
+            Short.objects.filter(is_released=True)
+            .values_list(
+                "id",
+                "views_count",
+                "likes_count",
+                "film_id",
+                "language",
+                "tags",
+                "release_date",
+                "date_added",
+            )
+            .iterator(chunk_size=2000)
+        )
+        for short_id, views, likes, film_id, language, tags, released, added in rows:
+            published_at = ShortRankingUtils.get_published_at(released, added)
+            score = ShortRankingUtils.score(
+                views,
+                likes,
+                sales.get(film_id, 0),
+                (now - published_at).total_seconds() / 3600,
+            )
+            scopes[ShortRankingUtils.GLOBAL_SCOPE][short_id] = score
+            scopes[ShortRankingUtils.get_scope(language=language)][short_id] = score
+            for tag in tags or []:
+                scopes[ShortRankingUtils.get_scope(tag=tag)][short_id] = score
+
+        pipeline = client.pipeline(transaction=False)
+        for scope, members in scopes.items():
+            key = ShortRankingUtils.get_key(generation, scope)
+            items = list(members.items())
+            for start in range(0, len(items), ShortRankingUtils.WRITE_BATCH_SIZE):
+                batch = items[start : start + ShortRankingUtils.WRITE_BATCH_SIZE]
+                pipeline.zadd(key, dict(batch))
+            pipeline.expire(key, settings.SHORT_RANKING_RETENTION_SECONDS)
+            pipeline.execute()
+        client.set(ShortRankingUtils.CURRENT_KEY, generation)
+
+        ranked = len(scopes[ShortRankingUtils.GLOBAL_SCOPE])
+        logger.info(f"ranked shorts generation {generation}: {ranked}")
+        return ranked
+
+    @staticmethod
+    def encode_cursor(generation: int, offset: int) -> str:
+        payload = json.dumps({"g": generation, "o": offset}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(encoded: str) -> dict | None:
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        if (
+            not isinstance(cursor, dict)
+            or not isinstance(cursor.get("g"), int)
+            or not isinstance(cursor.get("o"), int)
+            or cursor["o"] < 0
+        ):
+            return None
+        return cursor
+
+    @staticmethod
+    def get_page(scope: str, cursor: dict = None, page_size: int = 10):
+        """
+        Short ids for one page of a ranking, best first, and the cursor of
+        the next page or None.
+        """
+        client = RedisTools.get_connection()
+        if cursor:
+            generation, offset = cursor["g"], cursor["o"]
+        else:
+            generation, offset = client.get(ShortRankingUtils.CURRENT_KEY), 0
+            if generation is None:
+                return [], None
+            generation = int(generation)
+
+        ids = [
+            int(member)
+            for member in client.zrevrange(
+                ShortRankingUtils.get_key(generation, scope),
+                offset,
+                offset + page_size,
+            )
+        ]
+        next_cursor = None
+        if len(ids) > page_size:
+            next_cursor = ShortRankingUtils.encode_cursor(
+                generation, offset + page_size
+            )
+        return ids[:page_size], next_cursor
+
+    @staticmethod
+    def hydrate(short_ids: list[int]) -> list[Short]:
+        """Released shorts for the ids in one query, in ranked order."""
+        shorts = (
+            Short.objects.filter(is_released=True)
+            .select_related("owner", "film")
+            .in_bulk(short_ids)
+        )
+        return [shorts[short_id] for short_id in short_ids if short_id in shorts]
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import json
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from rest_framework.renderers import JSONRenderer
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+class CatalogCache:
+    """
+    Cache of rendered public catalog responses. Keys carry a catalog version
+    counter, so one increment on any film or short change orphans every
+    cached page at once and the old entries simply expire. Entries hold the
+    gzipped body and its ETag: a hit is a single Redis GET, served as is to
+    clients that accept gzip, and a matching If-None-Match gets a 304.
+    """
+
+    VERSION_KEY = "catalog:version"
+
+    @staticmethod
+    def get_version() -> int:
+        version = cache.get(CatalogCache.VERSION_KEY)
+        if version is None:
+            # restart from the clock so a lost counter never reuses old keys
+            cache.add(CatalogCache.VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(CatalogCache.VERSION_KEY)
+        return version
+
+    @staticmethod
+    def bump_version():
+        try:
+            cache.incr(CatalogCache.VERSION_KEY)
+        except ValueError:
+            cache.add(CatalogCache.VERSION_KEY, time.time_ns(), timeout=None)
+
+    @staticmethod
+    def invalidate(**kwargs):
+        """
+        Bump now, for the writer's own next read, and again on commit so a
+        page rendered from the old rows meanwhile is not kept.
+        """
+        CatalogCache.bump_version()
+        transaction.on_commit(CatalogCache.bump_version)
+
+    @staticmethod
+    def build_key(request, scope: str) -> str:
+        params = sorted(
+            (name, sorted(v for v in request.query_params.getlist(name) if v))
+            for name in request.query_params
+        )
+        raw = json.dumps(
+            [request.get_host(), request.path, [p for p in params if p[1]]],
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"catalog:{scope}:{CatalogCache.get_version()}:{digest}"
+
+    @staticmethod
+    def get(key: str) -> dict | None:
+        return cache.get(key)
+
+    @staticmethod
+    def store(key: str, data, owner_id: int = None) -> dict:
+        body = JSONRenderer().render(data)
+        entry = {
+            "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            "body": gzip.compress(body, compresslevel=6),
+            "owner_id": owner_id,
+        }
+        cache.set(key, entry, timeout=settings.CATALOG_CACHE_TTL)
+        return entry
+
+    @staticmethod
+    def is_not_modified(request, etag: str) -> bool:
+        header = request.headers.get("If-None-Match", "")
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return etag in tags or "*" in tags
+
+    @staticmethod
+    def set_headers(response, etag: str):
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    @staticmethod
+    def to_response(request, entry: dict) -> HttpResponse:
+        if CatalogCache.is_not_modified(request, entry["etag"]):
+            response = HttpResponseNotModified()
+        elif ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(entry["body"], content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                gzip.decompress(entry["body"]), content_type="application/json"
+            )
+        return CatalogCache.set_headers(response, entry["etag"])
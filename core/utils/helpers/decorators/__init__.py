@@ -13,6 +13,7 @@ from rest_framework.response import Response
 
 from core.utils import enums
 from core.utils.helpers import redis
+from core.utils.helpers.catalog_cache import CatalogCache
 from core.utils.models import IdempotencyKey
 
 
@@ -294,3 +295,48 @@ class IdempotencyDecorator:
             return function_to_execute
 
         return inner
+
+
+class CatalogCacheDecorator:
+    @staticmethod
+    def cache_response(scope: str, owner_key: str = None):
+        """
+        Serve a GET handler's 200 responses from CatalogCache.
+        - Keyed by the catalog version, path and normalized query params.
+        - With owner_key, response.data[owner_key]["id"] is the owner, who
+          sees a different representation, so their requests skip the cache.
+        """
+
+        def inner(function):
+            def function_to_execute(self, request, *args, **kwargs):
+                user_id = (
+                    request.user.id
+                    if getattr(request, "user", None) and request.user.is_authenticated
+                    else None
+                )
+                key = CatalogCache.build_key(request, scope)
+                entry = CatalogCache.get(key)
+                if entry and (
+                    entry["owner_id"] is None or entry["owner_id"] != user_id
+                ):
+                    return CatalogCache.to_response(request, entry)
+
+                response = function(self, request, *args, **kwargs)
+                if response.status_code != http_status.HTTP_200_OK:
+                    return response
+
+                owner_id = None
+                if owner_key:
+                    owner_id = (response.data.get(owner_key) or {}).get("id")
+                    if owner_id is not None and owner_id == user_id:
+                        return response
+
+                entry = CatalogCache.store(key, response.data, owner_id)
+                if CatalogCache.is_not_modified(request, entry["etag"]):
+                    return CatalogCache.to_response(request, entry)
+                return CatalogCache.set_headers(response, entry["etag"])
+
+            function_to_execute.__name__ = function.__name__
+            return function_to_execute
+
+        return inner
@@ -1 +1,4 @@
+from .facets import *
 from .schedulers import *
+from .search import *
+from .tags import *
@@ -0,0 +1,59 @@
+from django.db import connection
+
+from core.feed.models import FilmFacetCount
+from core.utils import enums
+
+
+class FilmFacetUtils:
+    """
+    Counts of released films per genre, language, type and sale type. The
+    unfiltered catalog is read from FilmFacetCount, which a trigger keeps
+    current; a filtered view counts the filtered films in one pass, which
+    the filter's own indexes keep to the matching rows.
+    """
+
+    @staticmethod
+    def empty() -> dict:
+        return {facet: [] for facet in enums.FilmFacet.values()}
+
+    @staticmethod
+    def format(rows) -> dict:
+        """{facet: [{value, count}]} from (facet, value, count) rows."""
+        facets = FilmFacetUtils.empty()
+        for facet, value, count in sorted(rows, key=lambda r: (r[0], -r[2], r[1])):
+            facets[facet].append({"value": value, "count": count})
+        return facets
+
+    @staticmethod
+    def get_catalog_facets() -> dict:
+        return FilmFacetUtils.format(
+            FilmFacetCount.objects.filter(films_count__gt=0).values_list(
+                "facet", "value", "films_count"
+            )
+        )
+
+    @staticmethod
+    def count_facets(queryset) -> dict:
+        sql, params = (
+            queryset.order_by()
+            .values("id", "genre", "language", "type", "sale_type")
+            .query.sql_with_params()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH films AS ({sql})
+                SELECT 'genre', genres.value, count(DISTINCT films.id)
+                    FROM films, unnest(films.genre) AS genres(value)
+                    GROUP BY genres.value
+                UNION ALL
+                SELECT 'language', language, count(*) FROM films GROUP BY language
+                UNION ALL
+                SELECT 'type', type, count(*) FROM films GROUP BY type
+                UNION ALL
+                SELECT 'sale_type', sale_type, count(*) FROM films GROUP BY sale_type
+                """,
+                params,
+            )
+            rows = [row for row in cursor.fetchall() if row[1] is not None]
+        return FilmFacetUtils.format(rows)
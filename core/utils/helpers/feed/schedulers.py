@@ -1,61 +1,103 @@
-from datetime import datetime
-from datetime import time as dt_time
-from typing import Optional
-
+from django.db import connection, transaction
+from django.dispatch import Signal
 from django.utils import timezone
 
-from celery import current_app
+from loguru import logger
+
+from core.feed.models import Feed, Short
 
-from core.feed.tasks import release_object
+# Sent once per release run with released={model_name: [ids]}, after the
+# rows are committed. The catalog cache listens; notifications can too.
+catalog_released = Signal()
 
 
-def schedule_release_for_instance(
-    instance,
-    model_name: str,
-    *,
-    when: Optional[datetime] = None,
-    previous_release_date=None,
-):
+class ReleaseSchedulerUtils:
     """
-    Schedule a release task for an instance (Feed/Short).
-    - If 'when' is provided (aware datetime), use it.
-    - Else, uses instance.release_date (DateField) at 00:00 in project TZ.
-    Skips scheduling if due time is in the past; you may want to process immediately instead.
+    Pending releases are the unreleased rows with a scheduled_release_at,
+    under a partial index on that column, so finding what is due reads
+    only those rows however large the catalog grows. Due rows are released
+    in batches by one UPDATE ... RETURNING each, which leases them with
+    FOR UPDATE SKIP LOCKED so concurrent runs never release a row twice,
+    and a single catalog_released signal is sent for the whole run.
     """
-    if previous_release_date == instance.release_date:
-        return None
-
-    if not getattr(instance, "release_date", None):
-        if getattr(instance, "release_task_id", None):
-            current_app.control.revoke(instance.release_task_id, terminate=False)
-            instance.__class__.objects.filter(pk=instance.pk).update(
-                release_task_id=None,
-                scheduled_release_at=None,
+
+    MODELS = (Feed, Short)
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def get_pending(model, now=None):
+        now = now or timezone.now()
+        return model.objects.filter(is_released=False, scheduled_release_at__lte=now)
+
+    @staticmethod
+    def release_batch(model, condition: str, params: list, now) -> list[int]:
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH due AS (
+                    SELECT id FROM {table}
+                    WHERE NOT is_released AND {condition}
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE {table} AS released
+                SET is_released = true,
+                    release_task_id = NULL,
+                    scheduled_release_at = NULL,
+                    date_last_modified = %s
+                FROM due
+                WHERE released.id = due.id
+                RETURNING released.id
+                """,
+                [*params, ReleaseSchedulerUtils.BATCH_SIZE, now],
             )
-        return None
-
-    if when is None:
-        naive = datetime.combine(instance.release_date, dt_time.min)
-        when = timezone.make_aware(naive, timezone.get_current_timezone())
-
-    now = timezone.now()
-    # Do not schedule if already released
-    if getattr(instance, "is_released", None) is True:
-        return None
-
-    if getattr(instance, "release_task_id", None):
-        current_app.control.revoke(instance.release_task_id, terminate=False)
-
-    if when <= now:
-        result = release_object.delay(instance.pk, model_name)
-    else:
-        result = release_object.apply_async(
-            args=(instance.pk, model_name),
-            eta=when,
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def release(condition: str, params: list, now, source: str) -> int:
+        released = {}
+        for model in ReleaseSchedulerUtils.MODELS:
+            ids = []
+            while True:
+                batch = ReleaseSchedulerUtils.release_batch(
+                    model, condition, params, now
+                )
+                ids.extend(batch)
+                if len(batch) < ReleaseSchedulerUtils.BATCH_SIZE:
+                    break
+            if ids:
+                released[model.__name__] = ids
+
+        count = sum(len(ids) for ids in released.values())
+        if count:
+            transaction.on_commit(
+                lambda: catalog_released.send(
+                    sender=ReleaseSchedulerUtils, released=released
+                )
+            )
+        logger.info(f"{source}: released={count}")
+        return count
+
+    @staticmethod
+    def release_due(now=None) -> int:
+        """Release every row whose scheduled_release_at has passed."""
+        now = now or timezone.now()
+        return ReleaseSchedulerUtils.release(
+            "scheduled_release_at <= %s", [now], now, "dispatch_due_releases"
         )
 
-    instance.__class__.objects.filter(pk=instance.pk).update(
-        release_task_id=result.id,
-        scheduled_release_at=when,
-    )
-    return result
+    @staticmethod
+    def release_overdue(now=None) -> int:
+        """
+        Release every row whose release_date has arrived, whether or not it
+        was ever scheduled.
+        """
+        now = now or timezone.now()
+        return ReleaseSchedulerUtils.release(
+            "release_date <= %s",
+            [timezone.localdate(now)],
+            now,
+            "reconcile_due_releases",
+        )
@@ -0,0 +1,53 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import F
+
+
+class FilmSearchUtils:
+    """
+    Full-text film search. Feed.search_vector holds a weighted tsvector of
+    title (A), cast and genre (B) and plot (C), kept current by a database
+    trigger on every write and GIN indexed, so matching and ranking never
+    scan the catalog. When nothing matches, titles are matched by trigram
+    word similarity to tolerate typos; that needs the pg_trgm extension and
+    is skipped where the database server does not provide it.
+    """
+
+    # must match the configuration the feed_search_vector trigger uses
+    SEARCH_CONFIG = "english"
+    _has_trigram = None
+
+    @staticmethod
+    def has_trigram() -> bool:
+        if FilmSearchUtils._has_trigram is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                FilmSearchUtils._has_trigram = cursor.fetchone() is not None
+        return FilmSearchUtils._has_trigram
+
+    @staticmethod
+    def search(queryset, term: str):
+        """
+        Ranked full-text matches for term, best first; falls back to typo
+        tolerant title matches when there are none.
+        """
+        query = SearchQuery(
+            term, config=FilmSearchUtils.SEARCH_CONFIG, search_type="websearch"
+        )
+        matches = (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-id")
+        )
+        if not FilmSearchUtils.has_trigram() or matches.exists():
+            return matches
+
+        return (
+            queryset.filter(title__trigram_word_similar=term)
+            .annotate(rank=TrigramWordSimilarity(term, "title"))
+            .order_by("-rank", "-id")
+        )
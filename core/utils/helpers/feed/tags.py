@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from loguru import logger
+
+from core.feed.models import ShortTag
+
+
+class ShortTagUtils:
+    """
+    Short tags are stored lowercased with collapsed whitespace so tag filters
+    can be exact array matches on the GIN-indexed Short.tags. Autocomplete
+    reads ShortTag, a per-tag count of released shorts recomputed by a
+    periodic task, through a prefix index on the tag name.
+    """
+
+    @staticmethod
+    def normalize(tags) -> list[str]:
+        normalized = []
+        for tag in tags or []:
+            tag = " ".join(str(tag).split()).lower()
+            if tag and tag not in normalized:
+                normalized.append(tag)
+        return normalized
+
+    @staticmethod
+    def parse(value: str) -> list[str]:
+        """Tags from a comma separated query parameter."""
+        return ShortTagUtils.normalize((value or "").split(","))
+
+    @staticmethod
+    def refresh() -> int:
+        """
+        Upsert the released-short count of every tag in use and drop tags no
+        longer on any released short.
+        """
+        started = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tag, count(*) FROM feed_short, unnest(tags) AS tag "
+                "WHERE is_released GROUP BY tag"
+            )
+            counts = cursor.fetchall()
+
+        with transaction.atomic():
+            ShortTag.objects.bulk_create(
+                [ShortTag(name=name, shorts_count=count) for name, count in counts],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=["shorts_count", "date_last_modified"],
+                batch_size=1000,
+            )
+            ShortTag.objects.filter(date_last_modified__lt=started).delete()
+        logger.info(f"refreshed short tags: {len(counts)}")
+        return len(counts)
+
+    @staticmethod
+    def autocomplete(prefix: str, limit: int = None):
+        """Most used tags starting with prefix."""
+        limit = limit or settings.SHORT_TAG_AUTOCOMPLETE_LIMIT
+        prefix = " ".join(prefix.split()).lower()
+        return ShortTag.objects.filter(name__startswith=prefix).order_by(
+            "-shorts_count", "name"
+        )[:limit]
@@ -1,3 +1,9 @@
+from .admission import *
 from .base import *
+from .estimator import *
+from .ingest import *
+from .lifecycle import *
+from .manifests import *
+from .multipart import *
 from .processing import *
 from .upload import *
@@ -0,0 +1,211 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from loguru import logger
+from rest_framework.exceptions import Throttled
+
+from core.file_storage.models import FileProcessingJob
+from core.utils import enums
+from core.utils.helpers.redis import RedisTools
+
+
+class UploadAdmissionUtils:
+    """
+    Admission control for uploads. Limits the work each account can have in
+    flight and keeps the platform-wide pipeline backlog bounded.
+    """
+
+    ACTIVE_JOB_STATUSES = [
+        enums.JobStatus.DEFERRED.value,
+        enums.JobStatus.PENDING.value,
+        enums.JobStatus.RUNNING.value,
+        enums.JobStatus.RETRYING.value,
+    ]
+    STARTED_JOB_STATUSES = [
+        enums.JobStatus.PENDING.value,
+        enums.JobStatus.RUNNING.value,
+        enums.JobStatus.RETRYING.value,
+    ]
+    AVERAGE_JOB_SECONDS_CACHE_KEY = "pipeline_average_job_seconds"
+    AVERAGE_JOB_SECONDS_CACHE_TTL = 5 * 60
+    AVERAGE_JOB_SECONDS_SAMPLE_SIZE = 50
+
+    @staticmethod
+    def _reservations_cache_key(owner_id) -> str:
+        return f"upload_reservations-{owner_id}"
+
+    @staticmethod
+    def account_lock(owner_id, timeout: int = 10):
+        """
+        Redis lock serialising admission checks and reservations for an account.
+        """
+        return cache.lock(f"upload_admission_lock-{owner_id}", timeout=timeout)
+
+    @staticmethod
+    def get_reservations(owner_id) -> dict:
+        """
+        Return unexpired uploads that have been presigned but not registered yet,
+        as {file_id: bytes}. Reservations live in a redis hash per account.
+        """
+        client = RedisTools.get_connection()
+        key = UploadAdmissionUtils._reservations_cache_key(owner_id)
+        now = time.time()
+        reservations, expired = {}, []
+        for file_id, value in client.hgetall(key).items():
+            size, expires_at = value.decode().split(":")
+            if float(expires_at) > now:
+                reservations[file_id.decode()] = int(size)
+            else:
+                expired.append(file_id)
+        if expired:
+            client.hdel(key, *expired)
+        return reservations
+
+    @staticmethod
+    def reserve(
+        owner, file_id, file_size: int = None, expires_in=settings.PRESIGNED_UPLOAD_TTL
+    ) -> None:
+        client = RedisTools.get_connection()
+        key = UploadAdmissionUtils._reservations_cache_key(owner.id)
+        client.hset(key, file_id, f"{file_size or 0}:{time.time() + expires_in}")
+        client.expire(key, expires_in)
+
+    @staticmethod
+    def reserve_many(
+        owner, files: dict, expires_in=settings.PRESIGNED_UPLOAD_TTL
+    ) -> None:
+        """
+        Reserve several uploads, given as {file_id: file_size}, in one round trip.
+        """
+        key = UploadAdmissionUtils._reservations_cache_key(owner.id)
+        expires_at = time.time() + expires_in
+        pipeline = RedisTools.get_connection().pipeline()
+        pipeline.hset(
+            key,
+            mapping={
+                file_id: f"{file_size or 0}:{expires_at}"
+                for file_id, file_size in files.items()
+            },
+        )
+        pipeline.expire(key, expires_in)
+        pipeline.execute()
+
+    @staticmethod
+    def release(owner_id, *file_ids) -> None:
+        client = RedisTools.get_connection()
+        client.hdel(UploadAdmissionUtils._reservations_cache_key(owner_id), *file_ids)
+
+    @staticmethod
+    def get_account_usage(owner) -> dict:
+        """
+        Jobs and bytes an account currently has in flight: pending reservations
+        plus processing jobs that have not completed or failed.
+        """
+        active = FileProcessingJob.objects.filter(
+            owner=owner, status__in=UploadAdmissionUtils.ACTIVE_JOB_STATUSES
+        ).aggregate(jobs=Count("id"), bytes=Sum("file__file_size"))
+        reservations = UploadAdmissionUtils.get_reservations(owner.id)
+        return {
+            "jobs": active["jobs"] + len(reservations),
+            "bytes": (active["bytes"] or 0) + sum(reservations.values()),
+        }
+
+    @staticmethod
+    def get_average_job_seconds() -> float:
+        """
+        Mean wall time of recently completed jobs, cached for a few minutes.
+        """
+        cached = cache.get(UploadAdmissionUtils.AVERAGE_JOB_SECONDS_CACHE_KEY)
+        if cached:
+            return cached
+
+        recent = (
+            FileProcessingJob.objects.filter(status=enums.JobStatus.COMPLETED.value)
+            .order_by("-date_last_modified")
+            .values_list("date_added", "date_last_modified")[
+                : UploadAdmissionUtils.AVERAGE_JOB_SECONDS_SAMPLE_SIZE
+            ]
+        )
+        durations = [(end - start).total_seconds() for start, end in recent]
+        average = (
+            sum(durations) / len(durations)
+            if durations
+            else float(settings.PIPELINE_DEFAULT_JOB_SECONDS)
+        )
+        cache.set(
+            UploadAdmissionUtils.AVERAGE_JOB_SECONDS_CACHE_KEY,
+            average,
+            timeout=UploadAdmissionUtils.AVERAGE_JOB_SECONDS_CACHE_TTL,
+        )
+        return average
+
+    @staticmethod
+    def count_started_jobs(exclude_id: int = None) -> int:
+        queryset = FileProcessingJob.objects.filter(
+            status__in=UploadAdmissionUtils.STARTED_JOB_STATUSES
+        )
+        if exclude_id is not None:
+            queryset = queryset.exclude(id=exclude_id)
+        return queryset.count()
+
+    @staticmethod
+    def pipeline_has_capacity(exclude_id: int = None) -> bool:
+        return (
+            UploadAdmissionUtils.count_started_jobs(exclude_id=exclude_id)
+            < settings.PIPELINE_MAX_ACTIVE_JOBS
+        )
+
+    @staticmethod
+    def estimate_backlog_seconds() -> float:
+        """
+        Estimated seconds until the pipeline drains the work already queued.
+        """
+        estimates = FileProcessingJob.objects.filter(
+            status__in=UploadAdmissionUtils.ACTIVE_JOB_STATUSES
+        ).values_list("estimates", flat=True)
+        average = UploadAdmissionUtils.get_average_job_seconds()
+        queued = sum((e or {}).get("total_seconds") or average for e in estimates)
+        workers = max(settings.PIPELINE_WORKER_CONCURRENCY, 1)
+        return queued / workers
+
+    @staticmethod
+    def admit_upload(owner, file_size: int = None, file_count: int = 1) -> None:
+        """
+        Raise Throttled (429 with Retry-After) if accepting file_count more
+        uploads (file_size bytes in total) from this account would exceed its
+        quotas or the pipeline backlog limit.
+        """
+        usage = UploadAdmissionUtils.get_account_usage(owner)
+        retry_after = int(UploadAdmissionUtils.get_average_job_seconds())
+
+        if usage["jobs"] + file_count > settings.UPLOAD_MAX_PENDING_JOBS_PER_ACCOUNT:
+            logger.warning(
+                f"upload rejected for user {owner.id}: {usage['jobs']} jobs in flight"
+            )
+            raise Throttled(
+                wait=retry_after,
+                detail="Too many uploads in progress for this account. Try again later.",
+            )
+
+        if (
+            usage["bytes"] + (file_size or 0)
+            > settings.UPLOAD_MAX_BYTES_IN_FLIGHT_PER_ACCOUNT
+        ):
+            logger.warning(
+                f"upload rejected for user {owner.id}: {usage['bytes']} bytes in flight"
+            )
+            raise Throttled(
+                wait=retry_after,
+                detail="Upload quota for this account exceeded. Try again later.",
+            )
+
+        backlog = UploadAdmissionUtils.estimate_backlog_seconds()
+        if backlog > settings.PIPELINE_MAX_BACKLOG_SECONDS:
+            logger.warning(f"upload rejected: pipeline backlog is {int(backlog)}s")
+            raise Throttled(
+                wait=int(backlog - settings.PIPELINE_MAX_BACKLOG_SECONDS),
+                detail="Processing pipeline is at capacity. Try again later.",
+            )
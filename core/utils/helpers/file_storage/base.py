@@ -34,13 +34,14 @@ class StorageClient:
     s3 client class. Contains all base methods that involves s3 clients
     """
 
-    def __init__(self):
+    def __init__(self, config=None):
         self.s3_client = boto3.client(
             "s3",
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_S3_REGION_NAME,
             endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            config=config,
         )
 
     @staticmethod
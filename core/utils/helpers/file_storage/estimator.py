@@ -0,0 +1,388 @@
+import heapq
+import json
+import statistics
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce, Extract, NullIf
+from django.utils import timezone
+
+from core.file_storage.models import FileProcessingJob
+from core.utils import enums
+from core.utils.helpers.redis import RedisTools
+
+
+class PipelineEstimator:
+    """
+    Predicts the wall time of each pipeline stage from completed jobs. Runs are
+    grouped into profiles on source codec, resolution class and rendition
+    ladder, and each stage is modelled as the median time per second of source
+    media, or per byte before ffprobe has run.
+    """
+
+    MODEL_CACHE_KEY = "pipeline_estimator_model"
+    MODEL_CACHE_TTL = 60 * 60
+    REFRESH_QUEUED_KEY = "pipeline_estimator_refresh_queued"
+    REFRESH_QUEUED_TTL = 60
+    GLOBAL_PROFILE = "*"
+
+    @staticmethod
+    def get_resolution_class(height: int | None) -> str:
+        if not height:
+            return "unknown"
+        if height <= 576:
+            return "sd"
+        if height <= 720:
+            return "hd"
+        if height <= 1080:
+            return "fhd"
+        return "uhd"
+
+    @staticmethod
+    def get_ladder_signature(renditions: list[dict]) -> str:
+        ladder = sorted(renditions, key=lambda r: r.get("height") or 0, reverse=True)
+        return ",".join(r["name"] for r in ladder)
+
+    @staticmethod
+    def get_job_features(job: FileProcessingJob) -> dict:
+        extracted = (job.metadata or {}).get("extracted") or {}
+        video = (extracted.get("video_streams") or [{}])[0]
+        return {
+            "duration": extracted.get("duration"),
+            "size": extracted.get("size") or job.file.file_size,
+            "codec": video.get("codec_name"),
+            "height": video.get("height"),
+            "renditions": job.renditions or enums.DEFAULT_RENDITIONS,
+        }
+
+    @staticmethod
+    def get_profile(features: dict) -> str:
+        return ":".join(
+            [
+                features.get("codec") or "unknown",
+                PipelineEstimator.get_resolution_class(features.get("height")),
+                PipelineEstimator.get_ladder_signature(
+                    features.get("renditions") or enums.DEFAULT_RENDITIONS
+                ),
+            ]
+        )
+
+    @staticmethod
+    def get_total_seconds(stage_seconds: dict) -> float:
+        """
+        Wall time of a whole run; parallel stages in a step count once.
+        """
+        return round(
+            sum(
+                max(stage_seconds.get(stage, 0.0) for stage in step)
+                for step in enums.PIPELINE_STEPS
+            ),
+            1,
+        )
+
+    @staticmethod
+    def measure_stage_seconds(stages: dict) -> dict:
+        """
+        Wall time per stage of a completed run, taken from the stage start
+        times. A step lasts until the next one starts; empty if the run never
+        reached finalize.
+        """
+        starts = {
+            stage: datetime.fromisoformat(data["started_at"])
+            for stage, data in (stages or {}).items()
+            if (data or {}).get("started_at")
+        }
+        finished = starts.get(enums.Stage.FINALIZE.value)
+        if finished is None:
+            return {}
+
+        steps = []
+        for step in enums.PIPELINE_STEPS:
+            ran = [stage for stage in step if stage in starts]
+            if ran:
+                steps.append((min(starts[stage] for stage in ran), ran))
+
+        durations = {}
+        boundaries = [start for start, _ in steps[1:]] + [finished]
+        for (start, ran), end in zip(steps, boundaries):
+            for stage in ran:
+                durations[stage] = max((end - start).total_seconds(), 0.0)
+        return durations
+
+    @staticmethod
+    def build_model() -> dict:
+        """
+        Fit per-profile stage rates on recently completed jobs and cache them.
+        """
+        jobs = (
+            FileProcessingJob.objects.filter(status=enums.JobStatus.COMPLETED.value)
+            .select_related("file")
+            .order_by("-date_last_modified")[: settings.PIPELINE_ESTIMATOR_SAMPLE_SIZE]
+        )
+
+        samples = {}
+        for job in jobs:
+            durations = PipelineEstimator.measure_stage_seconds(job.stages)
+            if not durations:
+                continue
+            features = PipelineEstimator.get_job_features(job)
+            for profile in (
+                PipelineEstimator.get_profile(features),
+                PipelineEstimator.GLOBAL_PROFILE,
+            ):
+                bucket = samples.setdefault(
+                    profile, {"samples": 0, "per_second": {}, "per_byte": {}}
+                )
+                bucket["samples"] += 1
+                for stage, seconds in durations.items():
+                    if features["duration"]:
+                        bucket["per_second"].setdefault(stage, []).append(
+                            seconds / features["duration"]
+                        )
+                    if features["size"]:
+                        bucket["per_byte"].setdefault(stage, []).append(
+                            seconds / features["size"]
+                        )
+
+        model = {
+            profile: {
+                "samples": bucket["samples"],
+                "per_second": {
+                    stage: statistics.median(rates)
+                    for stage, rates in bucket["per_second"].items()
+                },
+                "per_byte": {
+                    stage: statistics.median(rates)
+                    for stage, rates in bucket["per_byte"].items()
+                },
+            }
+            for profile, bucket in samples.items()
+        }
+        RedisTools.get_connection().set(
+            PipelineEstimator.MODEL_CACHE_KEY,
+            json.dumps(model),
+            ex=PipelineEstimator.MODEL_CACHE_TTL,
+        )
+        return model
+
+    @staticmethod
+    def get_model() -> dict:
+        """
+        The cached model. On a miss the model is not rebuilt here, in the
+        request path: a refresh is queued once and predictions fall back to
+        the defaults until it lands.
+        """
+        client = RedisTools.get_connection()
+        cached = client.get(PipelineEstimator.MODEL_CACHE_KEY)
+        if cached:
+            return json.loads(cached)
+
+        if client.set(
+            PipelineEstimator.REFRESH_QUEUED_KEY,
+            1,
+            nx=True,
+            ex=PipelineEstimator.REFRESH_QUEUED_TTL,
+        ):
+            from core.file_storage.tasks import refresh_pipeline_estimator
+
+            refresh_pipeline_estimator.delay()
+        return {}
+
+    @staticmethod
+    def predict(features: dict) -> dict:
+        """
+        Predicted seconds per stage and in total for a job with these
+        features. Falls back to the platform-wide profile when the job's own
+        has too few samples, and to PIPELINE_DEFAULT_JOB_SECONDS without history.
+        """
+        model = PipelineEstimator.get_model()
+        profile_key = PipelineEstimator.get_profile(features)
+        profile = model.get(profile_key)
+        if not profile or profile["samples"] < settings.PIPELINE_ESTIMATOR_MIN_SAMPLES:
+            profile_key = PipelineEstimator.GLOBAL_PROFILE
+            profile = model.get(profile_key)
+
+        basis, rates, scale = "default", {}, 0
+        if profile and profile["samples"] >= settings.PIPELINE_ESTIMATOR_MIN_SAMPLES:
+            if features.get("duration") and profile["per_second"]:
+                basis, rates = "duration", profile["per_second"]
+                scale = features["duration"]
+            elif features.get("size") and profile["per_byte"]:
+                basis, rates = "size", profile["per_byte"]
+                scale = features["size"]
+
+        if basis == "default":
+            return {
+                "basis": basis,
+                "profile": None,
+                "samples": 0,
+                "stages": {},
+                "total_seconds": float(settings.PIPELINE_DEFAULT_JOB_SECONDS),
+                "estimated_at": timezone.now().isoformat(),
+            }
+
+        stages = {stage: round(rate * scale, 1) for stage, rate in rates.items()}
+        return {
+            "basis": basis,
+            "profile": profile_key,
+            "samples": profile["samples"],
+            "stages": stages,
+            "total_seconds": PipelineEstimator.get_total_seconds(stages),
+            "estimated_at": timezone.now().isoformat(),
+        }
+
+    @staticmethod
+    def estimate_job(job: FileProcessingJob) -> dict:
+        job.estimates = PipelineEstimator.predict(
+            PipelineEstimator.get_job_features(job)
+        )
+        job.save(update_fields=["estimates", "date_last_modified"])
+        return job.estimates
+
+    @staticmethod
+    def get_scheduling_priority(estimates: dict, date_added: datetime, now=None):
+        """
+        Shortest-job-first priority with aging: a job's predicted run time less
+        the time it has already waited, so long jobs are not starved.
+        """
+        now = now or timezone.now()
+        predicted = (estimates or {}).get("total_seconds") or float(
+            settings.PIPELINE_DEFAULT_JOB_SECONDS
+        )
+        return predicted - (now - date_added).total_seconds()
+
+    @staticmethod
+    def get_scheduling_priority_expression():
+        """
+        get_scheduling_priority as a database expression, offset by the same
+        "now" for every row, so deferred jobs can be ordered and limited in SQL.
+        """
+        predicted = Coalesce(
+            NullIf(Cast(KT("estimates__total_seconds"), FloatField()), Value(0.0)),
+            Value(float(settings.PIPELINE_DEFAULT_JOB_SECONDS)),
+        )
+        return predicted + Cast(Extract(F("date_added"), "epoch"), FloatField())
+
+
+class PipelineSimulator:
+    """
+    Offline replay of an arrival log against a pool of pipeline workers, used
+    to size the pool. Each job holds one worker for its whole service time;
+    the sjf policy orders jobs with the scheduler's own aging priority.
+    """
+
+    POLICIES = ["fifo", "sjf"]
+
+    @staticmethod
+    def load_job_history(limit: int) -> list[dict]:
+        """
+        Arrivals from completed jobs: measured service time plus the estimate
+        the scheduler would have ordered on.
+        """
+        jobs = (
+            FileProcessingJob.objects.filter(status=enums.JobStatus.COMPLETED.value)
+            .select_related("file")
+            .order_by("-date_added")[:limit]
+        )
+        arrivals = []
+        for job in jobs:
+            durations = PipelineEstimator.measure_stage_seconds(job.stages)
+            if not durations:
+                continue
+            arrivals.append(
+                {
+                    "arrival": job.date_added.timestamp(),
+                    "service": PipelineEstimator.get_total_seconds(durations),
+                    "predicted": (job.estimates or {}).get("total_seconds")
+                    or PipelineEstimator.predict(
+                        PipelineEstimator.get_job_features(job)
+                    )["total_seconds"],
+                }
+            )
+        return arrivals
+
+    @staticmethod
+    def load_arrival_log(lines) -> list[dict]:
+        """
+        Arrivals from a JSON-lines log. Each entry has an `arrival` (ISO
+        timestamp or epoch seconds), optional `service_seconds` and the
+        estimator features (duration, size, codec, height, renditions).
+        """
+        arrivals = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            arrival = entry["arrival"]
+            if isinstance(arrival, str):
+                arrival = datetime.fromisoformat(arrival).timestamp()
+            predicted = PipelineEstimator.predict(entry)["total_seconds"]
+            arrivals.append(
+                {
+                    "arrival": float(arrival),
+                    "service": float(entry.get("service_seconds") or predicted),
+                    "predicted": predicted,
+                }
+            )
+        return arrivals
+
+    @staticmethod
+    def simulate(arrivals: list[dict], workers: int, policy: str = "fifo") -> dict:
+        arrivals = sorted(arrivals, key=lambda a: a["arrival"])
+        if not arrivals:
+            return {"workers": workers, "policy": policy, "jobs": 0}
+
+        origin = arrivals[0]["arrival"]
+        # the scheduler's aging priority falls by the same amount for every
+        # waiting job as the clock moves, so ranking at a fixed time orders
+        # them as the scheduler would at any time
+        ranked_at = datetime.fromtimestamp(origin, tz=dt_timezone.utc)
+        free_at = [origin] * workers
+        ready, waits, finishes = [], [], []
+        clock, index = origin, 0
+        while index < len(arrivals) or ready:
+            if ready:
+                clock = max(clock, free_at[0])
+            else:
+                clock = max(clock, free_at[0], arrivals[index]["arrival"])
+            while index < len(arrivals) and arrivals[index]["arrival"] <= clock:
+                job = arrivals[index]
+                key = (
+                    PipelineEstimator.get_scheduling_priority(
+                        {"total_seconds": job["predicted"]},
+                        datetime.fromtimestamp(job["arrival"], tz=dt_timezone.utc),
+                        ranked_at,
+                    )
+                    if policy == "sjf"
+                    else job["arrival"]
+                )
+                heapq.heappush(ready, (key, index, job))
+                index += 1
+
+            _, _, job = heapq.heappop(ready)
+            finish = clock + job["service"]
+            heapq.heapreplace(free_at, finish)
+            waits.append(clock - job["arrival"])
+            finishes.append(finish - job["arrival"])
+
+        makespan = max(free_at) - origin
+        waits.sort()
+        return {
+            "workers": workers,
+            "policy": policy,
+            "jobs": len(arrivals),
+            "mean_wait": round(statistics.mean(waits), 1),
+            "p95_wait": round(waits[int(0.95 * (len(waits) - 1))], 1),
+            "max_wait": round(waits[-1], 1),
+            "mean_turnaround": round(statistics.mean(finishes), 1),
+            "makespan": round(makespan, 1),
+            "utilization": (
+                round(sum(a["service"] for a in arrivals) / (workers * makespan), 3)
+                if makespan
+                else 0.0
+            ),
+        }
@@ -0,0 +1,202 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from core.file_storage.models import FileModel, FileProcessingJob
+from core.users.models import User
+from core.utils import enums, exceptions
+from core.utils.helpers.redis import RedisTools
+
+from .admission import UploadAdmissionUtils
+from .base import StorageClient
+from .estimator import PipelineEstimator
+from .upload import FileUploadUtils
+
+
+class StorageIngestUtils:
+    """
+    Registers uploads from storage events instead of waiting for the client's
+    CreateFileObject callback. Keys look like
+    uploads/<owner email>/<purpose>/<file id><extension>.
+    """
+
+    UPLOAD_PREFIX = "uploads/"
+    SWEEP_BATCH_SIZE = 500
+
+    @staticmethod
+    def parse_upload_key(key: str) -> dict | None:
+        """
+        Split an upload key into owner email, purpose and file id, or None if
+        the key is not a client upload.
+        """
+        if not key.startswith(StorageIngestUtils.UPLOAD_PREFIX):
+            return None
+        parts = key[len(StorageIngestUtils.UPLOAD_PREFIX) :].split("/")
+        if len(parts) != 3 or parts[1] not in enums.FilePurposeType.values():
+            return None
+        file_id = os.path.splitext(parts[2])[0]
+        if not file_id:
+            return None
+        return {"email": parts[0], "purpose": parts[1], "file_id": file_id}
+
+    @staticmethod
+    def start_processing(job: FileProcessingJob) -> str:
+        from core.file_storage.tasks import start_pipeline
+
+        if UploadAdmissionUtils.pipeline_has_capacity(exclude_id=job.id):
+            start_pipeline.delay(job.id)
+            return "processing"
+
+        job.status = enums.JobStatus.DEFERRED.value
+        job.save(update_fields=["status", "date_last_modified"])
+        return "deferred"
+
+    @staticmethod
+    def ingest_object(
+        key: str, file_size: int = None, storage_helper: StorageClient = None
+    ) -> dict:
+        """
+        Create the FileModel and processing job for an uploaded object and
+        start processing. The pending upload record supplies owner and file
+        name; once it has expired they are recovered from the key. Safe to
+        call more than once for the same object.
+        """
+        parsed = StorageIngestUtils.parse_upload_key(key)
+        if not parsed:
+            return {"status": "ignored", "key": key}
+
+        file_id = parsed["file_id"]
+        if FileModel.objects.filter(id=file_id).exists():
+            return {"status": "already_registered", "file_id": file_id}
+
+        pending = cache.get(f"pending_upload-{file_id}") or {}
+        if pending and pending.get("file_key") != key:
+            logger.warning(f"storage event key {key} does not match pending upload")
+            return {"status": "ignored", "key": key}
+
+        owner_id = pending.get("owner")
+        if owner_id is None:
+            owner_id = (
+                User.objects.filter(email__iexact=parsed["email"])
+                .values_list("id", flat=True)
+                .first()
+            )
+        if owner_id is None:
+            logger.warning(f"no owner found for uploaded object {key}")
+            return {"status": "ignored", "key": key}
+
+        try:
+            upload = FileUploadUtils.inspect_upload(
+                key, pending.get("checksum"), storage_helper=storage_helper
+            )
+        except exceptions.CustomException:
+            logger.warning(f"checksum mismatch for uploaded object {key}")
+            return {"status": "ignored", "key": key, "reason": "checksum mismatch"}
+
+        file_name = pending.get("file_name") or os.path.basename(key)
+        with transaction.atomic():
+            file, created = FileModel.objects.get_or_create(
+                id=file_id,
+                defaults={
+                    "owner_id": owner_id,
+                    "file_purpose": pending.get("purpose") or parsed["purpose"],
+                    "original_filename": file_name,
+                    "file_key": key,
+                    "mime_type": StorageClient.get_mime_type(file_name),
+                    "file_size": (
+                        file_size or upload["file_size"] or pending.get("file_size")
+                    ),
+                    "checksum": upload["checksum"],
+                },
+            )
+            if not created:
+                return {"status": "already_registered", "file_id": file_id}
+            job = FileProcessingJob.objects.create(
+                owner_id=owner_id,
+                file=file,
+                source_key=key,
+                source_checksum=upload["checksum"],
+                packaging_mode=FileUploadUtils.get_packaging_mode(pending),
+            )
+
+        cache.delete(f"pending_upload-{file_id}")
+        UploadAdmissionUtils.release(owner_id, file_id)
+        PipelineEstimator.estimate_job(job)
+        state = StorageIngestUtils.start_processing(job)
+        logger.info(f"upload {key} ingested from storage event: {state}")
+        return {"status": state, "file_id": file_id, "job_id": job.id}
+
+    @staticmethod
+    def sweep_stranded_uploads() -> list[dict]:
+        """
+        Ingest uploaded objects that were never registered, for when both the
+        storage event and the client callback were lost. Candidates are the
+        presigned uploads past the grace period, oldest first, so a sweep is
+        one HEAD per unregistered upload instead of a listing of the bucket.
+        A candidate leaves the set once registered, ingested or rejected, or
+        once nothing was uploaded before its pending record expired.
+        """
+        client = RedisTools.get_connection()
+        tracked = FileUploadUtils.PENDING_UPLOADS_KEY
+        now = time.time()
+        client.zremrangebyscore(tracked, "-inf", now - settings.STORAGE_INGEST_MAX_AGE)
+        storage_helper = StorageClient()
+
+        results, offset = [], 0
+        while True:
+            candidates = [
+                member.decode()
+                for member in client.zrangebyscore(
+                    tracked,
+                    "-inf",
+                    now - settings.STORAGE_INGEST_GRACE_SECONDS,
+                    start=offset,
+                    num=StorageIngestUtils.SWEEP_BATCH_SIZE,
+                )
+            ]
+            if not candidates:
+                return results
+
+            registered = set(
+                FileModel.objects.filter(file_key__in=candidates).values_list(
+                    "file_key", flat=True
+                )
+            )
+            pending = cache.get_many(
+                [
+                    f"pending_upload-{parsed['file_id']}"
+                    for parsed in map(StorageIngestUtils.parse_upload_key, candidates)
+                    if parsed
+                ]
+            )
+            done = []
+            for key in candidates:
+                parsed = StorageIngestUtils.parse_upload_key(key)
+                if key in registered or not parsed:
+                    done.append(key)
+                    continue
+                try:
+                    head = storage_helper.s3_client.head_object(
+                        Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key
+                    )
+                except ClientError:
+                    # not uploaded (yet); give up once the upload window closed
+                    if f"pending_upload-{parsed['file_id']}" not in pending:
+                        done.append(key)
+                    continue
+                results.append(
+                    StorageIngestUtils.ingest_object(
+                        key, head.get("ContentLength"), storage_helper
+                    )
+                )
+                done.append(key)
+
+            if done:
+                client.zrem(tracked, *done)
+            offset += len(candidates) - len(done)
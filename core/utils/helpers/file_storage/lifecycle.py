@@ -0,0 +1,259 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BigIntegerField, Count, Q, Sum
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from botocore.exceptions import BotoCoreError, ClientError
+from loguru import logger
+
+from core.file_storage.models import FileProcessingJob
+from core.utils import enums
+
+from .base import StorageClient
+from .processing import FileProcessingUtils
+
+
+class StorageLifecycleUtils:
+    """
+    Per-job storage accounting and the lifecycle policy for intermediates.
+    Bytes are counted per artifact type in the primary bucket and in the
+    archive bucket and kept on FileProcessingJob.storage, which is what the
+    per-creator cost report sums. Once a title is playable and the grace
+    period has passed, STORAGE_LIFECYCLE_POLICY decides which artifact types
+    are kept, moved to the archive bucket or deleted.
+    """
+
+    DELETE_BATCH_SIZE = 1000
+
+    @staticmethod
+    def get_artifact_prefixes(job: FileProcessingJob) -> dict:
+        base = f"processed/{job.owner.email}/{job.id}"
+        return {
+            enums.ArtifactType.MP4.value: f"{base}/mp4/",
+            enums.ArtifactType.HLS.value: f"{base}/hls/",
+            enums.ArtifactType.DASH.value: f"{base}/dash/",
+            enums.ArtifactType.THUMBNAILS.value: f"{base}/thumbnails/",
+        }
+
+    @staticmethod
+    def list_objects(storage_helper: StorageClient, bucket: str, prefix: str) -> dict:
+        """Sizes of the objects under a prefix, by key."""
+
+        paginator = storage_helper.s3_client.get_paginator("list_objects_v2")
+        return {
+            obj["Key"]: obj["Size"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        }
+
+    @staticmethod
+    def get_source_size(storage_helper: StorageClient, bucket: str, key: str) -> int:
+        try:
+            head = storage_helper.s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return 0
+            raise
+        return head.get("ContentLength", 0)
+
+    @staticmethod
+    def get_artifact_objects(
+        storage_helper: StorageClient, job: FileProcessingJob, bucket: str
+    ) -> dict:
+        """{artifact type: {key: size}} for a job's objects in one bucket."""
+
+        source_size = StorageLifecycleUtils.get_source_size(
+            storage_helper, bucket, job.source_key
+        )
+        objects = {
+            enums.ArtifactType.SOURCE.value: (
+                {job.source_key: source_size} if source_size else {}
+            )
+        }
+        for artifact, prefix in StorageLifecycleUtils.get_artifact_prefixes(
+            job
+        ).items():
+            objects[artifact] = StorageLifecycleUtils.list_objects(
+                storage_helper, bucket, prefix
+            )
+        return objects
+
+    @staticmethod
+    def measure_job(
+        job: FileProcessingJob, storage_helper: StorageClient = None
+    ) -> dict | None:
+        """
+        Count the job's bytes per artifact type and store them on the job.
+        Accounting never fails a job; storage errors are logged and skipped.
+        """
+        storage_helper = storage_helper or StorageClient()
+        try:
+            stored = StorageLifecycleUtils.get_artifact_objects(
+                storage_helper, job, settings.AWS_STORAGE_BUCKET_NAME
+            )
+            archived = (
+                StorageLifecycleUtils.get_artifact_objects(
+                    storage_helper, job, settings.STORAGE_ARCHIVE_BUCKET
+                )
+                if settings.STORAGE_ARCHIVE_BUCKET
+                else {}
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.warning(f"storage accounting failed for job {job.id}: {e}")
+            return None
+
+        stored_bytes = {a: sum(o.values()) for a, o in stored.items()}
+        archived_bytes = {a: sum(o.values()) for a, o in archived.items()}
+        storage = {
+            **(job.storage or {}),
+            "bytes": stored_bytes,
+            "archived": archived_bytes,
+            "total": sum(stored_bytes.values()),
+            "archived_total": sum(archived_bytes.values()),
+            "measured_at": timezone.now().isoformat(),
+        }
+        FileProcessingUtils.update_obj_fields(job, {"storage": storage})
+        return storage
+
+    @staticmethod
+    def is_playable(job: FileProcessingJob) -> bool:
+        return job.status == enums.JobStatus.COMPLETED.value and bool(
+            job.file.hls_master_key or job.file.dash_mpd_key
+        )
+
+    @staticmethod
+    def get_due_jobs(now=None):
+        """
+        Completed, playable jobs past the grace period that the lifecycle
+        policy has not been applied to yet.
+        """
+        now = now or timezone.now()
+        cutoff = now - timedelta(hours=settings.STORAGE_LIFECYCLE_GRACE_HOURS)
+        return (
+            FileProcessingJob.objects.filter(
+                status=enums.JobStatus.COMPLETED.value,
+                date_last_modified__lt=cutoff,
+                storage__lifecycle_applied_at__isnull=True,
+            )
+            .filter(
+                Q(file__hls_master_key__isnull=False)
+                | Q(file__dash_mpd_key__isnull=False)
+            )
+            .select_related("owner", "file")
+            .order_by("date_last_modified")[: settings.STORAGE_LIFECYCLE_BATCH_SIZE]
+        )
+
+    @staticmethod
+    def delete_objects(storage_helper: StorageClient, bucket: str, keys: list[str]):
+        for start in range(0, len(keys), StorageLifecycleUtils.DELETE_BATCH_SIZE):
+            batch = keys[start : start + StorageLifecycleUtils.DELETE_BATCH_SIZE]
+            storage_helper.s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+
+    @staticmethod
+    def archive_objects(storage_helper: StorageClient, keys: list[str]):
+        """
+        Move objects to the archive bucket under the same keys. The managed
+        copy switches to multipart for sources over the single-copy limit.
+        """
+        bucket = settings.AWS_STORAGE_BUCKET_NAME
+        for key in keys:
+            storage_helper.s3_client.copy(
+                {"Bucket": bucket, "Key": key}, settings.STORAGE_ARCHIVE_BUCKET, key
+            )
+        StorageLifecycleUtils.delete_objects(storage_helper, bucket, keys)
+
+    @staticmethod
+    def apply_policy(
+        job: FileProcessingJob, storage_helper: StorageClient = None
+    ) -> dict | None:
+        """
+        Apply STORAGE_LIFECYCLE_POLICY to a playable job, then re-measure it.
+        Archiving without an archive bucket configured keeps the objects.
+        Returns the action taken per artifact type, or None when the job is
+        not playable or a storage error stopped it; the error is recorded on
+        the job, which saving moves behind the grace period again.
+        """
+        if not StorageLifecycleUtils.is_playable(job):
+            return None
+
+        storage_helper = storage_helper or StorageClient()
+        bucket = settings.AWS_STORAGE_BUCKET_NAME
+        applied = {}
+        try:
+            objects = StorageLifecycleUtils.get_artifact_objects(
+                storage_helper, job, bucket
+            )
+            for artifact, action in settings.STORAGE_LIFECYCLE_POLICY.items():
+                keys = list(objects.get(artifact, {}))
+                if action == enums.LifecycleAction.ARCHIVE.value and (
+                    not settings.STORAGE_ARCHIVE_BUCKET
+                ):
+                    logger.warning("STORAGE_ARCHIVE_BUCKET not set; keeping artifacts")
+                    action = enums.LifecycleAction.KEEP.value
+                if keys and action == enums.LifecycleAction.DELETE.value:
+                    StorageLifecycleUtils.delete_objects(storage_helper, bucket, keys)
+                elif keys and action == enums.LifecycleAction.ARCHIVE.value:
+                    StorageLifecycleUtils.archive_objects(storage_helper, keys)
+                applied[artifact] = action
+        except (BotoCoreError, ClientError) as e:
+            logger.warning(f"storage lifecycle failed for job {job.id}: {e}")
+            storage = {
+                **(job.storage or {}),
+                "lifecycle_error": str(e),
+                "lifecycle_failed_at": timezone.now().isoformat(),
+            }
+            FileProcessingUtils.update_obj_fields(job, {"storage": storage})
+            return None
+
+        job.storage = {
+            **(job.storage or {}),
+            "lifecycle": applied,
+            "lifecycle_applied_at": timezone.now().isoformat(),
+        }
+        StorageLifecycleUtils.measure_job(job, storage_helper)
+        FileProcessingUtils.update_obj_fields(job, {"storage": job.storage})
+        logger.info(f"storage lifecycle applied to job {job.id}: {applied}")
+        return applied
+
+    @staticmethod
+    def get_creator_report(user):
+        """
+        Stored bytes per creator and artifact type, summed over their jobs'
+        last measurements. Staff see every creator, others only themselves.
+        """
+        queryset = FileProcessingJob.objects.all()
+        if not user.is_staff:
+            queryset = queryset.filter(owner=user)
+
+        def total(path):
+            return Coalesce(Sum(Cast(KT(path), BigIntegerField())), 0)
+
+        annotations = {
+            f"{artifact}_bytes": total(f"storage__bytes__{artifact}")
+            for artifact in enums.ArtifactType.values()
+        }
+        return (
+            queryset.values("owner_id", "owner__email")
+            .annotate(
+                jobs=Count("id"),
+                stored_bytes=total("storage__total"),
+                archived_bytes=total("storage__archived_total"),
+                **annotations,
+            )
+            .order_by("-stored_bytes", "owner_id")
+        )
+
+    @staticmethod
+    def get_monthly_cost(stored_bytes: int, archived_bytes: int) -> float:
+        gigabyte = 1024**3
+        return round(
+            stored_bytes / gigabyte * settings.STORAGE_GB_MONTH_COST
+            + archived_bytes / gigabyte * settings.STORAGE_ARCHIVE_GB_MONTH_COST,
+            4,
+        )
@@ -0,0 +1,312 @@
+import json
+import math
+import os
+from fractions import Fraction
+
+from django.conf import settings
+
+from loguru import logger
+
+from core.utils import exceptions
+
+from .base import StorageUtils
+
+
+class HLSManifestUtils:
+    """
+    Builds HLS playlists from packaged output. Variant bandwidth is measured
+    from the segments ffmpeg produced rather than taken from the nominal
+    encoder bitrate, codecs come from ffprobe, and each variant gets an
+    I-frame playlist addressing its keyframes by byte range for fast seeking.
+    """
+
+    H264_PROFILES = {
+        "Constrained Baseline": "42E0",
+        "Baseline": "4200",
+        "Main": "4D40",
+        "High": "6400",
+    }
+    AAC_PROFILES = {"LC": "mp4a.40.2", "HE-AAC": "mp4a.40.5", "HE-AACv2": "mp4a.40.29"}
+
+    @staticmethod
+    def parse_media_playlist(playlist_path: str) -> list[dict]:
+        """
+        Segments of a media playlist as {duration, uri, offset, length}. The
+        byte range is only set for single-file output, where every segment
+        is an EXT-X-BYTERANGE into the same media file.
+        """
+        segments, segment, next_offset = [], {}, {}
+        with open(playlist_path, encoding="utf-8") as playlist:
+            for line in playlist:
+                line = line.strip()
+                if line.startswith("#EXTINF:"):
+                    segment["duration"] = float(line[len("#EXTINF:") :].split(",")[0])
+                elif line.startswith("#EXT-X-BYTERANGE:"):
+                    length, _, offset = line[len("#EXT-X-BYTERANGE:") :].partition("@")
+                    segment["length"] = int(length)
+                    segment["offset"] = int(offset) if offset else None
+                elif line and not line.startswith("#") and "duration" in segment:
+                    if "length" in segment:
+                        if segment["offset"] is None:
+                            segment["offset"] = next_offset.get(line, 0)
+                        next_offset[line] = segment["offset"] + segment["length"]
+                    segments.append(
+                        {"offset": None, "length": None, **segment, "uri": line}
+                    )
+                    segment = {}
+        return segments
+
+    @staticmethod
+    def get_segment_size(variant_dir: str, segment: dict) -> int:
+        if segment["length"] is not None:
+            return segment["length"]
+        return os.path.getsize(os.path.join(variant_dir, segment["uri"]))
+
+    @staticmethod
+    def measure_bandwidth(playlist_path: str) -> dict | None:
+        """
+        Peak segment bit rate and average bit rate over the whole variant, in
+        bits per second, as BANDWIDTH and AVERAGE-BANDWIDTH expect.
+        """
+        variant_dir = os.path.dirname(playlist_path)
+        sized = [
+            (
+                segment["duration"],
+                HLSManifestUtils.get_segment_size(variant_dir, segment),
+            )
+            for segment in HLSManifestUtils.parse_media_playlist(playlist_path)
+            if segment["duration"] > 0
+        ]
+        if not sized:
+            return None
+        total_seconds = sum(duration for duration, _ in sized)
+        return {
+            "peak": math.ceil(max(size * 8 / duration for duration, size in sized)),
+            "average": math.ceil(sum(size for _, size in sized) * 8 / total_seconds),
+        }
+
+    @staticmethod
+    def get_codecs(streams: list[dict]) -> str | None:
+        """
+        RFC 6381 CODECS value for an H.264/AAC rendition from ffprobe streams.
+        """
+        codecs = []
+        for stream in streams:
+            if stream.get("codec_name") == "h264":
+                profile = HLSManifestUtils.H264_PROFILES.get(stream.get("profile"))
+                level = stream.get("level")
+                if not profile or not isinstance(level, int) or level <= 0:
+                    return None
+                codecs.append(f"avc1.{profile}{level:02X}")
+            elif stream.get("codec_name") == "aac":
+                codecs.append(
+                    HLSManifestUtils.AAC_PROFILES.get(
+                        stream.get("profile"), "mp4a.40.2"
+                    )
+                )
+        return ",".join(codecs) or None
+
+    @staticmethod
+    def get_frame_rate(streams: list[dict]) -> str | None:
+        for stream in streams:
+            if stream.get("codec_type") == "video" and stream.get("avg_frame_rate"):
+                try:
+                    rate = Fraction(stream["avg_frame_rate"])
+                except (ValueError, ZeroDivisionError):
+                    return None
+                return f"{float(rate):.3f}" if rate > 0 else None
+        return None
+
+    @staticmethod
+    def probe_video_packets(segment_path: str, **kwargs) -> list[dict]:
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,pos,flags",
+            "-of",
+            "json",
+            segment_path,
+        ]
+        packets = json.loads(StorageUtils.run_cmd(cmd, **kwargs) or "{}")
+        return [
+            {
+                "time": float(packet["pts_time"]),
+                "pos": int(packet["pos"]),
+                "keyframe": "K" in packet.get("flags", ""),
+            }
+            for packet in packets.get("packets", [])
+            if packet.get("pts_time") not in (None, "N/A")
+            and packet.get("pos") not in (None, "N/A")
+        ]
+
+    @staticmethod
+    def build_iframe_playlist(playlist_path: str, **kwargs) -> dict | None:
+        """
+        Write <variant>_iframes.m3u8 next to a media playlist. Each keyframe
+        is addressed as the byte range from its first packet to the next video
+        packet in its media file and lasts until the next keyframe. The
+        PAT/PMT ahead of the first video packet of each media file is its
+        EXT-X-MAP, since a range starting mid-file carries no tables of its
+        own. Returns the playlist file name and its peak and average bandwidth.
+        """
+        variant_dir = os.path.dirname(playlist_path)
+        media = {}
+        for segment in HLSManifestUtils.parse_media_playlist(playlist_path):
+            entry = media.setdefault(segment["uri"], {"duration": 0.0, "end": 0})
+            entry["duration"] += segment["duration"]
+            if segment["length"] is not None:
+                entry["end"] = max(entry["end"], segment["offset"] + segment["length"])
+
+        # probe each media file once; in single-file mode that is the whole
+        # rendition, otherwise one segment at a time
+        frames, end_time, headers = [], None, {}
+        for uri, entry in media.items():
+            media_path = os.path.join(variant_dir, uri)
+            packets = HLSManifestUtils.probe_video_packets(media_path, **kwargs)
+            if not packets:
+                continue
+            end_time = min(p["time"] for p in packets) + entry["duration"]
+            size = entry["end"] or os.path.getsize(media_path)
+            by_pos = sorted(packets, key=lambda p: p["pos"])
+            headers[uri] = by_pos[0]["pos"]
+            for index, packet in enumerate(by_pos):
+                if packet["keyframe"]:
+                    following = (
+                        by_pos[index + 1]["pos"] if index + 1 < len(by_pos) else size
+                    )
+                    frames.append(
+                        {
+                            "uri": uri,
+                            "time": packet["time"],
+                            "offset": packet["pos"],
+                            "length": following - packet["pos"],
+                        }
+                    )
+        if not frames:
+            return None
+
+        frames.sort(key=lambda frame: frame["time"])
+        for frame, following in zip(frames, frames[1:] + [None]):
+            frame["duration"] = (following["time"] if following else end_time) - frame[
+                "time"
+            ]
+        frames = [frame for frame in frames if frame["duration"] > 0]
+        if not frames:
+            return None
+
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:5",
+            f"#EXT-X-TARGETDURATION:{math.ceil(max(f['duration'] for f in frames))}",
+            "#EXT-X-PLAYLIST-TYPE:VOD",
+            "#EXT-X-I-FRAMES-ONLY",
+        ]
+        mapped = None
+        for frame in frames:
+            # a map applies until the next one, so only emit it on a new file
+            if frame["uri"] != mapped and headers[frame["uri"]]:
+                lines.append(
+                    f'#EXT-X-MAP:URI="{frame["uri"]}",'
+                    f'BYTERANGE="{headers[frame["uri"]]}@0"'
+                )
+                mapped = frame["uri"]
+            lines += [
+                f"#EXTINF:{frame['duration']:.6f},",
+                f"#EXT-X-BYTERANGE:{frame['length']}@{frame['offset']}",
+                frame["uri"],
+            ]
+        lines.append("#EXT-X-ENDLIST")
+
+        name = os.path.splitext(os.path.basename(playlist_path))[0]
+        file_name = f"{name}_iframes.m3u8"
+        with open(os.path.join(variant_dir, file_name), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        total_seconds = sum(frame["duration"] for frame in frames)
+        return {
+            "playlist": file_name,
+            "bandwidth": math.ceil(
+                max(frame["length"] * 8 / frame["duration"] for frame in frames)
+            ),
+            "average_bandwidth": math.ceil(
+                sum(frame["length"] for frame in frames) * 8 / total_seconds
+            ),
+        }
+
+    @staticmethod
+    def describe_variant(
+        playlist_path: str, streams: list[dict], nominal_bandwidth: int
+    ) -> dict:
+        """
+        Master playlist attributes for one packaged variant. Falls back to the
+        nominal encoder bitrate when the segments cannot be measured; a
+        variant without an I-frame playlist is still playable, so probe
+        failures there are only logged.
+        """
+        measured = HLSManifestUtils.measure_bandwidth(playlist_path)
+        try:
+            iframe = HLSManifestUtils.build_iframe_playlist(playlist_path)
+        except exceptions.CustomException:
+            logger.warning(f"skipping I-frame playlist for {playlist_path}")
+            iframe = None
+        return {
+            "bandwidth": measured["peak"] if measured else nominal_bandwidth,
+            "average_bandwidth": measured["average"] if measured else None,
+            "codecs": HLSManifestUtils.get_codecs(streams),
+            "frame_rate": HLSManifestUtils.get_frame_rate(streams),
+            "iframe": iframe,
+        }
+
+    @staticmethod
+    def order_variants(variant_infos: list[dict]) -> list[dict]:
+        """
+        Ascending bandwidth, except that the variant players should start on
+        is listed first: the richest one whose average bandwidth fits within
+        HLS_START_BANDWIDTH, or the smallest if none does.
+        """
+        ordered = sorted(variant_infos, key=lambda vi: vi["bandwidth"])
+        fitting = [
+            vi
+            for vi in ordered
+            if (vi.get("average_bandwidth") or vi["bandwidth"])
+            <= settings.HLS_START_BANDWIDTH
+        ]
+        start = fitting[-1] if fitting else ordered[0]
+        return [start] + [vi for vi in ordered if vi is not start]
+
+    @staticmethod
+    def build_master_playlist(variant_infos: list[dict]) -> str:
+        lines = ["#EXTM3U", "#EXT-X-VERSION:4", "#EXT-X-INDEPENDENT-SEGMENTS"]
+        ordered = HLSManifestUtils.order_variants(variant_infos)
+        for vi in ordered:
+            attributes = [f"BANDWIDTH={vi['bandwidth']}"]
+            if vi.get("average_bandwidth"):
+                attributes.append(f"AVERAGE-BANDWIDTH={vi['average_bandwidth']}")
+            if vi.get("codecs"):
+                attributes.append(f'CODECS="{vi["codecs"]}"')
+            attributes.append(f"RESOLUTION={vi['resolution']}")
+            if vi.get("frame_rate"):
+                attributes.append(f"FRAME-RATE={vi['frame_rate']}")
+            lines.append(f"#EXT-X-STREAM-INF:{','.join(attributes)}")
+            lines.append("/".join(vi["playlist"].split("/")[-2:]))
+
+        for vi in ordered:
+            iframe = vi.get("iframe")
+            if not iframe:
+                continue
+            attributes = [
+                f"BANDWIDTH={iframe['bandwidth']}",
+                f"AVERAGE-BANDWIDTH={iframe['average_bandwidth']}",
+            ]
+            if vi.get("codecs"):
+                video_codec = vi["codecs"].split(",")[0]
+                attributes.append(f'CODECS="{video_codec}"')
+            attributes.append(f"RESOLUTION={vi['resolution']}")
+            uri = "/".join(iframe["playlist"].split("/")[-2:])
+            attributes.append(f'URI="{uri}"')
+            lines.append(f"#EXT-X-I-FRAME-STREAM-INF:{','.join(attributes)}")
+        return "\n".join(lines) + "\n"
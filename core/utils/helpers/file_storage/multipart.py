@@ -0,0 +1,335 @@
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+
+from botocore.exceptions import ClientError
+from loguru import logger
+from rest_framework import status
+
+from core.utils import exceptions
+
+from .admission import UploadAdmissionUtils
+from .base import StorageClient
+from .upload import FileUploadUtils
+
+
+class MultipartUploadUtils:
+    """
+    Utility class for resumable multipart uploads straight to S3. The upload
+    id and part layout live on the pending upload entry, so a completed
+    multipart upload is registered through CreateFileObject like a single PUT.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    MAX_PARTS = 10_000
+    CLIENT_ERROR_CODES = ["InvalidPart", "InvalidPartOrder", "EntityTooSmall"]
+
+    @staticmethod
+    def _pending_upload_key(file_id) -> str:
+        return f"pending_upload-{file_id}"
+
+    @staticmethod
+    def get_part_size(file_size: int) -> int:
+        """
+        Configured part size, grown in whole MiB when the file would otherwise
+        need more parts than S3 allows.
+        """
+        mib = 1024 * 1024
+        part_size = max(
+            settings.MULTIPART_UPLOAD_PART_SIZE,
+            MultipartUploadUtils.MIN_PART_SIZE,
+            math.ceil(file_size / MultipartUploadUtils.MAX_PARTS),
+        )
+        return math.ceil(part_size / mib) * mib
+
+    @staticmethod
+    def get_pending_upload(owner, file_id) -> dict:
+        """
+        Return the owner's in-progress multipart upload for this file id.
+        """
+        pending = cache.get(MultipartUploadUtils._pending_upload_key(file_id))
+        if not pending:
+            raise exceptions.CustomException(
+                message="Expired or Invalid file id!",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        if pending["owner"] != owner.id:
+            raise exceptions.CustomException(
+                message="Permssion Denied", status_code=status.HTTP_403_FORBIDDEN
+            )
+        if not pending.get("upload_id"):
+            raise exceptions.CustomException(
+                message="No multipart upload in progress for this file",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        return pending
+
+    @staticmethod
+    def _raise_storage_error(action: str, error: Exception):
+        logger.error(f"multipart {action} failed: {error}")
+        if (
+            isinstance(error, ClientError)
+            and error.response.get("Error", {}).get("Code")
+            in MultipartUploadUtils.CLIENT_ERROR_CODES
+        ):
+            raise exceptions.CustomException(
+                message=error.response["Error"].get("Message") or f"{action} failed",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        raise exceptions.CustomException(
+            message=f"multipart {action} failed",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    @staticmethod
+    def initiate(
+        owner,
+        file_name: str,
+        purpose: str,
+        file_size: int,
+        checksum_algorithm: str = None,
+        packaging_mode: str = None,
+    ) -> dict:
+        """
+        Start a multipart upload and record its id and part layout on the
+        pending upload entry. With a checksum algorithm every part must carry
+        its own checksum, which S3 verifies on upload.
+        """
+        assert (
+            settings.USING_MANAGED_STORAGE
+        ), "Cannot invoke this function when not using managed storage"
+
+        file_metadata = FileUploadUtils.get_file_key(
+            owner,
+            file_name,
+            purpose,
+            file_size=file_size,
+            expires_in=settings.MULTIPART_UPLOAD_TTL,
+            packaging_mode=packaging_mode,
+        )
+        storage_helper = StorageClient()
+        try:
+            upload = storage_helper.s3_client.create_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=file_metadata["file_key"],
+                ContentType=storage_helper.get_mime_type(file_name),
+                **(
+                    {"ChecksumAlgorithm": checksum_algorithm}
+                    if checksum_algorithm
+                    else {}
+                ),
+            )
+        except Exception as e:
+            cache.delete(
+                MultipartUploadUtils._pending_upload_key(file_metadata["file_id"])
+            )
+            UploadAdmissionUtils.release(owner.id, file_metadata["file_id"])
+            MultipartUploadUtils._raise_storage_error("initiate", e)
+
+        part_size = MultipartUploadUtils.get_part_size(file_size)
+        data = {
+            "file_id": file_metadata["file_id"],
+            "upload_id": upload["UploadId"],
+            "part_size": part_size,
+            "part_count": math.ceil(file_size / part_size),
+            "checksum_algorithm": checksum_algorithm,
+        }
+        cache.set(
+            MultipartUploadUtils._pending_upload_key(file_metadata["file_id"]),
+            {
+                "file_key": file_metadata["file_key"],
+                "owner": owner.id,
+                "file_size": file_size,
+                "purpose": purpose,
+                "file_name": file_name,
+                "upload_id": data["upload_id"],
+                "part_size": part_size,
+                "part_count": data["part_count"],
+                "checksum_algorithm": checksum_algorithm,
+                "packaging_mode": packaging_mode,
+            },
+            timeout=settings.MULTIPART_UPLOAD_TTL,
+        )
+        logger.info(
+            f"multipart upload {data['upload_id']} initiated for {file_metadata['file_key']}"
+        )
+        return data
+
+    @staticmethod
+    def _get_part_checksum(pending: dict, checksum: str = None) -> dict | None:
+        return FileUploadUtils.build_checksum(
+            pending.get("checksum_algorithm"), checksum
+        )
+
+    @staticmethod
+    def get_part_length(pending: dict, part_number: int) -> int:
+        """Exact size of a part; every part but the last is part_size."""
+        if part_number < pending["part_count"]:
+            return pending["part_size"]
+        return pending["file_size"] - pending["part_size"] * (pending["part_count"] - 1)
+
+    @staticmethod
+    def presign_parts(
+        pending: dict,
+        part_numbers: list[int],
+        checksums: dict = None,
+        expires_in=settings.PRESIGNED_UPLOAD_TTL,
+    ) -> list[dict]:
+        """
+        Presign upload_part URLs for a batch of part numbers with one client.
+        checksums maps part numbers to the client's checksum of each part and
+        is required when the upload was initiated with a checksum algorithm.
+        """
+        part_numbers = sorted(set(part_numbers))
+        invalid = [n for n in part_numbers if n > pending["part_count"]]
+        if invalid:
+            raise exceptions.CustomException(
+                message=f"part numbers out of range: {invalid}",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        checksums = {int(n): value for n, value in (checksums or {}).items()}
+        if pending.get("checksum_algorithm"):
+            missing = [n for n in part_numbers if not checksums.get(n)]
+            if missing:
+                raise exceptions.CustomException(
+                    message=f"checksums required for parts: {missing}",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+
+        # part sizes are signed in, as for single uploads, so the assembled
+        # object is exactly the admitted size
+        storage_helper = StorageClient(config=FileUploadUtils.SIGNING_CONFIG)
+        presigned = []
+        try:
+            for part_number in part_numbers:
+                checksum = MultipartUploadUtils._get_part_checksum(
+                    pending, checksums.get(part_number)
+                )
+                length = MultipartUploadUtils.get_part_length(pending, part_number)
+                url = storage_helper.s3_client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+                        "Key": pending["file_key"],
+                        "UploadId": pending["upload_id"],
+                        "PartNumber": part_number,
+                        "ContentLength": length,
+                        **FileUploadUtils.get_checksum_params(checksum),
+                    },
+                    ExpiresIn=expires_in,
+                )
+                presigned.append(
+                    {
+                        "part_number": part_number,
+                        "url": url,
+                        "headers": {
+                            "Content-Length": str(length),
+                            **FileUploadUtils.get_checksum_headers(checksum),
+                        },
+                    }
+                )
+            return presigned
+        except Exception as e:
+            MultipartUploadUtils._raise_storage_error("presign", e)
+
+    @staticmethod
+    def list_parts(pending: dict) -> list[dict]:
+        """
+        Parts S3 has received so far, so a client can resume where it stopped.
+        """
+        storage_helper = StorageClient()
+        params = {
+            "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+            "Key": pending["file_key"],
+            "UploadId": pending["upload_id"],
+        }
+        checksum_field = FileUploadUtils.CHECKSUM_FIELDS.get(
+            pending.get("checksum_algorithm")
+        )
+        parts = []
+        try:
+            while True:
+                page = storage_helper.s3_client.list_parts(**params)
+                parts += [
+                    {
+                        "part_number": part["PartNumber"],
+                        "etag": part["ETag"],
+                        "size": part["Size"],
+                        "checksum": part.get(checksum_field),
+                    }
+                    for part in page.get("Parts", [])
+                ]
+                if not page.get("IsTruncated"):
+                    return parts
+                params["PartNumberMarker"] = page["NextPartNumberMarker"]
+        except Exception as e:
+            MultipartUploadUtils._raise_storage_error("list parts", e)
+
+    @staticmethod
+    def complete(file_id, pending: dict, parts: list[dict] = None) -> None:
+        """
+        Assemble the uploaded parts. Without an explicit part list the parts
+        S3 holds are used. The pending entry, if not yet ingested, stays ready
+        for CreateFileObject.
+        """
+        parts = parts or MultipartUploadUtils.list_parts(pending)
+        if not parts:
+            raise exceptions.CustomException(
+                message="No parts have been uploaded",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        storage_helper = StorageClient()
+        try:
+            storage_helper.s3_client.complete_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=pending["file_key"],
+                UploadId=pending["upload_id"],
+                MultipartUpload={
+                    "Parts": [
+                        {
+                            "PartNumber": part["part_number"],
+                            "ETag": part["etag"],
+                            **FileUploadUtils.get_checksum_params(
+                                MultipartUploadUtils._get_part_checksum(
+                                    pending, part.get("checksum")
+                                )
+                            ),
+                        }
+                        for part in sorted(parts, key=lambda p: p["part_number"])
+                    ]
+                },
+            )
+        except Exception as e:
+            MultipartUploadUtils._raise_storage_error("complete", e)
+
+        # the storage event for the assembled object may already have been
+        # ingested and the pending entry consumed; never bring it back
+        cache.set(
+            MultipartUploadUtils._pending_upload_key(file_id),
+            {**pending, "upload_id": None},
+            timeout=settings.MULTIPART_UPLOAD_TTL,
+            xx=True,
+        )
+        logger.info(f"multipart upload {pending['upload_id']} completed")
+
+    @staticmethod
+    def abort(file_id, pending: dict) -> None:
+        """
+        Abort the upload, discarding stored parts and the quota reservation.
+        """
+        storage_helper = StorageClient()
+        try:
+            storage_helper.s3_client.abort_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=pending["file_key"],
+                UploadId=pending["upload_id"],
+            )
+        except Exception as e:
+            MultipartUploadUtils._raise_storage_error("abort", e)
+
+        cache.delete(MultipartUploadUtils._pending_upload_key(file_id))
+        UploadAdmissionUtils.release(pending["owner"], file_id)
+        logger.info(f"multipart upload {pending['upload_id']} aborted")
@@ -11,6 +11,7 @@ from rest_framework import status
 from core.utils import exceptions
 
 from .base import StorageClient, StorageUtils
+from .manifests import HLSManifestUtils
 
 
 class FileProcessingUtils:
@@ -133,15 +134,7 @@ class FileProcessingUtils:
         """
         Create and upload the HLS master playlist to S3
         """
-        master_lines = ["#EXTM3U"]
-        for vi in sorted(variant_infos, key=lambda x: x["bandwidth"]):
-            master_lines.append(
-                f'#EXT-X-STREAM-INF:BANDWIDTH={vi["bandwidth"]},RESOLUTION={vi["resolution"]}'
-            )
-            master_lines.append(
-                vi["playlist"].split("/")[-2] + "/" + vi["playlist"].split("/")[-1]
-            )
-        master_content = "\n".join(master_lines) + "\n"
+        master_content = HLSManifestUtils.build_master_playlist(variant_infos)
 
         master_local = os.path.join(workdir, "master.m3u8")
         with open(master_local, "w", encoding="utf-8") as f:
@@ -1,34 +1,225 @@
+import re
+import time
+
 from django.conf import settings
 from django.core.cache import cache
 
+from botocore.config import Config
 from loguru import logger
 from rest_framework import status
 
-from core.utils import exceptions
+from core.utils import enums, exceptions
 from core.utils.commons.utils import identifiers
+from core.utils.helpers.redis import RedisTools
 
+from .admission import UploadAdmissionUtils
 from .base import StorageClient
 
 
 class FileUploadUtils:
     """Utility class for handling file uploads to S3."""
 
+    # S3 request/response fields carrying each checksum algorithm
+    CHECKSUM_FIELDS = {
+        enums.ChecksumAlgorithm.SHA256.value: "ChecksumSHA256",
+        enums.ChecksumAlgorithm.CRC32C.value: "ChecksumCRC32C",
+    }
+    # signature v4 signs the Content-Length of a presigned PUT, so the object
+    # store rejects an upload of any size other than the one admitted
+    SIGNING_CONFIG = Config(signature_version="s3v4")
+    # sorted set of presigned upload keys scored by when they were presigned;
+    # the stranded upload sweep walks it instead of listing the bucket
+    PENDING_UPLOADS_KEY = "pending_uploads"
+    # a multipart upload completed with a checksum algorithm reports a
+    # checksum of its part checksums, "<base64>-<part count>"; it depends on
+    # the part size, so it is neither comparable nor usable as a dedup key
+    COMPOSITE_CHECKSUM_RE = re.compile(r"-\d+$")
+
+    @staticmethod
+    def build_checksum(algorithm: str = None, value: str = None) -> dict | None:
+        if not (algorithm and value):
+            return None
+        return {"algorithm": algorithm, "value": value}
+
+    @staticmethod
+    def get_checksum_params(checksum: dict = None) -> dict:
+        """
+        S3 parameters binding a client checksum into a presigned request, so
+        the object store rejects an upload whose content does not match.
+        """
+        if not checksum:
+            return {}
+        return {
+            FileUploadUtils.CHECKSUM_FIELDS[checksum["algorithm"]]: checksum["value"]
+        }
+
+    @staticmethod
+    def get_checksum_headers(checksum: dict = None) -> dict:
+        """Checksum header the client must send with a presigned upload."""
+        if not checksum:
+            return {}
+        return {f"x-amz-checksum-{checksum['algorithm'].lower()}": checksum["value"]}
+
+    @staticmethod
+    def get_upload_headers(
+        file_name: str, checksum: dict = None, file_size: int = None
+    ) -> dict:
+        """Headers the client must send with a presigned PUT."""
+        headers = {"Content-Type": StorageClient.get_mime_type(file_name)}
+        if file_size:
+            headers["Content-Length"] = str(file_size)
+        return {**headers, **FileUploadUtils.get_checksum_headers(checksum)}
+
+    @staticmethod
+    def head_upload(file_key: str, storage_helper: StorageClient = None) -> dict:
+        """
+        Object store metadata of an upload, including its checksum and size.
+        Empty when storage is not managed or the lookup fails.
+        """
+        if not settings.USING_MANAGED_STORAGE:
+            return {}
+        storage_helper = storage_helper or StorageClient()
+        try:
+            return storage_helper.s3_client.head_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=file_key,
+                ChecksumMode="ENABLED",
+            )
+        except Exception as e:
+            logger.warning(f"metadata lookup failed for {file_key}: {e}")
+            return {}
+
+    @staticmethod
+    def get_provider_checksum(
+        file_key: str, storage_helper: StorageClient = None, head: dict = None
+    ) -> dict | None:
+        """
+        Checksum the object store holds for an uploaded object. It is read from
+        the object's metadata, so the object itself is never downloaded.
+        """
+        if head is None:
+            head = FileUploadUtils.head_upload(file_key, storage_helper)
+        for algorithm, field in FileUploadUtils.CHECKSUM_FIELDS.items():
+            if head.get(field):
+                return {"algorithm": algorithm, "value": head[field]}
+        return None
+
+    @staticmethod
+    def inspect_upload(
+        file_key: str, declared: dict = None, storage_helper: StorageClient = None
+    ) -> dict:
+        """
+        Checksum and size of an upload as the object store reports them, from
+        a single HEAD request. The checksum is "<algorithm>:<base64>", usable
+        as a dedup key; raises if it disagrees with the checksum the client
+        declared. Composite multipart checksums are not returned or compared.
+        """
+        head = FileUploadUtils.head_upload(file_key, storage_helper)
+        provider = FileUploadUtils.get_provider_checksum(file_key, head=head)
+        if provider and (
+            head.get("ChecksumType") == "COMPOSITE"
+            or FileUploadUtils.COMPOSITE_CHECKSUM_RE.search(provider["value"])
+        ):
+            provider = None
+        if (
+            provider
+            and declared
+            and declared["algorithm"] == provider["algorithm"]
+            and declared["value"] != provider["value"]
+        ):
+            logger.error(f"checksum mismatch for uploaded file {file_key}")
+            raise exceptions.CustomException(
+                message="Uploaded file does not match the declared checksum",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        return {
+            "checksum": (
+                f"{provider['algorithm'].lower()}:{provider['value']}"
+                if provider
+                else None
+            ),
+            "file_size": head.get("ContentLength"),
+        }
+
+    @staticmethod
+    def track_uploads(*file_keys: str) -> None:
+        RedisTools.get_connection().zadd(
+            FileUploadUtils.PENDING_UPLOADS_KEY,
+            {file_key: time.time() for file_key in file_keys},
+        )
+
     @staticmethod
     def save_file_metadata_in_memory(
-        owner, file_id, file_key: str, expires_in=settings.PRESIGNED_UPLOAD_TTL
+        owner,
+        file_id,
+        file_key: str,
+        file_size: int = None,
+        expires_in=settings.PRESIGNED_UPLOAD_TTL,
+        purpose: str = None,
+        file_name: str = None,
+        checksum: dict = None,
+        packaging_mode: str = None,
     ) -> str:
         """
         Store file metadata in cache for a limited time. This is useful for tracking file uploads.
+        The upload is also reserved against the owner's admission quota until it is registered.
         """
 
         cache_key = f"pending_upload-{file_id}"
-        cache_value = {"file_key": file_key, "owner": owner.id}
+        cache_value = {
+            "file_key": file_key,
+            "owner": owner.id,
+            "file_size": file_size,
+            "purpose": purpose,
+            "file_name": file_name,
+            "checksum": checksum,
+            "packaging_mode": packaging_mode,
+        }
         cache.set(cache_key, cache_value, timeout=expires_in)
+        UploadAdmissionUtils.reserve(owner, file_id, file_size, expires_in=expires_in)
+        FileUploadUtils.track_uploads(file_key)
         return cache_key
 
     @staticmethod
-    def get_file_key(owner, file_name: str, purpose: str) -> dict:
-        """Generate a unique file key for S3 storage."""
+    def save_files_metadata_in_memory(
+        owner, files: list[dict], expires_in=settings.PRESIGNED_UPLOAD_TTL
+    ) -> None:
+        """
+        Batch form of save_file_metadata_in_memory. Pending uploads are written
+        with one pipelined set_many and reserved with a single hash write.
+        """
+
+        cache.set_many(
+            {
+                f"pending_upload-{f['file_id']}": {
+                    "file_key": f["file_key"],
+                    "owner": owner.id,
+                    "file_size": f.get("file_size"),
+                    "purpose": f.get("purpose"),
+                    "file_name": f.get("file_name"),
+                    "checksum": f.get("checksum"),
+                    "packaging_mode": f.get("packaging_mode"),
+                }
+                for f in files
+            },
+            timeout=expires_in,
+        )
+        UploadAdmissionUtils.reserve_many(
+            owner,
+            {f["file_id"]: f.get("file_size") for f in files},
+            expires_in=expires_in,
+        )
+        FileUploadUtils.track_uploads(*[f["file_key"] for f in files])
+
+    @staticmethod
+    def get_packaging_mode(pending: dict) -> str:
+        """Packaging mode requested for a pending upload, or the default."""
+
+        return (pending or {}).get("packaging_mode") or settings.PACKAGING_DEFAULT_MODE
+
+    @staticmethod
+    def build_file_key(owner, file_name: str, purpose: str) -> dict:
+        """Generate a unique file id and S3 key without recording the upload."""
 
         owner_email = owner.email.lower()
         file_id = identifiers.ObjectIdentifiers.unique_id()
@@ -43,26 +234,86 @@ class FileUploadUtils:
             extension = ""
 
         file_key = f"uploads/{owner_email}/{purpose}/{file_id}{extension}"
-        FileUploadUtils.save_file_metadata_in_memory(owner, file_id, file_key)
         logger.info(f"file key generated for filr {file_name}: {file_key}")
-        data = {"file_id": file_id, "file_key": file_key}
+        return {"file_id": file_id, "file_key": file_key}
+
+    @staticmethod
+    def get_file_key(
+        owner,
+        file_name: str,
+        purpose: str,
+        file_size: int = None,
+        expires_in=settings.PRESIGNED_UPLOAD_TTL,
+        checksum: dict = None,
+        packaging_mode: str = None,
+    ) -> dict:
+        """Generate a unique file key for S3 storage."""
+
+        data = FileUploadUtils.build_file_key(owner, file_name, purpose)
+        FileUploadUtils.save_file_metadata_in_memory(
+            owner,
+            data["file_id"],
+            data["file_key"],
+            file_size=file_size,
+            expires_in=expires_in,
+            purpose=purpose,
+            file_name=file_name,
+            checksum=checksum,
+            packaging_mode=packaging_mode,
+        )
+        return data
+
+    @staticmethod
+    def get_file_keys(
+        owner, files: list[dict], expires_in=settings.PRESIGNED_UPLOAD_TTL
+    ) -> list[dict]:
+        """
+        Generate file keys for several uploads and record them in one batch.
+        Each entry in files has file_name, purpose and file_size.
+        """
+
+        data = [
+            {
+                **FileUploadUtils.build_file_key(owner, f["file_name"], f["purpose"]),
+                "file_name": f["file_name"],
+                "purpose": f["purpose"],
+                "file_size": f.get("file_size"),
+                "checksum": FileUploadUtils.build_checksum(
+                    f.get("checksum_algorithm"), f.get("checksum")
+                ),
+                "packaging_mode": f.get("packaging_mode"),
+            }
+            for f in files
+        ]
+        FileUploadUtils.save_files_metadata_in_memory(owner, data, expires_in)
         return data
 
     @staticmethod
     def generate_presigned_upload_url(
-        file_key: str, file_name: str, expires_in=settings.PRESIGNED_UPLOAD_TTL
+        file_key: str,
+        file_name: str,
+        expires_in=settings.PRESIGNED_UPLOAD_TTL,
+        storage_helper: StorageClient = None,
+        checksum: dict = None,
+        file_size: int = None,
     ):
         """
         Generate a pre-signed URL for uploading to S3.
         file_key: the S3 key (path inside bucket)
         expires_in: link validity in seconds
+        storage_helper: existing client to sign with, to avoid building a new one
+        checksum: client checksum ({"algorithm", "value"}) the upload must match
+        file_size: exact size in bytes the upload must have
         """
 
         assert (
             settings.USING_MANAGED_STORAGE
         ), "Cannot invoke this function when not using managed storage"
         try:
-            storage_helper = StorageClient()
+            storage_helper = storage_helper or StorageClient(
+                config=FileUploadUtils.SIGNING_CONFIG
+            )
+            size_params = {"ContentLength": file_size} if file_size else {}
 
             presigned_url = storage_helper.s3_client.generate_presigned_url(
                 "put_object",
@@ -70,6 +321,8 @@ class FileUploadUtils:
                     "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
                     "Key": file_key,
                     "ContentType": storage_helper.get_mime_type(file_name),
+                    **FileUploadUtils.get_checksum_params(checksum),
+                    **size_params,
                 },
                 ExpiresIn=expires_in,
             )
@@ -82,3 +335,25 @@ class FileUploadUtils:
 
         logger.info(f"presigned url generated successfully for {file_key}")
         return presigned_url
+
+    @staticmethod
+    def generate_presigned_upload_urls(
+        files: list[dict], expires_in=settings.PRESIGNED_UPLOAD_TTL
+    ) -> list[str]:
+        """
+        Presign uploads for several files (each with file_key and file_name)
+        with a single S3 client.
+        """
+
+        storage_helper = StorageClient(config=FileUploadUtils.SIGNING_CONFIG)
+        return [
+            FileUploadUtils.generate_presigned_upload_url(
+                f["file_key"],
+                f["file_name"],
+                expires_in=expires_in,
+                storage_helper=storage_helper,
+                checksum=f.get("checksum"),
+                file_size=f.get("file_size"),
+            )
+            for f in files
+        ]
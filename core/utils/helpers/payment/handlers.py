@@ -10,6 +10,7 @@ from core.feed.models import Purchase
 from core.payment.models import JournalEntry, Transaction
 from core.utils import enums
 from core.utils.helpers.payment import PostLedgerData
+from core.utils.helpers.playback import AccessUtils
 from core.wallet.models import Wallet
 from core.webhook.models import ProviderWebhookEvent
 from core.websocket.utils import emit_user_event
@@ -228,6 +229,7 @@ class PaymentHandlers:
         for k, v in updates.items():
             setattr(purchase, k, v)
         purchase.save(update_fields=[*updates.keys(), "date_last_modified"])
+        AccessUtils.invalidate_entitlements([(purchase.owner_id, purchase.film_id)])
 
     @staticmethod
     def _mark_purchase_failed(tx: Transaction):
@@ -243,6 +245,7 @@ class PaymentHandlers:
 
         purchase.payment_status = enums.PurchasePaymentStatus.FAILED.value
         purchase.save(update_fields=["payment_status", "date_last_modified"])
+        AccessUtils.invalidate_entitlements([(purchase.owner_id, purchase.film_id)])
 
     @staticmethod
     def _create_virtual_funding_entry(data):
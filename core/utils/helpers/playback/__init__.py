@@ -1 +1,3 @@
 from .authorization import *
+from .keys import *
+from .verification import *
@@ -1,11 +1,10 @@
 import base64
 import datetime
-import hashlib
-import hmac
 import json
 from urllib.parse import urlparse
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
 from rest_framework import status
@@ -15,6 +14,8 @@ from core.users.models import UserSession
 from core.utils.enums import PurchaseStatusType
 from core.utils.exceptions import CustomException
 
+from .keys import StreamKeyRing
+
 
 class AccessUtils:
     """
@@ -38,11 +39,76 @@ class AccessUtils:
         return path.rsplit("/", 1)[0] + "/"
 
     @staticmethod
-    def generate_stream_cookie(purchase: Purchase, session: UserSession | None):
+    def _get_signing_key() -> dict:
+        signing_key = StreamKeyRing.get_signing_key()
+        if not signing_key:
+            raise CustomException(
+                message="Stream cookie secret not configured",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return signing_key
+
+    @staticmethod
+    def _get_stream_cookie_expiry(signing_key: dict) -> datetime.datetime:
+        """
+        Cookie expiry, capped at the signing key's retirement so no cookie
+        outlives the key that verifies it.
+        """
         ttl_seconds = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
         now = datetime.datetime.now(datetime.timezone.utc)
         expires_at = now + datetime.timedelta(seconds=ttl_seconds)
+        if signing_key["not_after"] is not None:
+            expires_at = min(
+                expires_at,
+                datetime.datetime.fromtimestamp(
+                    signing_key["not_after"], datetime.timezone.utc
+                ),
+            )
+        return expires_at
+
+    @staticmethod
+    def get_cookie_max_age(expires_at: datetime.datetime) -> int:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(int((expires_at - now).total_seconds()), 0)
+
+    @staticmethod
+    def _sign_stream_cookie(payload: dict, signing_key: dict = None) -> str:
+        signing_key = signing_key or AccessUtils._get_signing_key()
+        if signing_key["kid"]:
+            payload = {**payload, "kid": signing_key["kid"]}
+        payload_json = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        payload_b64 = AccessUtils._b64url_encode(payload_json)
+        signature = StreamKeyRing.sign(signing_key, payload_b64.encode("ascii"))
+        signature_b64 = AccessUtils._b64url_encode(signature)
+        return f"{payload_b64}.{signature_b64}"
 
+    @staticmethod
+    def _build_common_cookie_path(paths: list[str]) -> str:
+        """
+        Longest directory prefix shared by several cookie paths.
+        """
+        split = [path.strip("/").split("/") for path in paths]
+        common = []
+        for parts in zip(*split):
+            if len(set(parts)) != 1 or not parts[0]:
+                break
+            common.append(parts[0])
+        return f"/{'/'.join(common)}/" if common else "/"
+
+    @staticmethod
+    def _entitlement_cache_key(user_id, film_id) -> str:
+        return f"playback_entitlement-{user_id}-{film_id}"
+
+    @staticmethod
+    def get_latest_session(user) -> UserSession | None:
+        return (
+            UserSession.objects.filter(user=user, is_active=True)
+            .order_by("-last_activity")
+            .first()
+        )
+
+    @staticmethod
+    def build_entitlement(purchase: Purchase, session: UserSession | None) -> dict:
         file = getattr(purchase.film, "file", None)
         master_key = file and (file.hls_master_key or "")
         if not master_key:
@@ -50,37 +116,94 @@ class AccessUtils:
                 message="Playback not available yet",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+        return {
+            "purchase_id": str(purchase.id),
+            "owner_id": purchase.owner_id,
+            "film_id": purchase.film_id,
+            "expiry_time": purchase.expiry_time,
+            "master_key": master_key,
+            "session_id": session.id if session else None,
+        }
 
-        cookie_path = AccessUtils._build_stream_cookie_path(master_key)
+    @staticmethod
+    def get_film_entitlement(film_id: int, user) -> dict:
+        """
+        Return the user's playback entitlement for a film (purchase id, expiry,
+        master key and session). Viewers refresh their cookie every few
+        minutes, so the entitlement is cached until the purchase changes state
+        or expires and a refresh is one cache read plus an HMAC.
+        """
+        cache_key = AccessUtils._entitlement_cache_key(user.id, film_id)
+        entitlement = cache.get(cache_key)
+        if entitlement is not None:
+            expiry_time = entitlement["expiry_time"]
+            if expiry_time and expiry_time <= timezone.now():
+                raise CustomException(
+                    message="Purchase expired",
+                    status_code=status.HTTP_403_FORBIDDEN,
+                )
+            return entitlement
+
+        purchase = AccessUtils.get_valid_purchase_for_film(film_id, user)
+        entitlement = AccessUtils.build_entitlement(
+            purchase, AccessUtils.get_latest_session(user)
+        )
+        timeout = settings.PLAYBACK_ENTITLEMENT_CACHE_TTL
+        if purchase.expiry_time:
+            remaining = (purchase.expiry_time - timezone.now()).total_seconds()
+            timeout = max(min(timeout, int(remaining)), 1)
+        cache.set(cache_key, entitlement, timeout=timeout)
+        return entitlement
+
+    @staticmethod
+    def invalidate_entitlements(entitlements) -> None:
+        """
+        Drop cached entitlements, given as (user id, film id) pairs.
+        """
+        keys = [
+            AccessUtils._entitlement_cache_key(user_id, film_id)
+            for user_id, film_id in entitlements
+        ]
+        if keys:
+            cache.delete_many(keys)
+
+    @staticmethod
+    def invalidate_film_entitlements(film_id: int) -> None:
+        """
+        Drop every cached entitlement for a film, e.g. when its master
+        playlist moves.
+        """
+        cache.delete_pattern(AccessUtils._entitlement_cache_key("*", film_id))
+
+    @staticmethod
+    def generate_stream_cookie(purchase: Purchase, session: UserSession | None):
+        return AccessUtils.generate_entitlement_stream_cookie(
+            AccessUtils.build_entitlement(purchase, session)
+        )
+
+    @staticmethod
+    def generate_entitlement_stream_cookie(entitlement: dict):
+        signing_key = AccessUtils._get_signing_key()
+        expires_at = AccessUtils._get_stream_cookie_expiry(signing_key)
+
+        cookie_path = AccessUtils._build_stream_cookie_path(entitlement["master_key"])
+        session_id = entitlement["session_id"]
         payload = {
-            "sub": str(purchase.owner_id),
-            "film_id": str(purchase.film_id),
-            "purchase_id": str(purchase.id),
-            "session_id": str(session.id) if session else None,
+            "sub": str(entitlement["owner_id"]),
+            "film_id": str(entitlement["film_id"]),
+            "purchase_id": entitlement["purchase_id"],
+            "session_id": str(session_id) if session_id else None,
             "path": cookie_path,
             "exp": int(expires_at.timestamp()),
         }
 
-        payload_json = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-        payload_b64 = AccessUtils._b64url_encode(payload_json)
-        secret = getattr(settings, "STREAM_COOKIE_SECRET", "")
-        if not secret:
-            raise CustomException(
-                message="Stream cookie secret not configured",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-        signature = hmac.new(
-            secret.encode("utf-8"), payload_b64.encode("ascii"), hashlib.sha256
-        ).digest()
-        signature_b64 = AccessUtils._b64url_encode(signature)
-        cookie_value = f"{payload_b64}.{signature_b64}"
+        cookie_value = AccessUtils._sign_stream_cookie(payload, signing_key)
         return cookie_value, expires_at, cookie_path
 
     @staticmethod
     def generate_short_stream_cookie(short: Short, session: UserSession | None):
-        ttl_seconds = int(getattr(settings, "STREAM_COOKIE_TTL_SECONDS", 900))
-        now = datetime.datetime.now(datetime.timezone.utc)
-        expires_at = now + datetime.timedelta(seconds=ttl_seconds)
+        signing_key = AccessUtils._get_signing_key()
+        expires_at = AccessUtils._get_stream_cookie_expiry(signing_key)
 
         file = getattr(short, "file", None)
         master_key = file and (file.hls_master_key or "")
@@ -100,19 +223,36 @@ class AccessUtils:
             "exp": int(expires_at.timestamp()),
         }
 
-        payload_json = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-        payload_b64 = AccessUtils._b64url_encode(payload_json)
-        secret = getattr(settings, "STREAM_COOKIE_SECRET", "")
-        if not secret:
-            raise CustomException(
-                message="Stream cookie secret not configured",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-        signature = hmac.new(
-            secret.encode("utf-8"), payload_b64.encode("ascii"), hashlib.sha256
-        ).digest()
-        signature_b64 = AccessUtils._b64url_encode(signature)
-        cookie_value = f"{payload_b64}.{signature_b64}"
+        cookie_value = AccessUtils._sign_stream_cookie(payload, signing_key)
+        return cookie_value, expires_at, cookie_path
+
+    @staticmethod
+    def generate_shorts_stream_cookie(
+        shorts: list[Short], user, session: UserSession | None
+    ):
+        """
+        One cookie covering several shorts. It is scoped to the directory the
+        shorts' playlists share and lists each short's own path, so the edge
+        can check a request against the exact set of shorts authorised.
+        """
+        signing_key = AccessUtils._get_signing_key()
+        expires_at = AccessUtils._get_stream_cookie_expiry(signing_key)
+
+        paths = [
+            AccessUtils._build_stream_cookie_path(short.file.hls_master_key)
+            for short in shorts
+        ]
+        cookie_path = AccessUtils._build_common_cookie_path(paths)
+        payload = {
+            "sub": str(user.id) if user else None,
+            "short_ids": [str(short.id) for short in shorts],
+            "session_id": str(session.id) if session else None,
+            "path": cookie_path,
+            "paths": paths,
+            "aud": "shorts",
+            "exp": int(expires_at.timestamp()),
+        }
+        cookie_value = AccessUtils._sign_stream_cookie(payload, signing_key)
         return cookie_value, expires_at, cookie_path
 
     @staticmethod
@@ -142,11 +282,7 @@ class AccessUtils:
     @staticmethod
     def return_stream_cookie(film_id: int, user):
         purchase = AccessUtils.get_valid_purchase_for_film(film_id, user)
-        session = (
-            UserSession.objects.filter(user=user, is_active=True)
-            .order_by("-last_activity")
-            .first()
-        )
+        session = AccessUtils.get_latest_session(user)
         cookie_value, expires_at, cookie_path = AccessUtils.generate_stream_cookie(
             purchase, session
         )
@@ -154,16 +290,11 @@ class AccessUtils:
 
     @staticmethod
     def return_stream_cookie_for_film(film_id: int, user):
-        purchase = AccessUtils.get_valid_purchase_for_film(film_id, user)
-        session = (
-            UserSession.objects.filter(user=user, is_active=True)
-            .order_by("-last_activity")
-            .first()
-        )
-        cookie_value, expires_at, cookie_path = AccessUtils.generate_stream_cookie(
-            purchase, session
+        entitlement = AccessUtils.get_film_entitlement(film_id, user)
+        cookie_value, expires_at, cookie_path = (
+            AccessUtils.generate_entitlement_stream_cookie(entitlement)
         )
-        return purchase, cookie_value, expires_at, cookie_path
+        return entitlement, cookie_value, expires_at, cookie_path
 
     @staticmethod
     def return_stream_cookie_for_short(short_id: int, user):
@@ -178,18 +309,44 @@ class AccessUtils:
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        session = None
-        if user:
-            session = (
-                UserSession.objects.filter(user=user, is_active=True)
-                .order_by("-last_activity")
-                .first()
-            )
+        session = AccessUtils.get_latest_session(user) if user else None
         cookie_value, expires_at, cookie_path = (
             AccessUtils.generate_short_stream_cookie(short, session)
         )
         return short, cookie_value, expires_at, cookie_path
 
+    @staticmethod
+    def return_stream_cookie_for_shorts(short_ids: list[int], user):
+        """
+        Authorise playback for a batch of shorts with one query. Returns the
+        playable shorts in request order, the ids that are missing or not
+        playable yet, and one cookie covering all of them.
+        """
+        shorts = {
+            short.id: short
+            for short in Short.objects.select_related("file").filter(
+                id__in=short_ids, is_released=True
+            )
+        }
+        playable, unavailable = [], []
+        for short_id in dict.fromkeys(short_ids):
+            short = shorts.get(short_id)
+            if short and short.file.hls_master_key:
+                playable.append(short)
+            else:
+                unavailable.append(short_id)
+        if not playable:
+            raise CustomException(
+                message="Short not found",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        session = AccessUtils.get_latest_session(user) if user else None
+        cookie_value, expires_at, cookie_path = (
+            AccessUtils.generate_shorts_stream_cookie(playable, user, session)
+        )
+        return playable, unavailable, cookie_value, expires_at, cookie_path
+
     @staticmethod
     def build_playback_url(purchase: Purchase) -> str:
         """
@@ -202,6 +359,13 @@ class AccessUtils:
                 message="Playback not available yet",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+        return AccessUtils.build_stream_url(master_key)
+
+    @staticmethod
+    def build_stream_url(master_key: str) -> str:
+        """
+        Builds a streamable HLS URL for a master playlist key.
+        """
         if master_key.startswith("http://") or master_key.startswith("https://"):
             return master_key
 
@@ -228,19 +392,4 @@ class AccessUtils:
                 message="Playback not available yet",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        if master_key.startswith("http://") or master_key.startswith("https://"):
-            return master_key
-
-        base_url = (getattr(settings, "STREAM_BASE_URL", "") or "").rstrip("/")
-        if not base_url and getattr(settings, "USING_MANAGED_STORAGE", False):
-            domain = getattr(settings, "AWS_S3_CUSTOM_DOMAIN", "")
-            if domain:
-                base_url = f"https://{domain}".rstrip("/")
-
-        if not base_url:
-            raise CustomException(
-                message="Streaming base URL not configured",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        return f"{base_url}/{master_key}"
+        return AccessUtils.build_stream_url(master_key)
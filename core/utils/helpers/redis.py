@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.cache import cache
 
+from django_redis import get_redis_connection
+
 
 class RedisTools:
     _cache_key: str
@@ -12,6 +14,13 @@ class RedisTools:
         if ttl:
             self._timeout = ttl
 
+    @staticmethod
+    def get_connection():
+        """
+        raw redis client behind the default cache, for native data structures
+        """
+        return get_redis_connection("default")
+
     @staticmethod
     def redis_get(key: object, default: object = 0) -> object:
         return cache.get(key, default=default)
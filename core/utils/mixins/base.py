@@ -1,4 +1,7 @@
+from datetime import datetime, time
+
 from django.db import models
+from django.utils import timezone
 
 from core.utils.commons.utils import identifiers
 
@@ -15,3 +18,33 @@ class BaseModelMixin(models.Model):
 
     def get_identifier(self):
         return identifiers.ObjectIdentifiers.unique_id
+
+
+class ScheduledReleaseMixin(models.Model):
+    """
+    Keeps scheduled_release_at, the indexed due time the release dispatcher
+    reads, in step with release_date: midnight of the release date in the
+    project time zone while unreleased, empty otherwise. Concrete models
+    define release_date, is_released and scheduled_release_at.
+    """
+
+    class Meta:
+        abstract = True
+
+    def get_scheduled_release_at(self):
+        if self.is_released or not self.release_date:
+            return None
+        return timezone.make_aware(
+            datetime.combine(self.release_date, time.min),
+            timezone.get_current_timezone(),
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"release_date", "is_released"} & set(
+            update_fields
+        ):
+            self.scheduled_release_at = self.get_scheduled_release_at()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "scheduled_release_at"}
+        super().save(*args, **kwargs)
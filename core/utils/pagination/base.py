@@ -0,0 +1,190 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (ordering field, id). The cursor carries the last
+    row's values, so a page is an index range scan after that row instead of
+    an OFFSET, and no COUNT(*) is run; every page costs the same however deep
+    the client scrolls. Views order by one of `ordering_fields`, each backed
+    by an index on (is_released, <field>, id).
+
+    Rows are ordered the way Postgres orders them by default and the indexes
+    store them: nulls last ascending and first descending.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = None
+        self.next_values = None
+        self.ordering = None
+        self.base_url = None
+
+    def get_page_size(self, request) -> int:
+        default = settings.REST_FRAMEWORK.get("PAGE_SIZE") or 10
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view) -> str:
+        """
+        The single field the view is ordered by, e.g. "-release_date", as
+        chosen through its OrderingFilter.
+        """
+        ordering = OrderingFilter().get_ordering(request, queryset, view)
+        return ordering[0] if ordering else "-id"
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    def encode_cursor(self, values: dict) -> str:
+        payload = json.dumps({"o": self.ordering, **values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(cursor, dict)
+            or cursor.get("o") != self.ordering
+            or not isinstance(cursor.get("id"), int)
+            or isinstance(cursor.get("id"), bool)
+            or "v" not in cursor
+            or not isinstance(cursor["v"], (type(None), str, int, float))
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def clean_cursor_value(self, queryset, field: str, value):
+        """
+        The cursor's value as the ordering field's python type, so a forged
+        value is rejected here rather than failing in the query.
+        """
+        if value is None:
+            return None
+        try:
+            return queryset.model._meta.get_field(field).to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def get_after_filter(field: str, descending: bool, nullable: bool, cursor) -> Q:
+        """
+        Rows strictly after the cursor in (field, id) order. The OR of the
+        two tie cases is ANDed with a plain bound on field so Postgres can
+        start the index range scan at the cursor instead of filtering every
+        row ahead of it.
+        """
+        op = "lt" if descending else "gt"
+        value, last_id = cursor["v"], cursor["id"]
+        if value is None:
+            same = Q(**{f"{field}__isnull": True, f"id__{op}": last_id})
+            # nulls come first descending, so every non-null row follows them
+            return (same | Q(**{f"{field}__isnull": False})) if descending else same
+
+        bound = Q(**{f"{field}__{op}e": value})
+        after = bound & (
+            Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": last_id})
+        )
+        if nullable and not descending:
+            # nulls sort last ascending; they are a separate range of the index
+            after |= Q(**{f"{field}__isnull": True})
+        return after
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+        id_ordering = "-id" if descending else "id"
+        queryset = queryset.order_by(self.ordering, id_ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            cursor["v"] = self.clean_cursor_value(queryset, field, cursor["v"])
+            nullable = field != "id" and queryset.model._meta.get_field(field).null
+            queryset = queryset.filter(
+                self.get_after_filter(field, descending, nullable, cursor)
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        page = rows[: self.page_size]
+        self.next_values = None
+        if len(rows) > self.page_size:
+            last = page[-1]
+            self.next_values = {
+                "v": self.encode_value(getattr(last, field)),
+                "id": last.id,
+            }
+        return page
+
+    def get_next_link(self) -> str | None:
+        if self.next_values is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.next_values)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,39 @@
+import io
+import zlib
+
+from django.conf import settings
+
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.parsers import JSONParser
+
+
+class CompressedJSONParser(JSONParser):
+    """
+    JSON parser that also accepts gzip or deflate request bodies, as sent by
+    players batching beacons. Decompression stops at QOE_BEACON_MAX_BYTES so
+    a small compressed body cannot expand without bound.
+    """
+
+    WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get("request")
+        encoding = (
+            request.META.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+            if request is not None
+            else ""
+        )
+        if encoding in ("", "identity"):
+            return super().parse(stream, media_type, parser_context)
+        if encoding not in self.WBITS:
+            raise UnsupportedMediaType(f"{media_type}; content-encoding={encoding}")
+
+        limit = settings.QOE_BEACON_MAX_BYTES
+        decompressor = zlib.decompressobj(wbits=self.WBITS[encoding])
+        try:
+            body = decompressor.decompress(stream.read() if stream else b"", limit + 1)
+        except zlib.error as error:
+            raise ParseError(f"Invalid {encoding} body - {error}")
+        if len(body) > limit or decompressor.unconsumed_tail:
+            raise ParseError("Decompressed body too large")
+        return super().parse(io.BytesIO(body), media_type, parser_context)
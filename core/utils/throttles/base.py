@@ -0,0 +1,88 @@
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from core.utils.helpers.redis import RedisTools
+
+
+class TokenBucketThrottleMixin:
+    """
+    Replaces DRF's cached request history with a token bucket kept in a redis
+    hash. A check is one Lua script, so it costs the same at any rate and
+    concurrent workers cannot overwrite each other's updates. The script also
+    counts allowed and denied requests per scope.
+    """
+
+    KEY_PREFIX = "throttle"
+    STATS_KEY = "throttle:stats"
+    # bucket refills continuously at limit/duration tokens per second up to
+    # limit; time comes from the redis server so worker clocks don't matter
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local clock = redis.call("TIME")
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed, wait = 0, 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+    redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+    redis.call("HINCRBY", KEYS[2], ARGV[3] .. (allowed == 1 and ":hit" or ":deny"), 1)
+    return {allowed, tostring(wait)}
+    """
+    _script = None
+
+    @classmethod
+    def _get_script(cls):
+        if TokenBucketThrottleMixin._script is None:
+            TokenBucketThrottleMixin._script = (
+                RedisTools.get_connection().register_script(cls.SCRIPT)
+            )
+        return TokenBucketThrottleMixin._script
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, wait = self._get_script()(
+            keys=[f"{self.KEY_PREFIX}:{self.key}", self.STATS_KEY],
+            args=[self.num_requests, self.num_requests / self.duration, self.scope],
+            client=RedisTools.get_connection(),
+        )
+        self._wait = float(wait)
+        return bool(allowed)
+
+    def wait(self):
+        return self._wait
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Allowed and denied request counts per throttle scope.
+        """
+        stats = {}
+        counters = RedisTools.get_connection().hgetall(
+            TokenBucketThrottleMixin.STATS_KEY
+        )
+        for field, count in counters.items():
+            scope, outcome = field.decode().rsplit(":", 1)
+            stats.setdefault(scope, {"hit": 0, "deny": 0})[outcome] = int(count)
+        return stats
+
+
+class UserTokenBucketThrottle(TokenBucketThrottleMixin, UserRateThrottle):
+    pass
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottleMixin, AnonRateThrottle):
+    pass
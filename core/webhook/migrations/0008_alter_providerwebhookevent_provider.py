@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0007_providerwebhookevent"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="providerwebhookevent",
+            name="provider",
+            field=models.CharField(
+                choices=[("flutterwave", "FLUTTERWAVE"), ("storage", "STORAGE")],
+                max_length=30,
+            ),
+        ),
+    ]
@@ -5,7 +5,10 @@ from rest_framework import status
 from rest_framework.permissions import IsAdminUser
 from rest_framework.test import APIClient
 
+from core.file_storage import tasks as file_storage_tasks
+from core.file_storage.models import FileModel, FileProcessingJob
 from core.utils import enums
+from core.utils.helpers.file_storage import FileUploadUtils
 from core.utils.helpers.payment.handlers import PaymentHandlers
 from core.webhook import views as webhook_views
 from core.webhook.models import ProviderWebhookEvent
@@ -13,6 +16,7 @@ from core.webhook.models import ProviderWebhookEvent
 pytestmark = pytest.mark.django_db
 
 WEBHOOK_URL = reverse("flutterwave-webhook")
+STORAGE_WEBHOOK_URL = reverse("storage-event-webhook")
 
 
 def build_headers(settings, secret=None):
@@ -27,6 +31,25 @@ def build_payload(event, **data):
     return {"event": event, "data": data}
 
 
+def build_storage_event(key, event="ObjectCreated:Put", size=2048):
+    return {
+        "Records": [
+            {
+                "eventName": event,
+                "s3": {
+                    "bucket": {"name": "test-bucket"},
+                    "object": {"key": key, "size": size, "sequencer": "0055AED6"},
+                },
+            }
+        ]
+    }
+
+
+def build_storage_headers(settings, secret=None):
+    settings.STORAGE_EVENT_WEBHOOK_SECRET = "storage-secret"
+    return {"HTTP_AUTHORIZATION": f"Bearer {secret or 'storage-secret'}"}
+
+
 def test_flutterwave_webhook_charge_completed_success(
     anonymous_client, monkeypatch, settings
 ):
@@ -225,3 +248,101 @@ def test_flutterwave_webhook_not_found(anonymous_client):
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Storage events
+
+
+def test_storage_event_webhook_ingests_upload(
+    anonymous_client, user, monkeypatch, settings
+):
+    started = []
+    monkeypatch.setattr(
+        file_storage_tasks.start_pipeline, "delay", lambda *args: started.append(args)
+    )
+    upload = FileUploadUtils.get_file_key(
+        user, "film.mp4", enums.FilePurposeType.MAIN_FILE.value
+    )
+
+    response = anonymous_client.post(
+        STORAGE_WEBHOOK_URL,
+        build_storage_event(upload["file_key"]),
+        format="json",
+        **build_storage_headers(settings),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["status"] == "processing"
+    file = FileModel.objects.get(id=upload["file_id"])
+    assert file.owner == user
+    assert file.original_filename == "film.mp4"
+    assert file.file_size == 2048
+    job = FileProcessingJob.objects.get(file=file)
+    assert started == [(job.id,)]
+
+
+def test_storage_event_webhook_is_idempotent(
+    anonymous_client, user, monkeypatch, settings
+):
+    monkeypatch.setattr(file_storage_tasks.start_pipeline, "delay", lambda *_: None)
+    upload = FileUploadUtils.get_file_key(
+        user, "film.mp4", enums.FilePurposeType.MAIN_FILE.value
+    )
+    payload = build_storage_event(upload["file_key"])
+    headers = build_storage_headers(settings)
+
+    anonymous_client.post(STORAGE_WEBHOOK_URL, payload, format="json", **headers)
+    response = anonymous_client.post(
+        STORAGE_WEBHOOK_URL, payload, format="json", **headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert FileProcessingJob.objects.filter(file_id=upload["file_id"]).count() == 1
+    assert (
+        ProviderWebhookEvent.objects.filter(
+            provider=enums.WebhookProvider.STORAGE.value
+        ).count()
+        == 1
+    )
+
+
+def test_storage_event_webhook_recovers_owner_from_key(
+    anonymous_client, user, monkeypatch, settings
+):
+    monkeypatch.setattr(file_storage_tasks.start_pipeline, "delay", lambda *_: None)
+    key = f"uploads/{user.email.lower()}/trailer/expired-upload.mp4"
+
+    response = anonymous_client.post(
+        STORAGE_WEBHOOK_URL,
+        build_storage_event(key),
+        format="json",
+        **build_storage_headers(settings),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    file = FileModel.objects.get(id="expired-upload")
+    assert file.owner == user
+    assert file.file_purpose == enums.FilePurposeType.TRAILER.value
+
+
+def test_storage_event_webhook_ignores_other_events(anonymous_client, settings):
+    response = anonymous_client.post(
+        STORAGE_WEBHOOK_URL,
+        build_storage_event("processed/film/master.m3u8", event="ObjectRemoved:Delete"),
+        format="json",
+        **build_storage_headers(settings),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["status"] == "ignored"
+
+
+def test_storage_event_webhook_unauthorized(anonymous_client, settings):
+    response = anonymous_client.post(
+        STORAGE_WEBHOOK_URL,
+        build_storage_event("uploads/a@b.com/main_file/x.mp4"),
+        format="json",
+        **build_storage_headers(settings, secret="wrong-secret"),
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import FlutterwaveWebhook
+from .views import FlutterwaveWebhook, StorageEventWebhook
 
 urlpatterns = [
     path("flutterwave/", FlutterwaveWebhook.as_view(), name="flutterwave-webhook"),
+    path("storage/", StorageEventWebhook.as_view(), name="storage-event-webhook"),
 ]
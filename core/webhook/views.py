@@ -1,3 +1,6 @@
+import hmac
+from urllib.parse import unquote_plus
+
 from django.conf import settings
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -9,6 +12,7 @@ from rest_framework import response, serializers, status, views
 from rest_framework.parsers import JSONParser
 
 from core.utils import enums
+from core.utils.helpers.file_storage import StorageIngestUtils
 from core.utils.helpers.payment.handlers import PaymentHandlers
 from core.webhook.models import ProviderWebhookEvent
 
@@ -168,3 +172,127 @@ class FlutterwaveWebhook(views.APIView):
                 {"status": "error", "detail": str(exc)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+@extend_schema(tags=["webhooks"])
+class StorageEventWebhook(views.APIView):
+    """
+    Receives S3-compatible bucket notifications. ObjectCreated events for
+    client uploads register the file and start processing without waiting
+    for the client's CreateFileObject callback.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+    parser_classes = [JSONParser]
+    http_method_names = ["post"]
+
+    @method_decorator(csrf_exempt, name="dispatch")
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    @staticmethod
+    def _save_event(webhook_event, state: str, result: dict):
+        webhook_event.processing_state = state
+        webhook_event.handler_response = result
+        webhook_event.processed_at = timezone.now()
+        webhook_event.save(
+            update_fields=["processing_state", "handler_response", "processed_at"]
+        )
+
+    @extend_schema(
+        auth=[],
+        description="Receive S3-compatible ObjectCreated notifications for uploads.",
+        request=inline_serializer(
+            name="StorageEventWebhookRequest",
+            fields={"Records": serializers.ListField(child=serializers.DictField())},
+        ),
+        responses={
+            200: inline_serializer(
+                name="StorageEventWebhookSuccessResponse",
+                fields={
+                    "status": serializers.CharField(),
+                    "results": serializers.ListField(child=serializers.DictField()),
+                },
+            ),
+            401: inline_serializer(
+                name="StorageEventWebhookUnauthorizedResponse",
+                fields={
+                    "status": serializers.CharField(),
+                    "detail": serializers.CharField(),
+                },
+            ),
+        },
+    )
+    def post(self, request):
+        secret = settings.STORAGE_EVENT_WEBHOOK_SECRET
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not secret or not hmac.compare_digest(secret, token.strip()):
+            logger.error("storage event webhook token mismatch")
+            return response.Response(
+                {"status": "error", "detail": "invalid authorization token"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        results, failed = [], False
+        for record in request.data.get("Records") or []:
+            event = record.get("eventName") or ""
+            bucket = ((record.get("s3") or {}).get("bucket") or {}).get("name")
+            obj = (record.get("s3") or {}).get("object") or {}
+            key = unquote_plus(obj.get("key") or "")
+            version = obj.get("sequencer") or obj.get("eTag")
+            idempotency_key = f"{enums.WebhookProvider.STORAGE.value}:{event}:{bucket}:{key}:{version}"
+
+            webhook_event, created = ProviderWebhookEvent.objects.get_or_create(
+                idempotency_key=idempotency_key[:255],
+                defaults={
+                    "provider": enums.WebhookProvider.STORAGE.value,
+                    "event": event[:60],
+                    "provider_event_id": version[:100] if version else None,
+                    "payload": record,
+                },
+            )
+            if not created and webhook_event.processing_state in (
+                enums.WebhookProcessingState.ACKNOWLEDGED.value,
+                enums.WebhookProcessingState.IGNORED.value,
+            ):
+                results.append(
+                    webhook_event.handler_response or {"status": "already_processed"}
+                )
+                continue
+
+            if not event.startswith("ObjectCreated:"):
+                result = {"status": "ignored", "key": key}
+                self._save_event(
+                    webhook_event, enums.WebhookProcessingState.IGNORED.value, result
+                )
+                results.append(result)
+                continue
+
+            try:
+                result = StorageIngestUtils.ingest_object(key, obj.get("size"))
+            except Exception as exc:
+                failed = True
+                result = {"status": "error", "key": key, "detail": str(exc)}
+                self._save_event(
+                    webhook_event, enums.WebhookProcessingState.FAILED.value, result
+                )
+                logger.exception(f"storage event handling failed for {key}: {exc}")
+                results.append(result)
+                continue
+
+            state = (
+                enums.WebhookProcessingState.IGNORED.value
+                if result["status"] == "ignored"
+                else enums.WebhookProcessingState.ACKNOWLEDGED.value
+            )
+            self._save_event(webhook_event, state, result)
+            results.append(result)
+
+        # a failed record makes the sender retry; handled records are skipped
+        return response.Response(
+            {"status": "error" if failed else "ok", "results": results},
+            status=(
+                status.HTTP_500_INTERNAL_SERVER_ERROR if failed else status.HTTP_200_OK
+            ),
+        )
@@ -0,0 +1,8 @@
+#!/bin/bash
+
+set -o errexit
+set -o pipefail
+set -o nounset
+
+echo "Starting stream gateway..."
+daphne -b 0.0.0.0 -p 8001 config.stream_asgi:application